@@ -0,0 +1,85 @@
+"""
+Benchmark of the backtrader run profiles on multi-year synthetic data
+
+Compares the standard profile (default Cerebro, stdstats observers, per-cell DataFrame
+feed) with the fast profile (see BacktestEngine's fast argument), with and without
+bounded line buffers, and checks that every profile produces the same result.
+
+Usage: python benchmark_backtrader.py [years] [repeats]
+"""
+
+import sys
+import copy
+import time
+import logging
+import numpy as np
+import pandas as pd
+import core.tools.backtest as backtest
+from core.tools.backtest import BacktestEngine
+from core.tools.indicator_registry import required_indicators
+
+STRATEGY = {
+    'name': 'RSI Trend',
+    'indicators': ['RSI', 'SMA'],
+    'params': {'RSI': {'period': 14}, 'SMA': {'period': 50}},
+    'rule': [
+        {'type': 'entry', 'expr': 'RSI < 45 and close > SMA'},
+        {'type': 'exit', 'expr': 'RSI > 55'}
+    ]
+}
+
+def make_data(years: int, seed: int = 42) -> pd.DataFrame:
+    """Random-walk daily bars covering the given number of years"""
+    n = years * 252
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2000-01-03', periods=n, freq='B'),
+        'open': open_,
+        'high': np.maximum(open_, close) * 1.005,
+        'low': np.minimum(open_, close) * 0.995,
+        'close': close,
+        'volume': rng.integers(1_000_000, 5_000_000, n).astype(float)
+    })
+
+def run_profile(data: pd.DataFrame, fast: bool, repeats: int):
+    """Best wall time over repeats and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        engine = BacktestEngine(fast=fast)
+        engine.set_data(data, required_indicators(STRATEGY))
+        engine.add_strategy(copy.deepcopy(STRATEGY))
+        started = time.perf_counter()
+        result = engine.run_backtest()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main(years: int = 10, repeats: int = 3) -> None:
+    # per-bar info logging would dominate the timings
+    logging.disable(logging.INFO)
+    data = make_data(years)
+    bars = len(data)
+    exactbars_min_bars = backtest.BACKTRADER_EXACTBARS_MIN_BARS
+    profiles = [('standard', False, exactbars_min_bars), ('fast', True, exactbars_min_bars),
+                ('fast + exactbars', True, 0)]
+
+    print(f"{years} years, {bars} bars, best of {repeats}")
+    baseline = None
+    try:
+        for name, fast, min_bars in profiles:
+            backtest.BACKTRADER_EXACTBARS_MIN_BARS = min_bars
+            elapsed, result = run_profile(data, fast, repeats)
+            if baseline is None:
+                baseline = (elapsed, result)
+            same = (np.array_equal(result['equity'], baseline[1]['equity']) and
+                    np.array_equal(result['trade_log'], baseline[1]['trade_log']))
+            print(f"{name:<18} {elapsed:8.3f}s {bars / elapsed:10.0f} bars/s "
+                  f"{baseline[0] / elapsed:6.2f}x  trades {result['total_trades']:4d}  "
+                  f"identical {same}")
+    finally:
+        backtest.BACKTRADER_EXACTBARS_MIN_BARS = exactbars_min_bars
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,30 @@
+"""
+Benchmark of the Monte Carlo bootstrap of daily returns and of trade sequences
+
+Usage: python benchmark_monte_carlo.py [paths]
+"""
+
+import sys
+import time
+import numpy as np
+from core.tools.monte_carlo import monte_carlo_returns, monte_carlo_trades
+
+def main(paths: int = 10_000) -> None:
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.01, 252)
+    trades = rng.normal(200.0, 1500.0, 60)
+
+    started = time.perf_counter()
+    result = monte_carlo_returns(returns, n_paths=paths, block_size=5, seed=7)
+    elapsed = time.perf_counter() - started
+    print(f"returns {elapsed:8.3f}s  {paths} paths x {len(returns)} days  "
+          f"median return {result['final_return']['p50']:.2%}")
+
+    started = time.perf_counter()
+    result = monte_carlo_trades(trades, initial_capital=100000.0, n_paths=paths, seed=7)
+    elapsed = time.perf_counter() - started
+    print(f"trades  {elapsed:8.3f}s  {paths} paths x {len(trades)} trades  "
+          f"loss probability {result['prob_loss']:.2%}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
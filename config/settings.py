@@ -33,10 +33,77 @@ ATR_MULTIPLIER = 2
 DEFAULT_TIMEFRAME = '1d'
 DEFAULT_START_DATE = '2020-01-01'
 DEFAULT_END_DATE = None  # Use current date
+HISTORY_LOOKBACK_DAYS = 365
+
+# Market data provider: 'yfinance' (live) or 'replay' (recorded files under REPLAY_DATA_DIR)
+DATA_PROVIDER = os.getenv('DATA_PROVIDER', 'yfinance')
+REPLAY_DATA_DIR = os.getenv('REPLAY_DATA_DIR', 'replay_data')
+
+# Local bar cache configuration
+USE_DATA_CACHE = os.getenv('USE_DATA_CACHE', 'true').lower() == 'true'
+DATA_CACHE_DIR = os.getenv('DATA_CACHE_DIR', 'data_cache')
+BULK_DOWNLOAD_WORKERS = 8  # concurrent downloads for bulk loads
+
+# Indicator result cache (in-memory LRU, optional disk tier when INDICATOR_CACHE_DIR is set)
+USE_INDICATOR_CACHE = os.getenv('USE_INDICATOR_CACHE', 'true').lower() == 'true'
+INDICATOR_CACHE_MAX_MB = 256
+INDICATOR_CACHE_DIR = os.getenv('INDICATOR_CACHE_DIR')
+
+# Backtest result cache (in-memory LRU plus disk tier), keyed by strategy, data, capital,
+# commission and engine version
+USE_BACKTEST_CACHE = os.getenv('USE_BACKTEST_CACHE', 'true').lower() == 'true'
+BACKTEST_CACHE_MAX_ENTRIES = 512
+BACKTEST_CACHE_DIR = os.getenv('BACKTEST_CACHE_DIR')  # disk tier directory, unset keeps the cache in memory only
+BACKTEST_CACHE_MAX_DISK_ENTRIES = 4096  # least recently used files of the disk tier are removed beyond this
 
 # Backtest configuration
 DEFAULT_INITIAL_CASH = 100000.0
 DEFAULT_COMMISSION = 0.001  # 0.1%
+DEFAULT_BACKTEST_ENGINE = 'backtrader'  # 'backtrader' or 'vector'
+BACKTRADER_FAST_PROFILE = True  # runonce, no stdstats observers, array-backed data feed
+BACKTRADER_EXACTBARS_MIN_BARS = 50000  # fast profile bounds line buffers (exactbars) from this many bars
+PATH_KERNEL_USE_NUMBA = True  # compile the stop / take-profit kernel with numba when it is installed
+SHARED_MEMORY_TRANSPORT = True  # hand data to pool workers through shared memory instead of pickling it
+
+# Thresholds of evaluate_backtest's is_satisfactory (also used to prune hopeless backtests early)
+SATISFACTORY_MIN_SHARPE = 1.0
+SATISFACTORY_MIN_WIN_RATE = 0.5
+SATISFACTORY_MAX_DRAWDOWN = 0.3
+SATISFACTORY_MIN_TRADES = 10
+
+# Strategy selection: 'random' is the sequential generate/backtest retry loop,
+# 'tournament' (opt-in) backtests every STRATEGY_CONFIG candidate in parallel
+STRATEGY_SELECTION_MODE = os.getenv('STRATEGY_SELECTION_MODE', 'random')
+TOURNAMENT_OBJECTIVE = 'sharpe_ratio'  # any performance/trading metric from evaluate_backtest
+TOURNAMENT_MAX_WORKERS = None  # None: one process per candidate, capped at the CPU count
+
+# Parameter optimizer (grid / random search over strategy params)
+OPTIMIZER_ENGINE = 'vector'  # backtest engine used for each parameter set
+OPTIMIZER_OBJECTIVE = 'sharpe_ratio'
+OPTIMIZER_MAX_WORKERS = None  # None: CPU count
+OPTIMIZER_CHUNK_SIZE = 16  # parameter sets per pool task
+OPTIMIZER_PRUNE = True  # backtrader engine: stop runs as soon as they can no longer be satisfactory
+
+# Walk-forward analysis (bars per in-sample / out-of-sample window)
+WALK_FORWARD_TRAIN_BARS = 252
+WALK_FORWARD_TEST_BARS = 63
+WALK_FORWARD_ANCHORED = False  # True: train windows all start at the first bar
+WALK_FORWARD_MAX_WORKERS = None  # None: CPU count
+WALK_FORWARD_LOOKBACK_DAYS = 365 * 4  # history loaded by walk_forward_analysis
+
+# Monte Carlo bootstrap of backtest returns (used by evaluate_backtest)
+MONTE_CARLO_PATHS = 10000  # 0 disables the bootstrap in evaluate_backtest
+MONTE_CARLO_BLOCK_SIZE = 5  # None or 1: i.i.d. bootstrap
+MONTE_CARLO_SEED = 42  # fixed seed keeps reports reproducible
+MONTE_CARLO_CONFIDENCE = 0.90  # two-sided band used by is_satisfactory (5th/95th percentiles)
+
+# Portfolio backtest (one strategy or a per-asset strategy map over a symbol basket)
+PORTFOLIO_REBALANCE = 'monthly'  # 'none', 'daily', 'weekly' or 'monthly'
+PORTFOLIO_POSITION_WEIGHT = None  # target weight per open position, None: 1 / number of symbols
+
+# Performance metrics (core/tools/metrics.py)
+METRICS_VAR_LEVEL = 0.95  # confidence level of value at risk / expected shortfall
+METRICS_ROLLING_WINDOW = 63  # bars per rolling Sharpe window (about one quarter)
 
 # Popular asset list
 POPULAR_ASSETS = {
@@ -0,0 +1,161 @@
+"""
+Bar cache module
+Persist OHLCV bars per symbol and interval on local disk so that later requests
+only need to fetch the bars after the last cached date
+"""
+
+import os
+import re
+import json
+import threading
+import importlib.util
+import pandas as pd
+from datetime import datetime
+from typing import Optional, Dict, Any
+from utils.logger import setup_logger
+from config.settings import DATA_CACHE_DIR
+
+logger = setup_logger(__name__)
+
+# Parquet needs pyarrow (or fastparquet); fall back to pickle files when neither is installed
+_PARQUET_AVAILABLE = (
+    importlib.util.find_spec('pyarrow') is not None
+    or importlib.util.find_spec('fastparquet') is not None
+)
+
+
+class BarCache:
+    """Columnar on-disk store of OHLCV bars, one file per symbol and interval"""
+
+    def __init__(self, cache_dir: str = DATA_CACHE_DIR):
+        """
+        Initialize bar cache
+
+        Args:
+            cache_dir: Directory where bar files are stored
+        """
+        self.cache_dir = cache_dir
+        self.extension = 'parquet' if _PARQUET_AVAILABLE else 'pkl'
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _base_path(self, symbol: str, interval: str) -> str:
+        """Build the file path prefix for a symbol and interval"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol.upper())
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}")
+
+    def bars_path(self, symbol: str, interval: str) -> str:
+        """Path of the bar file"""
+        return f"{self._base_path(symbol, interval)}.{self.extension}"
+
+    def meta_path(self, symbol: str, interval: str) -> str:
+        """Path of the metadata file recording the covered date range"""
+        return f"{self._base_path(symbol, interval)}.json"
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Load cached bars
+
+        Args:
+            symbol: Asset code, e.g. 'AAPL'
+            interval: Bar interval, e.g. '1d'
+
+        Returns:
+            DataFrame of cached bars, or None if nothing is cached
+        """
+        path = self.bars_path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            if self.extension == 'parquet':
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Failed to read bar cache {path}: {str(e)}")
+            return None
+
+    def load_meta(self, symbol: str, interval: str) -> Dict[str, Any]:
+        """
+        Load cache metadata
+
+        Returns:
+            Dictionary with 'start' and 'end' of the covered range, empty if missing
+        """
+        path = self.meta_path(symbol, interval)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read bar cache metadata {path}: {str(e)}")
+            return {}
+
+    def save(self, symbol: str, interval: str, df: pd.DataFrame, start: str, end: str) -> None:
+        """
+        Save bars and the covered date range, replacing any existing file atomically
+
+        Args:
+            symbol: Asset code
+            interval: Bar interval
+            df: Bars to store
+            start: First requested date covered by the file (YYYY-MM-DD)
+            end: Exclusive end date of the last upstream fetch (YYYY-MM-DD)
+        """
+        path = self.bars_path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            if self.extension == 'parquet':
+                df.to_parquet(tmp_path)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+
+            meta = {
+                'start': start,
+                'end': end,
+                'rows': int(len(df)),
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+            meta_path = self.meta_path(symbol, interval)
+            tmp_meta_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta_path, meta_path)
+
+    def append(self, symbol: str, interval: str, cached: Optional[pd.DataFrame],
+               new_bars: Optional[pd.DataFrame], start: str, end: str) -> pd.DataFrame:
+        """
+        Merge newly fetched bars into the cached ones and persist the result
+
+        Bars with the same timestamp are replaced by the newly fetched values.
+
+        Returns:
+            The merged DataFrame
+        """
+        if cached is None or cached.empty:
+            merged = new_bars if new_bars is not None else pd.DataFrame()
+        elif new_bars is None or new_bars.empty:
+            merged = cached
+        else:
+            merged = pd.concat([cached, new_bars])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self.save(symbol, interval, merged, start, end)
+        return merged
+
+    def clear(self, symbol: str, interval: str) -> None:
+        """Remove the cached bars of a symbol and interval"""
+        for path in (self.bars_path(symbol, interval), self.meta_path(symbol, interval)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+_bar_cache: Optional[BarCache] = None
+
+
+def get_bar_cache() -> BarCache:
+    """Return the process-wide bar cache instance"""
+    global _bar_cache
+    if _bar_cache is None:
+        _bar_cache = BarCache()
+    return _bar_cache
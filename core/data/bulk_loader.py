@@ -0,0 +1,122 @@
+"""
+Bulk loader module
+Fetch historical data for many symbols concurrently, e.g. a whole POPULAR_ASSETS category
+"""
+
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Iterable, Union
+from utils.logger import setup_logger
+from config.settings import POPULAR_ASSETS, DEFAULT_TIMEFRAME, BULK_DOWNLOAD_WORKERS
+from core.tools.indicators_process import get_historical_data
+
+logger = setup_logger(__name__)
+
+def resolve_symbols(universe: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Resolve a universe specification into a list of unique symbols
+
+    Args:
+        universe: A POPULAR_ASSETS category key (e.g. '1'), 'all' for every category,
+                  a single symbol, or an iterable of symbols
+
+    Returns:
+        List[str]: Symbols in their original order with duplicates removed
+    """
+    if isinstance(universe, str):
+        if universe == 'all':
+            symbols = [symbol for category in POPULAR_ASSETS.values() for symbol in category['assets']]
+        elif universe in POPULAR_ASSETS:
+            symbols = POPULAR_ASSETS[universe]['assets']
+        else:
+            symbols = [universe]
+    else:
+        symbols = list(universe)
+
+    return list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+
+def load_historical_data_bulk(universe: Union[str, Iterable[str]],
+                              interval: str = DEFAULT_TIMEFRAME,
+                              max_workers: int = BULK_DOWNLOAD_WORKERS) -> Dict[str, Any]:
+    """
+    Fetch historical data for many symbols concurrently with a bounded thread pool
+
+    Args:
+        universe: Category key, 'all', or list of symbols (see resolve_symbols)
+        interval: Bar interval, e.g. '1d'
+        max_workers: Maximum number of concurrent downloads
+
+    Returns:
+        Dict[str, Any]: {'data': {symbol: DataFrame}, 'failed': {symbol: reason}, 'elapsed': seconds}
+    """
+    symbols = resolve_symbols(universe)
+    data: Dict[str, pd.DataFrame] = {}
+    failed: Dict[str, str] = {}
+    started = time.perf_counter()
+
+    logger.info(f"Bulk loading {len(symbols)} symbols with {max_workers} workers")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols) or 1))) as executor:
+        futures = {executor.submit(get_historical_data, symbol, interval, raise_errors=True): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                df = future.result()
+                if df is None or df.empty:
+                    failed[symbol] = "No historical data returned"
+                else:
+                    data[symbol] = df
+            except Exception as e:
+                failed[symbol] = str(e) or type(e).__name__
+
+    elapsed = time.perf_counter() - started
+    if failed:
+        logger.warning(f"Bulk load failed for {len(failed)} symbols: {sorted(failed)}")
+    logger.info(f"Bulk load finished: {len(data)}/{len(symbols)} symbols in {elapsed:.2f}s")
+
+    # keep the requested symbol order
+    return {
+        'data': {symbol: data[symbol] for symbol in symbols if symbol in data},
+        'failed': failed,
+        'elapsed': elapsed
+    }
+
+def align_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """
+    Map a symbol's timestamps onto the common naive timeline used by to_panel
+
+    Different exchanges are aligned by local date for daily bars and by UTC for intraday bars.
+
+    Args:
+        index: Bar timestamps, timezone-aware or naive
+
+    Returns:
+        pd.DatetimeIndex: Naive timestamps
+    """
+    if index.tz is None:
+        return index
+    if (index == index.normalize()).all():
+        return index.tz_localize(None)
+    return index.tz_convert('UTC').tz_localize(None)
+
+def to_panel(frames: Dict[str, pd.DataFrame], field: str = 'Close') -> pd.DataFrame:
+    """
+    Combine per-symbol frames into a single panel of one field
+
+    Args:
+        frames: Mapping of symbol to DataFrame, as returned in load_historical_data_bulk()['data']
+        field: Column to extract, e.g. 'Close'
+
+    Returns:
+        pd.DataFrame: Union of all timestamps as index, one column per symbol (NaN where a symbol has no bar)
+    """
+    columns = {}
+    for symbol, df in frames.items():
+        if field not in df.columns:
+            logger.warning(f"Field {field} not found for {symbol}")
+            continue
+        series = df[field]
+        if isinstance(series.index, pd.DatetimeIndex):
+            series = series.set_axis(align_index(series.index))
+        columns[symbol] = series
+    return pd.DataFrame(columns).sort_index()
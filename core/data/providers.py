@@ -0,0 +1,241 @@
+"""
+Market data provider module
+Abstracts where bars and news come from, so the pipeline can run against yfinance
+or fully offline against recorded files
+"""
+
+import os
+import re
+import json
+import threading
+import requests
+import pandas as pd
+import yfinance as yf
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
+from utils.logger import setup_logger
+from config.settings import DATA_PROVIDER, REPLAY_DATA_DIR
+
+logger = setup_logger(__name__)
+
+# Canonical column names returned by every provider
+HISTORY_COLUMN_MAPPING = {
+    'Open': 'Open',
+    'High': 'High',
+    'Low': 'Low',
+    'Close': 'Close',
+    'Volume': 'Volume',
+    'Dividends': 'Dividends',
+    'Stock Splits': 'Stock_Splits'
+}
+
+class MarketDataProvider(ABC):
+    """Source of historical bars and news articles"""
+
+    name = 'base'
+    # whether results should go through the local bar cache
+    cacheable = True
+
+    @abstractmethod
+    def get_history(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """
+        Get historical bars
+
+        Args:
+            symbol: Asset code, e.g. 'AAPL'
+            start_date: First date (YYYY-MM-DD, inclusive)
+            end_date: Last date (YYYY-MM-DD, exclusive)
+            interval: Bar interval, e.g. '1d'
+
+        Returns:
+            pd.DataFrame: Bars indexed by timestamp with canonical column names (possibly empty)
+        """
+
+    @abstractmethod
+    def get_news(self, symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Get recent news articles
+
+        Args:
+            symbol: Asset code
+            limit: Maximum number of articles
+
+        Returns:
+            List of articles with title, source, date, summary, url and content
+        """
+
+class YFinanceProvider(MarketDataProvider):
+    """Market data from the yfinance API"""
+
+    name = 'yfinance'
+    cacheable = True
+
+    def get_history(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol)
+        df = ticker.history(start=start_date, end=end_date, interval=interval)
+
+        # Only rename existing columns
+        existing_columns = [col for col in HISTORY_COLUMN_MAPPING.keys() if col in df.columns]
+        return df.rename(columns={col: HISTORY_COLUMN_MAPPING[col] for col in existing_columns})
+
+    def get_news(self, symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
+        ticker = yf.Ticker(symbol)
+        news = ticker.news[:limit]
+
+        # Format news data
+        formatted_articles = []
+        for article in news:
+            date = article['content']['pubDate']
+            url = article['content']['canonicalUrl']['url']
+
+            formatted_articles.append({
+                "title": article['content']['title'],
+                "source": article['content']['provider']['displayName'],
+                "date": date,
+                "summary": article['content']['summary'],
+                "url": url,
+                "content": self._fetch_article_body(url)
+            })
+
+        return formatted_articles
+
+    @staticmethod
+    def _fetch_article_body(url: str) -> str:
+        """Get the first part of an article body only (limited to 300 chars)"""
+        try:
+            r = requests.get(url, timeout=5)
+            soup = BeautifulSoup(r.text, "html.parser")
+            paragraphs = soup.find_all("p")
+            full_text = "\n".join(p.get_text() for p in paragraphs[:3] if p.get_text())  # only get the first 3 paragraphs
+            return full_text[:300] + "..." if len(full_text) > 300 else full_text  # limit to 300 characters
+        except Exception as e:
+            logger.warning(f"Failed to fetch body: {e}")
+            return ""
+
+class FileReplayProvider(MarketDataProvider):
+    """
+    Market data replayed from recorded files
+
+    Bars are read from '<data_dir>/<SYMBOL>_<interval>.parquet' (or '.csv') and news
+    from '<data_dir>/<SYMBOL>_news.json'. When a recording ends before the requested
+    range, the window is anchored to the end of the recording so that the usual
+    "last N days" requests still return data.
+    """
+
+    name = 'replay'
+    cacheable = False
+
+    def __init__(self, data_dir: str = REPLAY_DATA_DIR):
+        """
+        Initialize replay provider
+
+        Args:
+            data_dir: Directory containing recorded bars and news
+        """
+        self.data_dir = data_dir
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _base_path(self, symbol: str) -> str:
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol.upper())
+        return os.path.join(self.data_dir, safe_symbol)
+
+    def _load_bars(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Read (and memoize) the recorded bars of a symbol"""
+        key = f"{symbol.upper()}_{interval}"
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+
+        base = f"{self._base_path(symbol)}_{interval}"
+        if os.path.exists(f"{base}.parquet"):
+            df = pd.read_parquet(f"{base}.parquet")
+        elif os.path.exists(f"{base}.csv"):
+            df = pd.read_csv(f"{base}.csv", index_col=0)
+            df.index = pd.to_datetime(df.index, utc=True)
+        else:
+            logger.warning(f"No recorded bars for {symbol} ({interval}) in {self.data_dir}")
+            return None
+
+        existing_columns = [col for col in HISTORY_COLUMN_MAPPING.keys() if col in df.columns]
+        df = df.rename(columns={col: HISTORY_COLUMN_MAPPING[col] for col in existing_columns}).sort_index()
+        with self._lock:
+            self._frames[key] = df
+        return df
+
+    def get_history(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        df = self._load_bars(symbol, interval)
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        start = pd.Timestamp(start_date, tz=df.index.tz)
+        end = pd.Timestamp(end_date, tz=df.index.tz)
+
+        # anchor the window to the end of the recording if it ends before the requested range
+        last_recorded = df.index[-1].normalize() + timedelta(days=1)
+        if last_recorded < end:
+            start = start - (end - last_recorded)
+            end = last_recorded
+
+        return df[(df.index >= start) & (df.index < end)]
+
+    def get_news(self, symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
+        path = f"{self._base_path(symbol)}_news.json"
+        if not os.path.exists(path):
+            logger.warning(f"No recorded news for {symbol} in {self.data_dir}")
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        return articles[:limit]
+
+    def record_history(self, symbol: str, interval: str, df: pd.DataFrame) -> str:
+        """
+        Record bars for later replay
+
+        Returns:
+            str: Path of the written file
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = f"{self._base_path(symbol)}_{interval}.parquet"
+        df.to_parquet(path)
+        with self._lock:
+            self._frames.pop(f"{symbol.upper()}_{interval}", None)
+        return path
+
+    def record_news(self, symbol: str, articles: List[Dict[str, Any]]) -> str:
+        """
+        Record news articles for later replay
+
+        Returns:
+            str: Path of the written file
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = f"{self._base_path(symbol)}_news.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2)
+        return path
+
+_PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    FileReplayProvider.name: FileReplayProvider
+}
+
+_provider: Optional[MarketDataProvider] = None
+
+def get_provider() -> MarketDataProvider:
+    """Return the active market data provider, created from DATA_PROVIDER on first use"""
+    global _provider
+    if _provider is None:
+        if DATA_PROVIDER not in _PROVIDERS:
+            raise ValueError(f"Unknown data provider: {DATA_PROVIDER}. Available: {list(_PROVIDERS)}")
+        _provider = _PROVIDERS[DATA_PROVIDER]()
+        logger.info(f"Using market data provider: {_provider.name}")
+    return _provider
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """Replace the active market data provider, e.g. with a FileReplayProvider for offline runs"""
+    global _provider
+    _provider = provider
+    logger.info(f"Market data provider set to: {provider.name}")
@@ -0,0 +1,209 @@
+"""
+Shared-memory frame module
+Publish a DataFrame's columns once into a multiprocessing.shared_memory segment, so
+pool workers attach to it by name and read zero-copy NumPy views instead of unpickling
+their own copy of the data
+"""
+
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, Any, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# column offsets are aligned to cache lines
+ALIGNMENT = 64
+INDEX_KEY = '__index__'
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """
+    Picklable description of a published frame (segment name and column layout)
+
+    Attributes:
+        name: Shared memory segment name
+        length: Number of rows
+        columns: (column, dtype, offset, tz) per column stored in the segment, in frame order;
+                 other columns are carried in 'extra'
+        order: Column names in frame order
+        index: ('range', start, stop, step) or ('datetime', name, freq)
+        extra: Column -> values of columns that cannot live in shared memory (e.g. strings)
+    """
+    name: str
+    length: int
+    columns: Tuple[Tuple[str, str, int, Optional[str]], ...]
+    order: Tuple[Any, ...]
+    index: Tuple[Any, ...]
+    extra: Dict[Any, np.ndarray]
+
+def _shareable(series: pd.Series) -> Optional[Tuple[np.ndarray, Optional[str]]]:
+    """Fixed-width values of a column and its timezone, None for columns kept out of shared memory"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        times = pd.DatetimeIndex(series).tz_convert('UTC').tz_localize(None)
+        return times.values, str(dtype.tz)
+    if pd.api.types.is_datetime64_dtype(dtype) or (
+            isinstance(dtype, np.dtype) and dtype.kind in 'biuf'):
+        return series.to_numpy(), None
+    return None
+
+class SharedFrame:
+    """
+    Owner of a published frame: creates the segment, and unlinks it on close, on garbage
+    collection or at interpreter exit (the resource tracker also removes it if the owning
+    process dies without cleaning up)
+
+    Usage:
+        with SharedFrame(data) as shared:
+            pool = ProcessPoolExecutor(initializer=init, initargs=(shared.handle,))
+            ...  # workers call attach_frame(handle)
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Publish a frame
+
+        Args:
+            data: Frame with a RangeIndex or DatetimeIndex; numeric, boolean and datetime
+                  columns are shared, any other columns travel in the handle
+        """
+        if isinstance(data.index, pd.RangeIndex):
+            index = ('range', data.index.start, data.index.stop, data.index.step)
+            index_values = None
+        elif isinstance(data.index, pd.DatetimeIndex):
+            index = ('datetime', data.index.name, data.index.freqstr)
+            index_values = _shareable(pd.Series(data.index))
+        else:
+            raise ValueError(f"Only RangeIndex and DatetimeIndex frames can be shared, got {type(data.index).__name__}")
+        if not data.columns.is_unique:
+            raise ValueError("Shared frames need unique column names")
+
+        shared = []
+        extra = {}
+        for col in data.columns:
+            values = _shareable(data[col])
+            if values is None:
+                extra[col] = data[col].to_numpy()
+            else:
+                shared.append((col, values))
+        if index_values is not None:
+            shared.append((INDEX_KEY, index_values))
+
+        columns = []
+        offset = 0
+        for col, (values, tz) in shared:
+            columns.append((col, values.dtype.str, offset, tz))
+            offset += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (col, (values, _)), (_, dtype, start, _) in zip(shared, columns):
+            view = np.ndarray(values.shape, dtype=dtype, buffer=self._shm.buf, offset=start)
+            view[:] = values
+            del view
+
+        self.handle = SharedFrameHandle(
+            name=self._shm.name, length=len(data), columns=tuple(columns),
+            order=tuple(data.columns), index=index, extra=extra)
+        self._finalizer = weakref.finalize(self, _release, self._shm)
+        logger.info(f"Published {len(columns)} columns x {len(data)} rows to shared memory "
+                    f"{self._shm.name} ({offset / 1e6:.1f} MB)")
+
+    @property
+    def name(self) -> str:
+        return self.handle.name
+
+    def close(self) -> None:
+        """Unmap and unlink the segment; workers that are still attached keep a valid mapping"""
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedFrame':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to release shared memory {shm.name}: {str(e)}")
+
+# segments attached in this process, kept open while frames built on them may be in use
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+_attach_lock = threading.Lock()
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    """Attach to a segment without registering it with this process's resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # before 3.13 attaching registers the segment too, and the tracker would unlink it
+    # when this worker exits; only the owner may unlink
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def attach_frame(handle: SharedFrameHandle) -> pd.DataFrame:
+    """
+    Rebuild a published frame from its segment
+
+    Args:
+        handle: SharedFrame.handle of the publishing process
+
+    Returns:
+        pd.DataFrame: Columns backed by read-only views of the shared segment (no copy)
+    """
+    with _attach_lock:
+        shm = _attached.get(handle.name)
+        if shm is None:
+            shm = _open_segment(handle.name)
+            _attached[handle.name] = shm
+
+    arrays = {}
+    for col, dtype, offset, tz in handle.columns:
+        view = np.ndarray((handle.length,), dtype=dtype, buffer=shm.buf, offset=offset)
+        view.flags.writeable = False
+        if tz is not None:
+            view = pd.DatetimeIndex(view).tz_localize('UTC').tz_convert(tz)
+        arrays[col] = view
+
+    if handle.index[0] == 'range':
+        index = pd.RangeIndex(*handle.index[1:])
+    else:
+        index = pd.DatetimeIndex(arrays.pop(INDEX_KEY), name=handle.index[1], freq=handle.index[2])
+    arrays.update(handle.extra)
+    return pd.DataFrame({col: arrays[col] for col in handle.order}, index=index, copy=False)
+
+def release_attached(name: Optional[str] = None) -> None:
+    """
+    Close this process's mapping of one (or every) attached segment; frames built on it
+    must no longer be used
+
+    Args:
+        name: Segment name, None for all
+    """
+    with _attach_lock:
+        names = [name] if name is not None else list(_attached)
+        for key in names:
+            shm = _attached.pop(key, None)
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    # views are still referenced somewhere, the mapping goes away with the process
+                    pass
+
+def resolve_frame(data) -> pd.DataFrame:
+    """The frame itself, or the attached frame when a worker was handed a SharedFrameHandle"""
+    return attach_frame(data) if isinstance(data, SharedFrameHandle) else data
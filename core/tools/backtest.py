@@ -8,46 +8,224 @@ from langchain.agents import tool
 from langchain.chat_models import ChatOpenAI
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional, Sequence, Tuple
 from datetime import datetime
 from utils.logger import setup_logger
 from config.settings import (
     INITIAL_CAPITAL,
-    COMMISSION_RATE
+    COMMISSION_RATE,
+    DEFAULT_BACKTEST_ENGINE,
+    POSITION_SIZE,
+    MONTE_CARLO_PATHS,
+    MONTE_CARLO_BLOCK_SIZE,
+    MONTE_CARLO_SEED,
+    MONTE_CARLO_CONFIDENCE,
+    USE_BACKTEST_CACHE,
+    SATISFACTORY_MIN_SHARPE,
+    SATISFACTORY_MIN_WIN_RATE,
+    SATISFACTORY_MAX_DRAWDOWN,
+    SATISFACTORY_MIN_TRADES,
+    METRICS_VAR_LEVEL,
+    METRICS_ROLLING_WINDOW,
+    BACKTRADER_FAST_PROFILE,
+    BACKTRADER_EXACTBARS_MIN_BARS
 )
 from core.tools.indicators_process import get_historical_data, calculate_indicators
+from core.tools.indicator_registry import required_indicators, strategy_columns, compute_indicators
+from core.tools.vector_backtest import VectorBacktestEngine, ENGINE_VERSION as VECTOR_ENGINE_VERSION
+from core.tools.rule_compiler import compile_strategy_rules
+from core.tools.monte_carlo import monte_carlo_returns, DEFAULT_PERCENTILES
+from core.tools.trade_log import TRADE_DTYPE, backtest_result
+from core.tools.metrics import performance_metrics, years_between
+from core.tools.pruning import PruningConstraints
+from core.tools.path_kernel import strategy_stops
+from core.tools.backtest_cache import get_backtest_cache, fingerprint_data, canonical_hash
 import json
 
 logger = setup_logger(__name__)
 
+# bump when a change to the engine or the evaluation alters results, so cached ones are not reused
+ENGINE_VERSION = f"3+bt{bt.__version__}"
+EVALUATION_VERSION = 4
+
+def _result_settings() -> Dict[str, Any]:
+    """Settings that change metrics or is_satisfactory, part of every cache key"""
+    return {
+        'satisfactory': [SATISFACTORY_MIN_SHARPE, SATISFACTORY_MIN_WIN_RATE,
+                         SATISFACTORY_MAX_DRAWDOWN, SATISFACTORY_MIN_TRADES],
+        'metrics': [METRICS_VAR_LEVEL, METRICS_ROLLING_WINDOW]
+    }
+
+PRICE_COLUMNS = ('datetime', 'open', 'high', 'low', 'close', 'volume', 'openinterest')
+
+# optional backtrader analyzers, attached by name (see BacktestEngine's analyzers argument)
+ANALYZERS = {
+    'sharpe': bt.analyzers.SharpeRatio,
+    'drawdown': bt.analyzers.DrawDown,
+    'trades': bt.analyzers.TradeAnalyzer,
+    'returns': bt.analyzers.Returns,
+    'time_return': bt.analyzers.TimeReturn
+}
+
+class ArrayPandasData(bt.feeds.PandasData):
+    """
+    PandasData that extracts every column into a NumPy array once at start, instead of
+    one DataFrame.iloc lookup per line and bar (the bulk of backtrader's run time)
+    """
+
+    def start(self):
+        super().start()
+        frame = self.p.dataname
+        self._columns = []
+        for name in self.getlinealiases():
+            index = self._colmapping.get(name)
+            if name == 'datetime' or index is None:
+                continue
+            self._columns.append((getattr(self.lines, name), frame.iloc[:, index].to_numpy(dtype=np.float64)))
+        index = self._colmapping['datetime']
+        timestamps = frame.index if index is None else frame.iloc[:, index]
+        self._datetimes = [bt.utils.date2num(ts) for ts in pd.DatetimeIndex(timestamps).to_pydatetime()]
+
+    def _load(self):
+        self._idx += 1
+        if self._idx >= len(self._datetimes):
+            return False
+        for line, values in self._columns:
+            line[0] = values[self._idx]
+        self.lines.datetime[0] = self._datetimes[self._idx]
+        return True
+
+def make_indicator_feed_class(data: pd.DataFrame, fast: bool = False) -> type:
+    """
+    Build a PandasData subclass exposing every numeric indicator column of data as a line
+
+    Args:
+        data: DataFrame with lowercase column names
+        fast: Read bars from NumPy arrays (ArrayPandasData) instead of per-cell lookups
+
+    Returns:
+        type: PandasData subclass; each line is read from the column of the same name
+    """
+    reserved = set(dir(bt.feeds.PandasData))
+    indicator_columns = [
+        col for col in data.columns
+        if col not in PRICE_COLUMNS and col.isidentifier() and col not in reserved
+        and pd.api.types.is_numeric_dtype(data[col])
+    ]
+    return type('IndicatorPandasData', (ArrayPandasData if fast else bt.feeds.PandasData,), {
+        'lines': tuple(indicator_columns),
+        'params': tuple((col, col) for col in indicator_columns)
+    })
+
+class TradeLogAnalyzer(bt.Analyzer):
+    """Record closed trades into a TRADE_DTYPE array and the portfolio value at every bar's close"""
+    params = (('pruning', None),)
+
+    def start(self):
+        self.records = []
+        self.open_trades = {}
+        self.values = []
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.pruned = None
+        # total bars from the input frame, line buffers are bounded under exactbars
+        self.bars = len(self.strategy.data.p.dataname)
+
+    def notify_trade(self, trade):
+        bar = len(self.strategy.data) - 1
+        if trade.justopened:
+            self.open_trades[trade.ref] = (bar, trade.price, trade.size)
+        if trade.isclosed:
+            entry_bar, entry_price, size = self.open_trades.pop(trade.ref)
+            exit_price = entry_price + trade.pnl / size
+            self.records.append((entry_bar, bar, entry_price, exit_price, abs(size), trade.pnlcomm, trade.commission))
+
+    def next(self):
+        value = self.strategy.broker.getvalue()
+        self.values.append(value)
+        if self.p.pruning is None or self.pruned is not None:
+            return
+        self.peak = max(self.peak, value)
+        self.max_drawdown = max(self.max_drawdown, 1 - value / self.peak)
+        bar = len(self.strategy.data) - 1
+        reason = self.p.pruning.check(self.max_drawdown, len(self.records), len(self.open_trades),
+                                      self.bars - 1 - bar)
+        if reason is not None:
+            self.pruned = {'reason': reason, 'bar': bar}
+            self.strategy.env.runstop()
+
+    def prenext(self):
+        self.next()
+
+    def get_analysis(self):
+        return {
+            'trade_log': np.array(self.records, dtype=TRADE_DTYPE),
+            'open_trades': len(self.open_trades),
+            'equity': np.array(self.values, dtype=np.float64),
+            'pruned': self.pruned
+        }
+
 class BacktestEngine:
-    def __init__(self):
-        """Initialize backtest engine"""
-        self.cerebro = bt.Cerebro()
-        self.cerebro.broker.setcash(INITIAL_CAPITAL)
-        self.cerebro.broker.setcommission(commission=COMMISSION_RATE)
-        self.cerebro.addsizer(bt.sizers.PercentSizer, percents=10)  # 10% of position per trade
+    def __init__(self, initial_capital: float = INITIAL_CAPITAL, commission: float = COMMISSION_RATE,
+                 pruning: Optional[PruningConstraints] = None, fast: bool = BACKTRADER_FAST_PROFILE,
+                 analyzers: Optional[Sequence[str]] = None, slippage: float = 0.0):
+        """
+        Initialize backtest engine
+        
+        Args:
+            initial_capital: Starting cash
+            commission: Commission as a fraction of traded value
+            pruning: Stop at the first bar where the run can no longer be satisfactory and
+                     return the partial result (marked in 'pruned'), None to always run to the end
+            fast: Low-overhead run profile: no stdstats observers, array-backed data feed, runonce
+                  with preloaded data, and bounded line buffers (exactbars) from
+                  BACKTRADER_EXACTBARS_MIN_BARS bars on. Results are identical to the standard profile
+            analyzers: Names of further backtrader analyzers to attach (keys of ANALYZERS);
+                       their output is returned under 'analyzers'
+            slippage: Fill price slippage as a fraction of the price (e.g. SLIPPAGE)
+        """
+        unknown = set(analyzers or ()) - set(ANALYZERS)
+        if unknown:
+            raise ValueError(f"Unknown analyzers: {sorted(unknown)}. Choose from {list(ANALYZERS)}")
+        self.initial_capital = initial_capital
+        self.fast = fast
+        self.analyzers = list(analyzers or ())
+        self.cerebro = bt.Cerebro(stdstats=not fast)
+        self.cerebro.broker.setcash(initial_capital)
+        self.cerebro.broker.setcommission(commission=commission)
+        if slippage:
+            self.cerebro.broker.set_slippage_perc(slippage)
+        self.cerebro.addsizer(bt.sizers.PercentSizer, percents=POSITION_SIZE * 100)  # share of cash per trade
         self.strategy_config = None
+        self.dates = None
         
-        # Add analyzers
-        self.cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
-        self.cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-        self.cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
-        self.cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+        # trades and daily portfolio value as arrays; the summary metrics are computed from them
+        self.cerebro.addanalyzer(TradeLogAnalyzer, _name='trade_log', pruning=pruning)
+        for name in self.analyzers:
+            self.cerebro.addanalyzer(ANALYZERS[name], _name=name)
 
-    def set_data(self, data: pd.DataFrame) -> None:
+    def set_data(self, data: pd.DataFrame, indicators: Optional[List[Tuple[str, Dict[str, Any]]]] = None) -> None:
         """
         Set backtest data
         
+        Indicator columns are fed to backtrader as data lines, so the strategy reads
+        the precomputed values instead of recalculating them per bar.
+        
         Args:
             data: DataFrame containing historical prices and technical indicators
+            indicators: Optional (indicator name, params) requests to compute if their columns are missing
         """
         if data is None or len(data) == 0:
             logger.error("No data provided for backtest")
             raise ValueError("No data provided for backtest")
             
-        # ensure column names are lowercase
-        data = data.copy()
+        # ensure column names are lowercase (shallow copy: columns are replaced, never written in place,
+        # so memory-mapped or shared inputs are not duplicated here)
+        data = data.copy(deep=False)
+        if indicators:
+            # registry columns are uppercase; compute the missing ones before lowercasing everything
+            data.columns = [col.lower() if col.lower() in PRICE_COLUMNS else col.upper() for col in data.columns]
+            data = compute_indicators(data, indicators)
         data.columns = [col.lower() for col in data.columns]
             
         required_columns = ['open', 'high', 'low', 'close', 'volume']
@@ -62,6 +240,9 @@ class BacktestEngine:
         # ensure datetime column has correct data type
         if 'datetime' in data.columns:
             data['datetime'] = pd.to_datetime(data['datetime'])
+            # bar timestamps of the results in local wall-clock time (backtrader converts to UTC)
+            times = pd.DatetimeIndex(data['datetime'])
+            self.dates = (times.tz_localize(None) if times.tz is not None else times).values
         
         # ensure numeric columns have correct data types
         for col in ['open', 'high', 'low', 'close', 'volume']:
@@ -73,8 +254,9 @@ class BacktestEngine:
             logger.error(f"Data contains null values: {null_counts[null_counts > 0].to_dict()}")
             raise ValueError("Data contains null values")
         
-        # create data source
-        data_feed = bt.feeds.PandasData(
+        # create data source with one line per indicator column
+        feed_class = make_indicator_feed_class(data, fast=self.fast)
+        data_feed = feed_class(
             dataname=data,
             datetime='datetime',
             open='open',
@@ -96,6 +278,7 @@ class BacktestEngine:
         
         logger.info(f"Data successfully added to backtest engine")
         logger.info(f"Number of data feeds: {len(self.cerebro.datas)}")
+        logger.info(f"Data lines: {list(feed_class.lines.getlinealiases())}")
 
     def add_strategy(self, strategy_config: Dict[str, Any]) -> None:
         """
@@ -123,14 +306,31 @@ class BacktestEngine:
         
         self.strategy_config = strategy_config
         
+        # compile rules once per strategy (not per bar); invalid names or syntax fail here
+        rules = compile_strategy_rules(strategy_config)
+        entry_rule = rules['entry']
+        exit_rule = rules['exit']
+        stops = strategy_stops(strategy_config)
+        
+        # rule names -> data lines (indicator columns, lowercased by set_data)
+        rule_lines = {name: column.lower() for name, column in strategy_columns(strategy_config).items() if name != 'MACD_HIST'}
+        if self.cerebro.datas:
+            available = set(self.cerebro.datas[0].getlinealiases())
+            missing = [column for column in rule_lines.values() if column not in available]
+            if missing:
+                logger.error(f"Indicator columns missing from backtest data: {missing}")
+                raise ValueError(f"Backtest data is missing indicator columns {missing}; pass indicators to set_data")
+        
         # Create strategy class
         class Strategy(bt.Strategy):
             def __init__(self):
                 super().__init__()
                 self.warmup_period = 0
                 self.previous_values = {}  # store previous period values
-                self.manual_indicators = {}  # store manually calculated indicator values
-                logger.info("Strategy initialized - using manual indicators only")
+                self.trail_peak = None  # highest close since entry (from the entry price)
+                # precomputed indicator lines of the data feed
+                self.indicator_lines = {name: getattr(self.data, column) for name, column in rule_lines.items()}
+                logger.info(f"Strategy initialized - reading indicator lines: {rule_lines}")
                 
             def calculate_manual_crossover(self, current_value, reference_value, prev_current, prev_reference):
                 """
@@ -149,80 +349,6 @@ class BacktestEngine:
                 else:
                     return 0.0
                     
-            def calculate_sma(self, period):
-                """calculate SMA"""
-                try:
-                    if len(self.data) >= period:
-                        prices = [self.data.close[-i] for i in range(period)]
-                        return sum(prices) / len(prices)
-                    return 0.0
-                except:
-                    return 0.0
-                    
-            def calculate_ema(self, period):
-                """calculate EMA"""
-                try:
-                    if len(self.data) >= period:
-                        key = f'EMA_{period}_prev'
-                        if key not in self.manual_indicators:
-                            # initial EMA value using SMA
-                            self.manual_indicators[key] = self.calculate_sma(period)
-                        
-                        alpha = 2.0 / (period + 1)
-                        prev_ema = self.manual_indicators[key]
-                        current_ema = alpha * self.data.close[0] + (1 - alpha) * prev_ema
-                        self.manual_indicators[key] = current_ema
-                        return current_ema
-                    return 0.0
-                except:
-                    return 0.0
-                    
-            def calculate_rsi(self, period):
-                """calculate RSI"""
-                try:
-                    if len(self.data) >= period + 1:
-                        gains = []
-                        losses = []
-                        for i in range(1, period + 1):
-                            change = self.data.close[-i] - self.data.close[-i-1]
-                            if change > 0:
-                                gains.append(change)
-                                losses.append(0)
-                            else:
-                                gains.append(0)
-                                losses.append(abs(change))
-                        
-                        avg_gain = sum(gains) / len(gains)
-                        avg_loss = sum(losses) / len(losses)
-                        
-                        if avg_loss == 0:
-                            return 100.0
-                        
-                        rs = avg_gain / avg_loss
-                        rsi = 100 - (100 / (1 + rs))
-                        return rsi
-                    return 50.0  # neutral value
-                except:
-                    return 50.0
-                    
-            def calculate_adx(self, period):
-                """simplify ADX calculation"""
-                return 25.0  # return neutral value
-                
-            def calculate_macd(self, fast_period, slow_period, signal_period):
-                """simplify MACD calculation"""
-                try:
-                    if len(self.data) >= max(fast_period, slow_period, signal_period):
-                        fast_ema = self.calculate_ema(fast_period)
-                        slow_ema = self.calculate_ema(slow_period)
-                        macd_line = fast_ema - slow_ema
-                        # simplify signal line calculation
-                        signal_line = macd_line * 0.9  # simplified processing
-                        return {'macd': macd_line, 'signal': signal_line}
-                    return {'macd': 0.0, 'signal': 0.0}
-                except:
-                    return {'macd': 0.0, 'signal': 0.0}
-            
             def next(self):
                 try:
                     # calculate minimum period
@@ -243,33 +369,16 @@ class BacktestEngine:
                     if len(self.broker.get_orders_open()) > 0:
                         return
                     
-                    # manually calculate all indicator values
+                    # read current indicator values from the data lines
                     indicator_values = {}
                     indicator_values['close'] = float(self.data.close[0])
                     
-                    # calculate basic indicators
-                    for indicator_name in strategy_config['indicators']:
-                        params = strategy_config['params'].get(indicator_name, {})
-                        
-                        if indicator_name == 'SMA':
-                            period = params.get('period', 20)
-                            indicator_values[indicator_name] = self.calculate_sma(period)
-                        elif indicator_name == 'EMA':
-                            period = params.get('period', 20)
-                            indicator_values[indicator_name] = self.calculate_ema(period)
-                        elif indicator_name == 'RSI':
-                            period = params.get('period', 14)
-                            indicator_values[indicator_name] = self.calculate_rsi(period)
-                        elif indicator_name == 'ADX':
-                            period = params.get('period', 14)
-                            indicator_values[indicator_name] = self.calculate_adx(period)
-                        elif indicator_name == 'MACD':
-                            fast_period = params.get('period_me1', 12)
-                            slow_period = params.get('period_me2', 26)
-                            signal_period = params.get('period_signal', 9)
-                            macd_result = self.calculate_macd(fast_period, slow_period, signal_period)
-                            indicator_values[indicator_name] = macd_result['macd']
-                            indicator_values[f"{indicator_name}_SIGNAL"] = macd_result['signal']
+                    for indicator_name, line in self.indicator_lines.items():
+                        indicator_values[indicator_name] = float(line[0])
+                    
+                    # skip bars where an indicator has not produced its first value yet
+                    if any(np.isnan(value) for value in indicator_values.values()):
+                        return
                     
                     # calculate crossover signal
                     close_price = indicator_values['close']
@@ -309,29 +418,36 @@ class BacktestEngine:
                         if not indicator_name.startswith('CrossOver'):
                             self.previous_values[indicator_name] = value
                     
-                    # get trading rules
-                    entry_rule = next((rule['expr'] for rule in strategy_config['rule'] if rule['type'] == 'entry'), None)
-                    exit_rule = next((rule['expr'] for rule in strategy_config['rule'] if rule['type'] == 'exit'), None)
-                    
                     # execute trading logic
                     if not self.position:
+                        self.trail_peak = None
                         if entry_rule:
                             try:
-                                rule_result = eval(entry_rule, indicator_values)
+                                rule_result = entry_rule(indicator_values)
                                 if rule_result:
                                     logger.info("Entry signal triggered")
                                     self.buy()
                             except Exception as e:
                                 logger.error(f"Error evaluating entry rule: {str(e)}")
                     else:
+                        entry_price = self.position.price
+                        self.trail_peak = max(self.trail_peak or entry_price, close_price)
+                        exit_signal = False
                         if exit_rule:
                             try:
-                                rule_result = eval(exit_rule, indicator_values)
-                                if rule_result:
-                                    logger.info("Exit signal triggered")
-                                    self.close()
+                                exit_signal = bool(exit_rule(indicator_values))
                             except Exception as e:
                                 logger.error(f"Error evaluating exit rule: {str(e)}")
+                        # stops are checked on the close like the exit rule (same order as the path kernel)
+                        if exit_signal:
+                            logger.info("Exit signal triggered")
+                            self.close()
+                        elif stops['trailing_percent'] and close_price <= self.trail_peak * (1 - stops['trailing_percent']):
+                            logger.info("Trailing stop triggered")
+                            self.close()
+                        elif stops['profit_take'] and close_price >= entry_price * (1 + stops['profit_take']):
+                            logger.info("Take-profit triggered")
+                            self.close()
                                 
                 except Exception as e:
                     logger.error(f"Error in next method: {str(e)}")
@@ -349,49 +465,33 @@ class BacktestEngine:
             Dict[str, Any]: Backtest results
         """
         # Run backtest
-        results = self.cerebro.run()
-        
-        # Get backtest results
-        strat = results[0]
-        
-        # Calculate backtest metrics
-        total_return = (self.cerebro.broker.getvalue() / INITIAL_CAPITAL) - 1
-        
-        # Calculate annualized return
-        days = (strat.data.datetime.date(-1) - strat.data.datetime.date(0)).days
-        annual_return = (1 + total_return) ** (365 / days) - 1
-        
-        # Calculate maximum drawdown
-        drawdown = strat.analyzers.drawdown.get_analysis()
-        max_dd_value = drawdown.get('max', {}).get('drawdown', 0.0)
-        max_drawdown = float(max_dd_value) / 100 if hasattr(max_dd_value, '__float__') else 0.0
-        
-        # Calculate Sharpe ratio
-        sharpe = strat.analyzers.sharpe.get_analysis()
-        sharpe_ratio = float(sharpe.get('sharperatio', 0.0)) if hasattr(sharpe.get('sharperatio', 0.0), '__float__') else 0.0
-        
-        # Calculate win rate
-        trades = strat.analyzers.trades.get_analysis()
-        total_trades = int(trades.get('total', 0)) if hasattr(trades.get('total', 0), '__int__') else 0
-        won_trades = int(trades.get('won', 0)) if hasattr(trades.get('won', 0), '__int__') else 0
-        win_rate = won_trades / total_trades if total_trades > 0 else 0
-        
-        return {
-            'strategy_name': self.strategy_config['name'],
-            'total_return': total_return,
-            'annual_return': annual_return,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'win_rate': win_rate,
-            'total_trades': total_trades,
-            'trades': trades,
-            'equity_curve': strat.analyzers.returns.get_analysis()
-        }
+        run_options = {}
+        if self.fast:
+            # runonce needs full-length buffers, so long histories trade it for bounded memory
+            bars = len(self.cerebro.datas[0].p.dataname) if self.cerebro.datas else 0
+            bounded = bars >= BACKTRADER_EXACTBARS_MIN_BARS
+            run_options = {'runonce': not bounded, 'preload': not bounded, 'exactbars': 1 if bounded else 0}
+        results = self.cerebro.run(**run_options)
+        log = results[0].analyzers.trade_log.get_analysis()
+        dates = self.dates[:len(log['equity'])]
+        pruned = log['pruned']
+        if pruned is not None:
+            pruned['date'] = str(np.datetime64(dates[pruned['bar']], 's'))
+            logger.info(f"Backtest pruned at {pruned['date']}: {pruned['reason']}")
+        result = backtest_result(self.strategy_config['name'], dates, log['equity'], log['trade_log'],
+                                 self.initial_capital, open_trades=log['open_trades'], pruned=pruned)
+        if self.analyzers:
+            result['analyzers'] = {name: getattr(results[0].analyzers, name).get_analysis() for name in self.analyzers}
+        return result
 
 
 def backtest_strategy(data: pd.DataFrame,
                        strategy: Dict[str, Any],
-                       initial_capital: float = 100000.0) -> Dict[str, Any]:
+                       initial_capital: float = 100000.0,
+                       engine: str = DEFAULT_BACKTEST_ENGINE,
+                       use_cache: bool = USE_BACKTEST_CACHE,
+                       pruning: Optional[PruningConstraints] = None,
+                       slippage: float = 0.0) -> Dict[str, Any]:
     """
     Backtest a single trading strategy
     
@@ -399,28 +499,77 @@ def backtest_strategy(data: pd.DataFrame,
         data: Backtest data
         strategy: Strategy configuration dictionary
         initial_capital: Initial capital
+        engine: 'backtrader' for the event-driven engine, 'vector' for the vectorized NumPy engine
+        use_cache: Reuse the result of an identical earlier backtest (same strategy, data,
+                   capital, commission, position size and engine version)
+        pruning: Stop as soon as the run can no longer be satisfactory (see PruningConstraints);
+                 such results are partial and carry the stop in 'pruned'
+        slippage: Fill price slippage as a fraction of the price (e.g. SLIPPAGE)
         
     Returns:
-        Dict[str, Any]: Backtest results
+        Dict[str, Any]: Backtest results, with 'cache_key' when caching is enabled
     """
-    engine = BacktestEngine()
-    logger.info(f"backtest engine set up successfully")
-    engine.set_data(data)
-    logger.info(f"backtest engine set data successfully")
-    engine.add_strategy(strategy)
-    logger.info(f"backtest engine added strategy successfully")
-    return engine.run_backtest()
-
-def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
+    if engine not in ('vector', 'backtrader'):
+        raise ValueError(f"Unknown backtest engine: {engine}")
+
+    cache_key = None
+    if use_cache:
+        # hashed before the engines see the strategy (add_strategy annotates it)
+        cache_key = get_backtest_cache().make_key(
+            strategy, fingerprint_data(data), initial_capital, COMMISSION_RATE, POSITION_SIZE,
+            engine, VECTOR_ENGINE_VERSION if engine == 'vector' else ENGINE_VERSION,
+            options={'pruning': pruning.as_dict() if pruning is not None else None, 'slippage': float(slippage),
+                     **_result_settings()})
+        cached = get_backtest_cache().get(cache_key)
+        if cached is not None:
+            logger.info(f"Backtest cache hit for {strategy.get('name', 'Unnamed Strategy')} ({engine})")
+            return cached
+
+    if engine == 'vector':
+        vector_engine = VectorBacktestEngine(initial_capital=initial_capital, pruning=pruning, slippage=slippage)
+        vector_engine.set_data(data)
+        vector_engine.add_strategy(strategy)
+        result = vector_engine.run_backtest()
+    else:
+        backtrader_engine = BacktestEngine(initial_capital=initial_capital, pruning=pruning, slippage=slippage)
+        logger.info(f"backtest engine set up successfully")
+        backtrader_engine.set_data(data, required_indicators(strategy))
+        logger.info(f"backtest engine set data successfully")
+        backtrader_engine.add_strategy(strategy)
+        logger.info(f"backtest engine added strategy successfully")
+        result = backtrader_engine.run_backtest()
+
+    if cache_key is not None:
+        result['cache_key'] = cache_key
+        get_backtest_cache().put(cache_key, result)
+    return result
+
+def evaluate_backtest(backtest_results: Dict[str, Any], monte_carlo_paths: int = MONTE_CARLO_PATHS,
+                      metrics: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Evaluate backtest results and generate detailed performance analysis report
     
     Args:
         backtest_results: Backtest results dictionary, containing strategy name, return, drawdown, etc.
+        monte_carlo_paths: Bootstrap paths over the equity curve's returns, 0 to skip the Monte Carlo check
+        metrics: Precomputed performance_metrics of the results (e.g. one row of a batch), computed here if None
         
     Returns:
         Dict[str, Any]: Dictionary containing detailed evaluation metrics
     """
+    # results from a cached backtest carry their key, so the report can be cached too
+    evaluation_key = None
+    if backtest_results.get('cache_key') and metrics is None:
+        evaluation_key = canonical_hash({
+            'backtest': backtest_results['cache_key'],
+            'evaluation_version': EVALUATION_VERSION,
+            'monte_carlo': [monte_carlo_paths, MONTE_CARLO_BLOCK_SIZE, MONTE_CARLO_SEED, MONTE_CARLO_CONFIDENCE],
+            **_result_settings()
+        })
+        cached = get_backtest_cache().get(evaluation_key)
+        if cached is not None:
+            return cached
+
     try:
         # safe getting basic metrics
         total_return = backtest_results.get('total_return', 0.0)
@@ -430,71 +579,25 @@ def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
         win_rate = backtest_results.get('win_rate', 0.0)
         total_trades = backtest_results.get('total_trades', 0)
         
-        # Calculate risk-adjusted return metrics
-        sortino_ratio = annual_return / (abs(max_drawdown) + 1e-6)  # Sortino ratio
-        calmar_ratio = annual_return / (abs(max_drawdown) + 1e-6)   # Calmar ratio
-        
-        # safe handling of trade statistics
-        trades = backtest_results.get('trades', {})
-        avg_trade_return = 0.0
-        profit_factor = 1.0
-        
-        if isinstance(trades, dict) and 'pnl' in trades:
+        # risk, drawdown and trade statistics in one pass over the equity and trade arrays
+        equity = np.asarray(backtest_results.get('equity', []), dtype=np.float64)
+        if metrics is None:
+            trade_log = backtest_results.get('trade_log')
+            metrics = performance_metrics(equity, trade_log['pnl'] if trade_log is not None else (),
+                                          years=years_between(backtest_results.get('dates')))
+        returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.zeros(0)
+        
+        # Monte Carlo bootstrap of the daily returns: confidence bands instead of a single path
+        monte_carlo = None
+        lower_key = upper_key = None
+        if monte_carlo_paths and len(equity) > 20 and not backtest_results.get('pruned'):
             try:
-                pnl_data = trades['pnl']
-                if isinstance(pnl_data, dict) and 'net' in pnl_data:
-                    avg_trade_return = pnl_data['net'].get('average', 0.0)
-                    total_pnl = pnl_data['net'].get('total', 0.0)
-                    gross_pnl = pnl_data.get('gross', {}).get('total', 0.0)
-                    if gross_pnl != 0:
-                        profit_factor = abs(total_pnl) / abs(gross_pnl - total_pnl)
+                tail = (1 - MONTE_CARLO_CONFIDENCE) / 2 * 100
+                lower_key, upper_key = f"p{tail:g}", f"p{100 - tail:g}"
+                percentiles = sorted(set(DEFAULT_PERCENTILES) | {tail, 100 - tail})
+                monte_carlo = monte_carlo_returns(returns, n_paths=monte_carlo_paths, percentiles=percentiles)
             except Exception as e:
-                logger.warning(f"Could not extract trade PnL data: {str(e)}")
-        
-        # safe handling of equity curve analysis
-        equity_curve = backtest_results.get('equity_curve', {})
-        volatility = 0.0
-        
-        if isinstance(equity_curve, dict) and equity_curve:
-            try:
-                equity_values = list(equity_curve.values()) if equity_curve else [1.0]
-                equity_series = pd.Series(equity_values)
-                if len(equity_series) > 1:
-                    volatility = equity_series.pct_change().std() * np.sqrt(252)
-            except Exception as e:
-                logger.warning(f"Could not calculate volatility: {str(e)}")
-        
-        # safe calculation of consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        
-        if isinstance(trades, dict) and 'trades' in trades:
-            trade_list = trades.get('trades', [])
-            if isinstance(trade_list, list):
-                for trade in trade_list:
-                    if isinstance(trade, dict) and trade.get('pnl', 0) < 0:
-                        consecutive_losses += 1
-                        max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-                    else:
-                        consecutive_losses = 0
-    
-        # safe calculation of risk metrics
-        var_95 = 0.0
-        expected_shortfall = 0.0
-        
-        if isinstance(equity_curve, dict) and equity_curve:
-            try:
-                equity_values = list(equity_curve.values()) if equity_curve else [1.0]
-                equity_series = pd.Series(equity_values)
-                if len(equity_series) > 1:
-                    returns = equity_series.pct_change().dropna()
-                    if len(returns) > 0:
-                        var_95 = returns.quantile(0.05)
-                        tail_returns = returns[returns <= var_95]
-                        if len(tail_returns) > 0:
-                            expected_shortfall = tail_returns.mean()
-            except Exception as e:
-                logger.warning(f"Could not calculate risk metrics: {str(e)}")
+                logger.warning(f"Could not run Monte Carlo bootstrap: {str(e)}")
         
         # Generate evaluation report
         evaluation_report = {
@@ -504,21 +607,27 @@ def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
                 'annual_return': float(annual_return),
                 'max_drawdown': float(max_drawdown),
                 'sharpe_ratio': float(sharpe_ratio),
-                'sortino_ratio': float(sortino_ratio),
-                'calmar_ratio': float(calmar_ratio),
-                'volatility': float(volatility)
+                'sortino_ratio': float(metrics['sortino_ratio']),
+                'calmar_ratio': float(metrics['calmar_ratio']),
+                'volatility': float(metrics['volatility']),
+                'rolling_sharpe_min': float(metrics['rolling_sharpe_min'])
             },
             'trading_statistics': {
                 'total_trades': int(total_trades),
                 'win_rate': float(win_rate),
-                'profit_factor': float(profit_factor),
-                'avg_trade_return': float(avg_trade_return),
-                'max_consecutive_losses': int(max_consecutive_losses)
+                'profit_factor': float(metrics['profit_factor']),
+                'avg_trade_return': float(metrics['avg_trade_return']),
+                'max_consecutive_wins': int(metrics['max_consecutive_wins']),
+                'max_consecutive_losses': int(metrics['max_consecutive_losses'])
             },
             'risk_metrics': {
-                'value_at_risk_95': float(var_95),
-                'expected_shortfall': float(expected_shortfall)
-            }
+                'value_at_risk_95': float(metrics['value_at_risk']),
+                'expected_shortfall': float(metrics['expected_shortfall']),
+                'downside_deviation': float(metrics['downside_deviation']),
+                'max_drawdown_duration': int(metrics['max_drawdown_duration']),
+                'ulcer_index': float(metrics['ulcer_index'])
+            },
+            'monte_carlo': monte_carlo
         }
         
         # Add evaluation conclusion
@@ -551,15 +660,35 @@ def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
         if abs(max_drawdown) > 0.3:
             evaluation_report['conclusion']['weaknesses'].append('drawdown too large')
         
+        # Monte Carlo confidence bands: the pessimistic Sharpe must stay positive and
+        # the pessimistic drawdown within the same limit as the backtest's own drawdown
+        monte_carlo_ok = monte_carlo is None or (
+            monte_carlo['sharpe_ratio'][lower_key] > 0 and
+            monte_carlo['max_drawdown'][upper_key] < SATISFACTORY_MAX_DRAWDOWN
+        )
+        if monte_carlo is not None and not monte_carlo_ok:
+            evaluation_report['conclusion']['weaknesses'].append('performance is not robust under Monte Carlo resampling')
+        
+        # a pruned run stopped once it could no longer pass, its metrics cover only part of the data
+        pruned = backtest_results.get('pruned')
+        evaluation_report['pruned'] = pruned
+        if pruned:
+            evaluation_report['conclusion']['weaknesses'].append(
+                f"backtest stopped early on {pruned['date']} ({pruned['reason']} constraint)")
+        
         # Add is_satisfactory flag based on key metrics
         evaluation_report['is_satisfactory'] = bool(
-            sharpe_ratio > 1.0 and
-            win_rate > 0.5 and      
-            abs(max_drawdown) < 0.3 and 
-            total_trades >= 10      
+            sharpe_ratio > SATISFACTORY_MIN_SHARPE and
+            win_rate > SATISFACTORY_MIN_WIN_RATE and      
+            abs(max_drawdown) < SATISFACTORY_MAX_DRAWDOWN and 
+            total_trades >= SATISFACTORY_MIN_TRADES and
+            monte_carlo_ok and
+            not pruned
         )
         
         logger.info(f"Backtest evaluation completed. Rating: {overall_rating}, Satisfactory: {evaluation_report['is_satisfactory']}")
+        if evaluation_key is not None:
+            get_backtest_cache().put(evaluation_key, evaluation_report)
         return evaluation_report
         
     except Exception as e:
@@ -575,19 +704,26 @@ def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
                 'sharpe_ratio': 0.0,
                 'sortino_ratio': 0.0,
                 'calmar_ratio': 0.0,
-                'volatility': 0.0
+                'volatility': 0.0,
+                'rolling_sharpe_min': 0.0
             },
             'trading_statistics': {
                 'total_trades': 0,
                 'win_rate': 0.0,
                 'profit_factor': 0.0,
                 'avg_trade_return': 0.0,
+                'max_consecutive_wins': 0,
                 'max_consecutive_losses': 0
             },
             'risk_metrics': {
                 'value_at_risk_95': 0.0,
-                'expected_shortfall': 0.0
+                'expected_shortfall': 0.0,
+                'downside_deviation': 0.0,
+                'max_drawdown_duration': 0,
+                'ulcer_index': 0.0
             },
+            'monte_carlo': None,
+            'pruned': backtest_results.get('pruned'),
             'conclusion': {
                 'overall_rating': 'Error',
                 'strengths': [],
@@ -597,6 +733,43 @@ def evaluate_backtest(backtest_results: Dict[str, Any]) -> Dict[str, Any]:
             'error': str(e)
         }
 
+def build_quant_report(symbol: str, strategy: Dict[str, Any], live_signal: str,
+                       evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the simplified quantitative analysis report from a backtest evaluation
+    
+    Args:
+        symbol: Asset symbol
+        strategy: Strategy configuration dictionary
+        live_signal: Latest trading signal
+        evaluation: Result of evaluate_backtest
+        
+    Returns:
+        Dict[str, Any]: Report with core metrics and conclusion
+    """
+    report = {
+        'status': 'success',
+        'symbol': symbol,
+        'strategy_name': strategy['name'],
+        'live_signal': live_signal,
+        # core performance metrics
+        'key_metrics': {
+            'total_return': f"{evaluation['performance_metrics']['total_return']:.2%}",
+            'sharpe_ratio': round(evaluation['performance_metrics']['sharpe_ratio'], 2),
+            'max_drawdown': f"{evaluation['performance_metrics']['max_drawdown']:.2%}",
+            'win_rate': f"{evaluation['trading_statistics']['win_rate']:.1%}"
+        },
+        # simplified conclusion
+        'summary': {
+            'rating': evaluation['conclusion']['overall_rating'],
+            'recommendation': "suggest to use" if evaluation['is_satisfactory'] else "not suggest to use",
+            'key_strength': evaluation['conclusion']['strengths'][0] if evaluation['conclusion']['strengths'] else "no obvious strength",
+            'main_weakness': evaluation['conclusion']['weaknesses'][0] if evaluation['conclusion']['weaknesses'] else "good performance"
+        },
+        'is_satisfactory': evaluation['is_satisfactory']
+    }
+    return report
+
 def quant_analysis(symbol: str, strategy: dict) -> dict:
     """
     Performs quantitative analysis based on the given symbol and trading strategy.
@@ -610,8 +783,8 @@ def quant_analysis(symbol: str, strategy: dict) -> dict:
             raise ValueError(f"Failed to get historical data for asset {symbol}")
         logger.info(f"got historical_data")
             
-        # 2. Calculate technical indicators
-        data_with_indicators = calculate_indicators(historical_data)
+        # 2. Calculate the technical indicators the strategy declares
+        data_with_indicators = calculate_indicators(historical_data, strategy)
         if data_with_indicators is None:
             raise ValueError("Failed to calculate technical indicators")
         logger.info(f"calculated indicators")
@@ -635,27 +808,7 @@ def quant_analysis(symbol: str, strategy: dict) -> dict:
         evaluation = evaluate_backtest(backtest_result)
         logger.info(f"evaluation result: {evaluation}")
         # 6. Generate backtest report - simplified version, only keep core information
-        report = {
-            'status': 'success',
-            'symbol': symbol,
-            'strategy_name': strategy['name'],
-            'live_signal': live_signal,
-            # core performance metrics
-            'key_metrics': {
-                'total_return': f"{evaluation['performance_metrics']['total_return']:.2%}",
-                'sharpe_ratio': round(evaluation['performance_metrics']['sharpe_ratio'], 2),
-                'max_drawdown': f"{evaluation['performance_metrics']['max_drawdown']:.2%}",
-                'win_rate': f"{evaluation['trading_statistics']['win_rate']:.1%}"
-            },
-            # simplified conclusion
-            'summary': {
-                'rating': evaluation['conclusion']['overall_rating'],
-                'recommendation': "suggest to use" if evaluation['is_satisfactory'] else "not suggest to use",
-                'key_strength': evaluation['conclusion']['strengths'][0] if evaluation['conclusion']['strengths'] else "no obvious strength",
-                'main_weakness': evaluation['conclusion']['weaknesses'][0] if evaluation['conclusion']['weaknesses'] else "good performance"
-            },
-            'is_satisfactory': evaluation['is_satisfactory']
-        }
+        report = build_quant_report(symbol, strategy, live_signal, evaluation)
         logger.info(f"backtest report: {report}")
         return report
         
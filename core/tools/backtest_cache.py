@@ -0,0 +1,253 @@
+"""
+Backtest cache module
+Memoize backtest results and evaluation reports under a canonical hash of everything
+that determines them: strategy configuration, input data, capital, commission, position
+size and engine version. Any change to one of these produces a different key, so stale
+entries are never returned; they simply age out of the LRU. The optional disk tier is
+bounded too, its least recently used files are removed.
+"""
+
+import os
+import copy
+import json
+import pickle
+import hashlib
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from utils.logger import setup_logger
+from config.settings import BACKTEST_CACHE_MAX_ENTRIES, BACKTEST_CACHE_DIR, BACKTEST_CACHE_MAX_DISK_ENTRIES
+from core.tools.indicator_cache import fingerprint_bars
+
+logger = setup_logger(__name__)
+
+# bump when the result layout of the cache itself changes
+CACHE_FORMAT_VERSION = 1
+
+def canonical_hash(payload: Any) -> str:
+    """
+    Hash a JSON-like payload independent of dict ordering
+
+    Args:
+        payload: Dicts, lists and scalars (other values are hashed by their string form)
+
+    Returns:
+        str: Hex digest
+    """
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+
+def fingerprint_data(data: pd.DataFrame) -> str:
+    """
+    Fingerprint every numeric column of a backtest input (OHLCV and any precomputed
+    indicator columns), so changed indicator values invalidate cached results too
+
+    Args:
+        data: Backtest input frame
+
+    Returns:
+        str: Hex digest
+    """
+    frame = data.copy(deep=False)
+    frame.columns = [str(col).lower() for col in frame.columns]
+    numeric = sorted(col for col in frame.columns
+                     if col != 'datetime' and pd.api.types.is_numeric_dtype(frame[col]))
+    return fingerprint_bars(frame, columns=numeric)
+
+class BacktestCache:
+    """Bounded in-memory LRU cache of backtest results with an optional on-disk tier"""
+
+    def __init__(self, max_entries: int = BACKTEST_CACHE_MAX_ENTRIES, disk_dir: Optional[str] = BACKTEST_CACHE_DIR,
+                 max_disk_entries: int = BACKTEST_CACHE_MAX_DISK_ENTRIES):
+        """
+        Initialize backtest cache
+
+        Args:
+            max_entries: Number of results kept in memory
+            disk_dir: Directory of the disk tier, None or empty to keep the cache in memory only
+            max_disk_entries: Number of result files kept in the disk tier
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.disk_dir = disk_dir or None
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._disk_files = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_files = len(self._disk_names())
+
+    @staticmethod
+    def make_key(strategy: Dict[str, Any], data_fingerprint: str, initial_capital: float,
+                 commission: float, position_size: float, engine: str, engine_version: str,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the key of a backtest result
+
+        Args:
+            strategy: Strategy configuration as passed to the engine
+            data_fingerprint: fingerprint_data of the input frame
+            initial_capital: Starting cash
+            commission: Commission rate
+            position_size: Fraction of cash per trade
+            engine: Engine name
+            engine_version: Version string of the engine implementation
+            options: Further run settings that change the result (e.g. pruning constraints)
+
+        Returns:
+            str: Hex digest
+        """
+        return canonical_hash({
+            'format': CACHE_FORMAT_VERSION,
+            'strategy': strategy,
+            'data': data_fingerprint,
+            'initial_capital': float(initial_capital),
+            'commission': float(commission),
+            'position_size': float(position_size),
+            'engine': engine,
+            'engine_version': engine_version,
+            'options': options or {}
+        })
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + '.pkl')
+
+    def _disk_names(self) -> List[str]:
+        return [name for name in os.listdir(self.disk_dir) if name.endswith('.pkl')]
+
+    def _trim_disk(self) -> None:
+        """Remove the least recently used files beyond max_disk_entries"""
+        paths = [os.path.join(self.disk_dir, name) for name in self._disk_names()]
+        excess = len(paths) - self.max_disk_entries
+        if excess > 0:
+            def last_used(path: str) -> float:
+                try:
+                    return os.path.getmtime(path)
+                except OSError:
+                    return 0.0
+            for path in sorted(paths, key=last_used)[:excess]:
+                try:
+                    os.remove(path)
+                    self.disk_evictions += 1
+                except OSError:
+                    pass
+        self._disk_files = min(len(paths), self.max_disk_entries)
+
+    def _store(self, key: str, value: Any) -> None:
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Key from make_key (or a derived key)
+
+        Returns:
+            A copy of the cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(value)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'rb') as f:
+                        value = pickle.load(f)
+                    # the file's mtime orders the disk tier's LRU eviction
+                    os.utime(path)
+                    with self._lock:
+                        self._store(key, value)
+                        self.disk_hits += 1
+                    return copy.deepcopy(value)
+                except Exception as e:
+                    logger.warning(f"Failed to read backtest cache file {path}: {str(e)}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a result (a private copy is kept, so callers may modify theirs)
+
+        Args:
+            key: Key from make_key (or a derived key)
+            value: Picklable result
+        """
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, stored)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                is_new = not os.path.exists(path)
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self._disk_files += is_new
+                    if self._disk_files > self.max_disk_entries:
+                        self._trim_disk()
+            except Exception as e:
+                logger.warning(f"Failed to write backtest cache file {path}: {str(e)}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'disk_entries': self._disk_files
+            }
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        Drop the memory tier and reset the counters
+
+        Args:
+            disk: Also delete the files of the disk tier
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = self.disk_evictions = 0
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in self._disk_names():
+                os.remove(os.path.join(self.disk_dir, name))
+            self._disk_files = 0
+
+_backtest_cache: Optional[BacktestCache] = None
+
+def get_backtest_cache() -> BacktestCache:
+    """Return the process-wide backtest cache instance"""
+    global _backtest_cache
+    if _backtest_cache is None:
+        _backtest_cache = BacktestCache()
+    return _backtest_cache
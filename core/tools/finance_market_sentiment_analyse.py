@@ -2,20 +2,19 @@ from typing import Dict, Any, List, Optional
 import logging
 import os
 from dotenv import load_dotenv
-import requests
 from datetime import datetime, timedelta
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 import json
-import yfinance as yf
-from bs4 import BeautifulSoup
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.tools import tool
+from core.data.providers import get_provider
+from utils.singleflight import SingleFlight
 
 # Load environment variables
 load_dotenv()
@@ -30,6 +29,9 @@ if not OPENAI_API_KEY:
     logger.error("OPENAI_API_KEY not found, please make sure your .env file is configured correctly")
     raise ValueError("OPENAI_API_KEY not found, please make sure your .env file is configured correctly")
 
+# coalesces concurrent news requests for the same symbol
+_news_flight = SingleFlight()
+
 class NewsArticle(BaseModel):
     """News article model"""
     title: str = Field(description="News title")
@@ -105,42 +107,10 @@ class SentimentAgent:
             News list
         """
         try:
-            # Get news using yfinance
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
-            
-            # limit news number, only process the first 5 news
-            news = news[:5]
-            
-            # Format news data
-            formatted_articles = []
-            for article in news:
-                # Convert timestamp to date string
-                print(article['content']['pubDate'])
-                date = article['content']['pubDate']
-                url = article['content']['canonicalUrl']['url']
-                
-                # Get the first part of content only (limit to 300 chars)
-                limited_content = ""
-                try:
-                    r = requests.get(url, timeout=5)
-                    soup = BeautifulSoup(r.text, "html.parser")
-                    paragraphs = soup.find_all("p")
-                    full_text = "\n".join(p.get_text() for p in paragraphs[:3] if p.get_text())  # only get the first 3 paragraphs
-                    limited_content = full_text[:300] + "..." if len(full_text) > 300 else full_text  # limit to 300 characters
-                except Exception as e:
-                    logger.warning(f"Failed to fetch body: {e}")   
-
-                formatted_articles.append({
-                    "title": article['content']['title'],
-                    "source": article['content']['provider']['displayName'],
-                    "date": date,
-                    "summary": article['content']['summary'],
-                    "url": url,
-                    "content": limited_content
-                })
-                
-            return formatted_articles
+            # Get news from the active market data provider, only process the first 5 news.
+            # Concurrent requests for the same symbol share one upstream call.
+            articles = _news_flight.do(('news', symbol), get_provider().get_news, symbol, limit=5)
+            return list(articles)
             
         except Exception as e:
             logger.error(f"Error getting news: {str(e)}")
@@ -0,0 +1,192 @@
+"""
+Indicator cache module
+Memoize computed indicator columns under a fingerprint of the input bars plus the
+indicator name and parameters, with LRU eviction and an optional disk tier
+"""
+
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from utils.logger import setup_logger
+from config.settings import INDICATOR_CACHE_MAX_MB, INDICATOR_CACHE_DIR
+
+logger = setup_logger(__name__)
+
+FINGERPRINT_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+def fingerprint_bars(data: pd.DataFrame, columns=FINGERPRINT_COLUMNS) -> str:
+    """
+    Hash the bar values (and timestamps) of a frame
+
+    Args:
+        data: DataFrame with lowercase OHLCV columns
+        columns: Columns to include in the fingerprint
+
+    Returns:
+        str: Hex digest identifying the input bars
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(data)).encode())
+    for col in columns:
+        if col in data.columns:
+            digest.update(col.encode())
+            digest.update(np.ascontiguousarray(data[col].to_numpy(dtype=np.float64, na_value=np.nan)).tobytes())
+    if 'datetime' in data.columns:
+        times = pd.DatetimeIndex(data['datetime'])
+    elif isinstance(data.index, pd.DatetimeIndex):
+        times = data.index
+    else:
+        times = None
+    if times is not None:
+        if times.tz is not None:
+            times = times.tz_convert('UTC').tz_localize(None)
+        digest.update(np.ascontiguousarray(times.values.astype('datetime64[ns]').view(np.int64)).tobytes())
+    return digest.hexdigest()
+
+class IndicatorCache:
+    """Bounded in-memory LRU cache of indicator columns with an optional on-disk tier"""
+
+    def __init__(self, max_bytes: int = INDICATOR_CACHE_MAX_MB * 1024 * 1024, disk_dir: Optional[str] = INDICATOR_CACHE_DIR):
+        """
+        Initialize indicator cache
+
+        Args:
+            max_bytes: Memory budget of the cached arrays
+            disk_dir: Directory of the disk tier, None to keep the cache in memory only
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint: str, name: str, params: Dict[str, Any]) -> str:
+        """Build a cache key from a bars fingerprint and an indicator with its params"""
+        return f"{fingerprint}:{name}:{json.dumps(params, sort_keys=True)}"
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest() + '.npz')
+
+    @staticmethod
+    def _size(columns: Dict[str, np.ndarray]) -> int:
+        return sum(arr.nbytes for arr in columns.values())
+
+    def _store(self, key: str, columns: Dict[str, np.ndarray]) -> None:
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        if key in self._entries:
+            self._bytes -= self._size(self._entries.pop(key))
+        self._entries[key] = columns
+        self._bytes += self._size(columns)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._size(evicted)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Look up cached indicator columns
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Mapping of column name to read-only array, or None on a miss
+        """
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return columns
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with np.load(path) as npz:
+                        columns = {col: npz[col] for col in npz.files}
+                    for arr in columns.values():
+                        arr.setflags(write=False)
+                    with self._lock:
+                        self._store(key, columns)
+                        self.disk_hits += 1
+                    return columns
+                except Exception as e:
+                    logger.warning(f"Failed to read indicator cache file {path}: {str(e)}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, columns: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Store indicator columns
+
+        Args:
+            key: Key from make_key
+            columns: Mapping of column name to values (Series or arrays)
+
+        Returns:
+            The stored read-only arrays
+        """
+        stored = {}
+        for col, values in columns.items():
+            arr = np.array(values, dtype=np.float64)
+            arr.setflags(write=False)
+            stored[col] = arr
+
+        with self._lock:
+            self._store(key, stored)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            try:
+                np.savez(tmp_path, **stored)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Failed to write indicator cache file {path}: {str(e)}")
+        return stored
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size, for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset the counters (the disk tier is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+_indicator_cache: Optional[IndicatorCache] = None
+
+def get_indicator_cache() -> IndicatorCache:
+    """Return the process-wide indicator cache instance"""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache()
+    return _indicator_cache
@@ -0,0 +1,221 @@
+"""
+Indicator registry module
+Declarative specs of every supported technical indicator, so that only the columns
+a strategy actually needs are computed
+"""
+
+import talib
+import pandas as pd
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Tuple, Optional, Sequence
+from utils.logger import setup_logger
+from config.settings import USE_INDICATOR_CACHE
+from core.tools.indicator_cache import get_indicator_cache, fingerprint_bars
+
+logger = setup_logger(__name__)
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Declaration of a technical indicator
+
+    Attributes:
+        name: Indicator name as used in strategy configurations, e.g. 'SMA'
+        inputs: Lowercase OHLCV columns the indicator reads
+        outputs: Base names of the produced columns, e.g. ('MACD', 'MACD_SIGNAL', 'MACD_HIST')
+        defaults: Parameters and their default values; other strategy params (e.g. thresholds) are ignored
+        compute: Function (data, **params) returning one array/Series per output
+        suffix: 'always' to append the parameter values to every column name (SMA_50),
+                'non_default' to append them only when they differ from the defaults (RSI, RSI_21)
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    defaults: Dict[str, Any]
+    compute: Callable[..., Sequence[Any]]
+    suffix: str = 'non_default'
+
+    def resolve_params(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Merge the given params over the defaults, dropping keys the indicator does not use"""
+        resolved = dict(self.defaults)
+        for key, value in (params or {}).items():
+            if key in self.defaults:
+                resolved[key] = value
+        return resolved
+
+    def columns(self, params: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Column names produced for the given params"""
+        resolved = self.resolve_params(params)
+        if not resolved or (self.suffix == 'non_default' and resolved == self.defaults):
+            return list(self.outputs)
+        suffix = '_'.join(str(resolved[key]) for key in self.defaults)
+        return [f"{output}_{suffix}" for output in self.outputs]
+
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {}
+
+def register_indicator(spec: IndicatorSpec) -> IndicatorSpec:
+    """Add an indicator spec to the registry (replacing any spec with the same name)"""
+    INDICATOR_REGISTRY[spec.name] = spec
+    return spec
+
+def get_indicator_spec(name: str) -> IndicatorSpec:
+    """Look up an indicator spec by name"""
+    if name not in INDICATOR_REGISTRY:
+        raise ValueError(f"Unknown indicator: {name}. Available: {list(INDICATOR_REGISTRY)}")
+    return INDICATOR_REGISTRY[name]
+
+def indicator_columns(name: str, params: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Column names produced by an indicator with the given params"""
+    return get_indicator_spec(name).columns(params)
+
+# ---- built-in indicators ----
+
+register_indicator(IndicatorSpec(
+    name='SMA', inputs=('close',), outputs=('SMA',), defaults={'period': 20}, suffix='always',
+    compute=lambda d, period: (talib.SMA(d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='EMA', inputs=('close',), outputs=('EMA',), defaults={'period': 20}, suffix='always',
+    compute=lambda d, period: (talib.EMA(d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='MACD', inputs=('close',), outputs=('MACD', 'MACD_SIGNAL', 'MACD_HIST'),
+    defaults={'period_me1': 12, 'period_me2': 26, 'period_signal': 9},
+    compute=lambda d, period_me1, period_me2, period_signal: talib.MACD(
+        d['close'], fastperiod=period_me1, slowperiod=period_me2, signalperiod=period_signal)
+))
+register_indicator(IndicatorSpec(
+    name='RSI', inputs=('close',), outputs=('RSI',), defaults={'period': 14},
+    compute=lambda d, period: (talib.RSI(d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='ADX', inputs=('high', 'low', 'close'), outputs=('ADX',), defaults={'period': 14},
+    compute=lambda d, period: (talib.ADX(d['high'], d['low'], d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='BBANDS', inputs=('close',), outputs=('BB_UPPER', 'BB_MIDDLE', 'BB_LOWER'), defaults={'period': 20},
+    compute=lambda d, period: talib.BBANDS(d['close'], timeperiod=period)
+))
+register_indicator(IndicatorSpec(
+    name='ATR', inputs=('high', 'low', 'close'), outputs=('ATR',), defaults={'period': 14},
+    compute=lambda d, period: (talib.ATR(d['high'], d['low'], d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='DONCHIAN', inputs=('high', 'low'), outputs=('DONCHIAN_HIGH', 'DONCHIAN_LOW'), defaults={'period': 20},
+    compute=lambda d, period: (d['high'].rolling(window=period).max(), d['low'].rolling(window=period).min())
+))
+register_indicator(IndicatorSpec(
+    name='ROC', inputs=('close',), outputs=('ROC',), defaults={'period': 10},
+    compute=lambda d, period: (talib.ROC(d['close'], timeperiod=period),)
+))
+register_indicator(IndicatorSpec(
+    name='OBV', inputs=('close', 'volume'), outputs=('OBV',), defaults={},
+    compute=lambda d: (talib.OBV(d['close'], d['volume']),)
+))
+register_indicator(IndicatorSpec(
+    name='STOCH', inputs=('high', 'low', 'close'), outputs=('STOCH_K', 'STOCH_D'), defaults={},
+    compute=lambda d: talib.STOCH(d['high'], d['low'], d['close'])
+))
+register_indicator(IndicatorSpec(
+    name='VOLATILITY', inputs=('close',), outputs=('VOLATILITY',), defaults={'period': 20},
+    compute=lambda d, period: (d['close'].pct_change().rolling(window=period).std(),)
+))
+register_indicator(IndicatorSpec(
+    name='PRICE_CHANGE', inputs=('close',), outputs=('PRICE_CHANGE',), defaults={},
+    compute=lambda d: (d['close'].pct_change(),)
+))
+register_indicator(IndicatorSpec(
+    name='VOLUME_CHANGE', inputs=('volume',), outputs=('VOLUME_CHANGE',), defaults={},
+    compute=lambda d: (d['volume'].pct_change(),)
+))
+register_indicator(IndicatorSpec(
+    name='HIGH_LOW_RANGE', inputs=('high', 'low'), outputs=('HIGH_LOW_RANGE',), defaults={},
+    compute=lambda d: (d['high'] - d['low'],)
+))
+
+# Full indicator set computed when no strategy is given (the historical calculate_indicators output)
+DEFAULT_INDICATORS: List[Tuple[str, Dict[str, Any]]] = [
+    ('SMA', {'period': 5}), ('SMA', {'period': 10}), ('SMA', {'period': 20}),
+    ('SMA', {'period': 50}), ('SMA', {'period': 200}),
+    ('EMA', {'period': 5}), ('EMA', {'period': 10}), ('EMA', {'period': 20}), ('EMA', {'period': 50}),
+    ('MACD', {}), ('RSI', {}), ('ADX', {}), ('BBANDS', {}), ('ATR', {}), ('DONCHIAN', {}),
+    ('ROC', {}), ('OBV', {}), ('STOCH', {}), ('VOLATILITY', {}),
+    ('PRICE_CHANGE', {}), ('VOLUME_CHANGE', {}), ('HIGH_LOW_RANGE', {})
+]
+
+def required_indicators(strategy: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Resolve the indicators (with parameters) a strategy declares
+
+    Args:
+        strategy: Strategy configuration with 'indicators' and 'params'
+
+    Returns:
+        List of (indicator name, resolved params)
+    """
+    requests = []
+    for name in strategy.get('indicators', []):
+        spec = get_indicator_spec(name)
+        requests.append((name, spec.resolve_params(strategy.get('params', {}).get(name, {}))))
+    return requests
+
+def strategy_columns(strategy: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map the names used in a strategy's rules to the computed column names
+
+    e.g. {'EMA': 'EMA_21', 'RSI': 'RSI'} or {'MACD': 'MACD', 'MACD_SIGNAL': 'MACD_SIGNAL', 'MACD_HIST': 'MACD_HIST'}
+
+    Args:
+        strategy: Strategy configuration
+
+    Returns:
+        Dict[str, str]: Rule name -> column name
+    """
+    mapping = {}
+    for name, params in required_indicators(strategy):
+        spec = get_indicator_spec(name)
+        for output, column in zip(spec.outputs, spec.columns(params)):
+            mapping[output] = column
+    return mapping
+
+def compute_indicators(data: pd.DataFrame, requests: List[Tuple[str, Dict[str, Any]]],
+                       use_cache: bool = USE_INDICATOR_CACHE) -> pd.DataFrame:
+    """
+    Add the requested indicator columns to a frame with lowercase OHLCV columns
+
+    Columns that already exist are not recomputed. With the cache enabled, results are
+    looked up by a fingerprint of the input bars plus the indicator name and params.
+
+    Args:
+        data: DataFrame with lowercase 'open', 'high', 'low', 'close', 'volume' columns
+        requests: List of (indicator name, params)
+        use_cache: Whether to use the indicator result cache
+
+    Returns:
+        pd.DataFrame: The same frame with the indicator columns added
+    """
+    cache = get_indicator_cache() if use_cache else None
+    fingerprint = None
+    for name, params in requests:
+        spec = get_indicator_spec(name)
+        resolved = spec.resolve_params(params)
+        columns = spec.columns(resolved)
+        if all(col in data.columns for col in columns):
+            continue
+        missing_inputs = [col for col in spec.inputs if col not in data.columns]
+        if missing_inputs:
+            raise ValueError(f"Indicator {name} requires columns {missing_inputs}")
+
+        if cache is not None:
+            if fingerprint is None:
+                fingerprint = fingerprint_bars(data)
+            key = cache.make_key(fingerprint, name, resolved)
+            cached = cache.get(key)
+            if cached is None:
+                cached = cache.put(key, dict(zip(columns, spec.compute(data, **resolved))))
+            for column in columns:
+                data[column] = cached[column]
+        else:
+            for column, values in zip(columns, spec.compute(data, **resolved)):
+                data[column] = values
+    return data
@@ -1,18 +1,87 @@
 import pandas as pd
 import numpy as np
-import talib
-import yfinance as yf
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict, Any
 from utils.logger import setup_logger
+from config.settings import USE_DATA_CACHE, DEFAULT_TIMEFRAME, HISTORY_LOOKBACK_DAYS
+from core.data.bar_cache import get_bar_cache
+from core.data.providers import get_provider
+from core.tools.indicator_registry import DEFAULT_INDICATORS, required_indicators, compute_indicators
+from utils.singleflight import SingleFlight
 logger = setup_logger(__name__)
 
-def get_historical_data(symbol: str) -> Optional[pd.DataFrame]:
+# coalesces concurrent history requests for the same symbol
+_history_flight = SingleFlight()
+
+def _fetch_history(symbol: str, start_date: str, end_date: str, interval: str) -> Optional[pd.DataFrame]:
+    """
+    Fetch bars from the active market data provider
+
+    Parameters:
+    symbol: asset code, e.g. 'AAPL'
+    start_date: first date to fetch (YYYY-MM-DD, inclusive)
+    end_date: last date to fetch (YYYY-MM-DD, exclusive)
+    interval: bar interval, e.g. '1d'
+
+    Returns:
+    DataFrame containing the fetched bars (possibly empty)
+    """
+    return get_provider().get_history(symbol, start_date, end_date, interval)
+
+def _get_cached_history(symbol: str, start_date: str, end_date: str, interval: str) -> Optional[pd.DataFrame]:
+    """
+    Get historical data through the local bar cache, fetching only the bars after the last cached date
+
+    Parameters:
+    symbol: asset code, e.g. 'AAPL'
+    start_date: first date of the requested range (YYYY-MM-DD)
+    end_date: exclusive end date of the requested range (YYYY-MM-DD)
+    interval: bar interval, e.g. '1d'
+
+    Returns:
+    DataFrame containing historical data from start_date, or None if nothing is available
+    """
+    cache = get_bar_cache()
+    cached = cache.load(symbol, interval)
+    meta = cache.load_meta(symbol, interval)
+
+    # Cold cache, or the cache does not reach back far enough: fetch the full range
+    if cached is None or cached.empty or meta.get('start', end_date) > start_date:
+        df = _fetch_history(symbol, start_date, end_date, interval)
+        if df is not None and not df.empty:
+            cache.save(symbol, interval, df, start_date, end_date)
+            logger.info(f"Bar cache filled for {symbol} ({interval}): {len(df)} bars")
+        return df
+
+    # Warm cache: refresh from the last cached bar (inclusive, it may have been partial) to the end date
+    if meta.get('end') != end_date:
+        fetch_start = cached.index[-1].strftime('%Y-%m-%d')
+        new_bars = None
+        if fetch_start < end_date:
+            try:
+                new_bars = _fetch_history(symbol, fetch_start, end_date, interval)
+            except Exception as e:
+                logger.warning(f"Incremental fetch failed for {symbol}, serving cached bars: {str(e)}")
+                new_bars = None
+        if new_bars is not None:
+            cached = cache.append(symbol, interval, cached, new_bars, meta['start'], end_date)
+            logger.info(f"Bar cache updated for {symbol} ({interval}): {len(new_bars)} new bars")
+    else:
+        logger.info(f"Bar cache hit for {symbol} ({interval})")
+
+    return cached[cached.index >= pd.Timestamp(start_date, tz=cached.index.tz)]
+
+def get_historical_data(symbol: str, interval: str = DEFAULT_TIMEFRAME,
+                        lookback_days: int = HISTORY_LOOKBACK_DAYS,
+                        raise_errors: bool = False) -> Optional[pd.DataFrame]:
     """
     Get historical data for an asset, default from the current time to 1 year ago.    
     Parameters:
     symbol: asset code, e.g. 'AAPL'
+    interval: bar interval, e.g. '1d'
+    lookback_days: calendar days of history to load
+    raise_errors: re-raise fetch errors instead of logging them and returning None
 
     Returns:
     DataFrame containing historical data, or None if failed
@@ -20,41 +89,33 @@ def get_historical_data(symbol: str) -> Optional[pd.DataFrame]:
     try:
         # Set default date range
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
             
-        # Get historical data
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(start=start_date, end=end_date)
+        # Get historical data, through the local bar cache when enabled for the active provider.
+        # Concurrent requests for the same symbol share one upstream call.
+        load = _get_cached_history if USE_DATA_CACHE and get_provider().cacheable else _fetch_history
+        df = _history_flight.do(('history', symbol, interval, start_date, end_date),
+                                load, symbol, start_date, end_date, interval)
         
-        if df.empty:
+        if df is None or df.empty:
             logging.warning(f"No historical data found for {symbol}")
             return None
-            
-        # Rename columns, only rename existing columns
-        column_mapping = {
-            'Open': 'Open',
-            'High': 'High',
-            'Low': 'Low',
-            'Close': 'Close',
-            'Volume': 'Volume',
-            'Dividends': 'Dividends',
-            'Stock Splits': 'Stock_Splits'
-        }
-        
-        # Only rename existing columns
-        existing_columns = [col for col in column_mapping.keys() if col in df.columns]
-        df = df.rename(columns={col: column_mapping[col] for col in existing_columns})
         
-        return df
+        # the frame may be shared with concurrent callers, give each its own column container
+        return df.copy(deep=False)
         
     except Exception as e:
         logging.error(f"Error getting historical data for {symbol}: {str(e)}")
+        if raise_errors:
+            raise
         return None
 
-def calculate_indicators(data: pd.DataFrame) -> pd.DataFrame:
+def calculate_indicators(data: pd.DataFrame, strategy: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
     """
-    Calculate all technical indicators
+    Calculate technical indicators
     :param data: DataFrame containing OHLCV data
+    :param strategy: Optional strategy configuration; when given, only the indicators it declares
+                     (with its parameters, e.g. EMA 21 -> EMA_21) are calculated
     :return: DataFrame with added technical indicators
     """
     try:
@@ -84,64 +145,13 @@ def calculate_indicators(data: pd.DataFrame) -> pd.DataFrame:
         existing_columns = [col for col in column_mapping.keys() if col in data.columns]
         data = data.rename(columns={col: column_mapping[col] for col in existing_columns})
         
-        # Calculate moving average lines
-        data['SMA_5'] = talib.SMA(data['close'], timeperiod=5)
-        data['SMA_10'] = talib.SMA(data['close'], timeperiod=10)
-        data['SMA_20'] = talib.SMA(data['close'], timeperiod=20)
-        data['SMA_50'] = talib.SMA(data['close'], timeperiod=50)
-        data['SMA_200'] = talib.SMA(data['close'], timeperiod=200)
-        
-        # Calculate exponential moving average lines
-        data['EMA_5'] = talib.EMA(data['close'], timeperiod=5)
-        data['EMA_10'] = talib.EMA(data['close'], timeperiod=10)
-        data['EMA_20'] = talib.EMA(data['close'], timeperiod=20)
-        data['EMA_50'] = talib.EMA(data['close'], timeperiod=50)
-        
-        # Calculate MACD
-        macd, signal, hist = talib.MACD(data['close'])
-        data['MACD'] = macd
-        data['MACD_SIGNAL'] = signal
-        data['MACD_HIST'] = hist
-        
-        # Calculate RSI
-        data['RSI'] = talib.RSI(data['close'], timeperiod=14)
-        
-        # Calculate ADX
-        data['ADX'] = talib.ADX(data['high'], data['low'], data['close'], timeperiod=14)
-        
-        # Calculate Bollinger Bands
-        upper, middle, lower = talib.BBANDS(data['close'], timeperiod=20)
-        data['BB_UPPER'] = upper
-        data['BB_MIDDLE'] = middle
-        data['BB_LOWER'] = lower
-        
-        # Calculate ATR
-        data['ATR'] = talib.ATR(data['high'], data['low'], data['close'], timeperiod=14)
-        
-        # Calculate Donchian Channels
-        data['DONCHIAN_HIGH'] = data['high'].rolling(window=20).max()
-        data['DONCHIAN_LOW'] = data['low'].rolling(window=20).min()
-        
-        # Calculate Rate of Change
-        data['ROC'] = talib.ROC(data['close'], timeperiod=10)
-        
-        # Calculate On Balance Volume
-        data['OBV'] = talib.OBV(data['close'], data['volume'])
-        
-        # Calculate Stochastic Oscillator
-        data['STOCH_K'], data['STOCH_D'] = talib.STOCH(data['high'], data['low'], data['close'])
-        
-        # Calculate Volatility
-        data['VOLATILITY'] = data['close'].pct_change().rolling(window=20).std()
-        
-        # Calculate Price Change
-        data['PRICE_CHANGE'] = data['close'].pct_change()
-        
-        # Calculate Volume Change
-        data['VOLUME_CHANGE'] = data['volume'].pct_change()
-        
-        # Calculate High-Low Range
-        data['HIGH_LOW_RANGE'] = data['high'] - data['low']
+        # Calculate only the indicators the strategy declares, or the full default set
+        if strategy is not None:
+            requests = required_indicators(strategy)
+            logger.info(f"Calculating indicators for strategy {strategy.get('name', 'Unnamed Strategy')}: {requests}")
+        else:
+            requests = DEFAULT_INDICATORS
+        data = compute_indicators(data, requests)
         
         # Add position column
         data['CLOSE_POSITION'] = 0
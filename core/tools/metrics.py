@@ -0,0 +1,201 @@
+"""
+Performance metrics module
+Risk/return statistics computed from equity arrays in one vectorized pass. Every
+equity function accepts a single curve (1-D) or a batch of curves of equal length
+(2-D, one curve per row), so many backtests can be scored with one call.
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional, Sequence, Union
+from config.settings import METRICS_VAR_LEVEL, METRICS_ROLLING_WINDOW
+
+TRADING_DAYS_PER_YEAR = 252
+
+Metric = Union[float, np.ndarray]
+
+def years_between(dates: np.ndarray) -> Optional[float]:
+    """
+    Calendar length of a date array in years (365-day years, at least one day)
+
+    Args:
+        dates: Bar timestamps (datetime64)
+
+    Returns:
+        Optional[float]: Years, None for fewer than two dates
+    """
+    if dates is None or len(dates) < 2:
+        return None
+    dates = np.asarray(dates, dtype='datetime64[s]')
+    return max(int((dates[-1] - dates[0]) // np.timedelta64(1, 'D')), 1) / 365
+
+def _unbatch(metrics: Dict[str, np.ndarray], single: bool) -> Dict[str, Metric]:
+    return {name: float(values[0]) for name, values in metrics.items()} if single else metrics
+
+def rolling_sharpe(returns: np.ndarray, window: int = METRICS_ROLLING_WINDOW,
+                   periods_per_year: float = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """
+    Annualized Sharpe ratio over a sliding window, from running sums (no per-window loop)
+
+    Args:
+        returns: Periodic returns, 1-D or (curves, periods)
+        window: Periods per window
+        periods_per_year: Used to annualize
+
+    Returns:
+        np.ndarray: One value per complete window (last axis shortened by window - 1),
+                    0 where the window has no variance
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] < window or window < 2:
+        return np.zeros(returns.shape[:-1] + (0,))
+    zero = np.zeros(returns.shape[:-1] + (1,))
+    sums = np.concatenate((zero, np.cumsum(returns, axis=-1)), axis=-1)
+    squares = np.concatenate((zero, np.cumsum(returns ** 2, axis=-1)), axis=-1)
+    window_sum = sums[..., window:] - sums[..., :-window]
+    window_squares = squares[..., window:] - squares[..., :-window]
+    mean = window_sum / window
+    variance = np.maximum((window_squares - window * mean ** 2) / (window - 1), 0.0)
+    std = np.sqrt(variance)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 1e-12, mean / std * np.sqrt(periods_per_year), 0.0)
+
+def equity_metrics(equity: np.ndarray,
+                   initial_capital: Optional[Union[float, np.ndarray]] = None,
+                   years: Optional[float] = None,
+                   periods_per_year: float = TRADING_DAYS_PER_YEAR,
+                   var_level: float = METRICS_VAR_LEVEL,
+                   rolling_window: int = METRICS_ROLLING_WINDOW) -> Dict[str, Metric]:
+    """
+    Return, risk and drawdown statistics of one or many equity curves
+
+    Args:
+        equity: Portfolio value per period, 1-D or (curves, periods)
+        initial_capital: Value before the first period, defaults to the first equity value
+        years: Length of the curve in years for CAGR, defaults to periods / periods_per_year
+        periods_per_year: Used to annualize volatility, Sharpe and Sortino
+        var_level: Confidence level of value at risk and expected shortfall
+        rolling_window: Window of the rolling Sharpe ratio
+
+    Returns:
+        Dict[str, Metric]: total_return, cagr, volatility, sharpe_ratio, sortino_ratio,
+                           downside_deviation, calmar_ratio, max_drawdown, max_drawdown_duration
+                           (periods), ulcer_index, value_at_risk, expected_shortfall and
+                           rolling_sharpe_min; floats for a 1-D input, arrays for a batch
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    single = equity.ndim == 1
+    equity = np.atleast_2d(equity)
+    n_curves, length = equity.shape
+    if length == 0:
+        zeros = np.zeros(n_curves)
+        names = ('total_return', 'cagr', 'volatility', 'sharpe_ratio', 'sortino_ratio', 'downside_deviation',
+                 'calmar_ratio', 'max_drawdown', 'max_drawdown_duration', 'ulcer_index', 'value_at_risk',
+                 'expected_shortfall', 'rolling_sharpe_min')
+        return _unbatch({name: zeros for name in names}, single)
+
+    start = equity[:, 0] if initial_capital is None else np.broadcast_to(
+        np.asarray(initial_capital, dtype=np.float64), (n_curves,))
+    returns = np.diff(equity, axis=1) / equity[:, :-1]
+    n_returns = returns.shape[1]
+    annualize = np.sqrt(periods_per_year)
+
+    total_return = equity[:, -1] / start - 1
+    years = years if years else max(n_returns, 1) / periods_per_year
+    growth = np.maximum(1 + total_return, 0.0)
+    cagr = growth ** (1 / years) - 1
+
+    mean = returns.mean(axis=1) if n_returns else np.zeros(n_curves)
+    std = returns.std(axis=1, ddof=1) if n_returns > 1 else np.zeros(n_curves)
+    # downside deviation: root mean square of the negative returns (target return 0)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=1)) if n_returns else np.zeros(n_curves)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * annualize, 0.0)
+        sortino = np.where(downside > 0, mean / downside * annualize, 0.0)
+
+    # drawdowns from the running peak, duration counted in periods since that peak
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = 1 - equity / peak
+    max_drawdown = drawdown.max(axis=1)
+    positions = np.arange(length)
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, positions, 0), axis=1)
+    max_duration = (positions - last_peak).max(axis=1).astype(np.float64)
+    ulcer = np.sqrt(np.mean(drawdown ** 2, axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = np.where(max_drawdown > 0, cagr / max_drawdown, 0.0)
+
+    # historical VaR / expected shortfall of the periodic returns (negative numbers are losses)
+    if n_returns:
+        value_at_risk = np.quantile(returns, 1 - var_level, axis=1)
+        tail = returns <= value_at_risk[:, None]
+        expected_shortfall = np.sum(np.where(tail, returns, 0.0), axis=1) / np.maximum(tail.sum(axis=1), 1)
+    else:
+        value_at_risk = expected_shortfall = np.zeros(n_curves)
+
+    rolling = rolling_sharpe(returns, rolling_window, periods_per_year)
+    rolling_min = rolling.min(axis=1) if rolling.shape[1] else np.zeros(n_curves)
+
+    return _unbatch({
+        'total_return': total_return,
+        'cagr': cagr,
+        'volatility': std * annualize,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'downside_deviation': downside * annualize,
+        'calmar_ratio': calmar,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_duration': max_duration,
+        'ulcer_index': ulcer,
+        'value_at_risk': value_at_risk,
+        'expected_shortfall': expected_shortfall,
+        'rolling_sharpe_min': rolling_min
+    }, single)
+
+def _longest_run(flags: np.ndarray) -> int:
+    """Length of the longest run of True values"""
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return int(np.max(edges[1::2] - edges[0::2])) if len(edges) else 0
+
+def trade_metrics(pnls: Sequence[float]) -> Dict[str, Any]:
+    """
+    Statistics of closed trades
+
+    Args:
+        pnls: Net PnL of each closed trade, in order
+
+    Returns:
+        Dict[str, Any]: total_trades, win_rate, profit_factor, avg_trade_return,
+                        max_consecutive_wins and max_consecutive_losses
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    closed = len(pnls)
+    gross_profit = float(pnls[pnls > 0].sum())
+    gross_loss = float(-pnls[pnls < 0].sum())
+    return {
+        'total_trades': closed,
+        'win_rate': float((pnls > 0).mean()) if closed else 0.0,
+        'profit_factor': gross_profit / (gross_loss + 1e-6) if closed else 1.0,
+        'avg_trade_return': float(pnls.mean()) if closed else 0.0,
+        'max_consecutive_wins': _longest_run(pnls > 0),
+        'max_consecutive_losses': _longest_run(pnls < 0)
+    }
+
+def performance_metrics(equity: np.ndarray, pnls: Sequence[float] = (),
+                        initial_capital: Optional[float] = None, years: Optional[float] = None,
+                        **kwargs) -> Dict[str, Any]:
+    """
+    Equity and trade statistics of a single backtest
+
+    Args:
+        equity: Portfolio value per period (1-D)
+        pnls: Net PnL of each closed trade
+        initial_capital: Value before the first period
+        years: Length of the curve in years for CAGR
+        **kwargs: Further equity_metrics options
+
+    Returns:
+        Dict[str, Any]: equity_metrics and trade_metrics combined
+    """
+    metrics = equity_metrics(equity, initial_capital=initial_capital, years=years, **kwargs)
+    metrics.update(trade_metrics(pnls))
+    return metrics
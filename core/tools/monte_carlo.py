@@ -0,0 +1,135 @@
+"""
+Monte Carlo module
+Bootstrap resampling of daily returns or trade PnLs as whole-array NumPy operations:
+every path is drawn, compounded and measured at once (no per-path loop)
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional, Sequence
+from utils.logger import setup_logger
+from config.settings import (
+    MONTE_CARLO_PATHS,
+    MONTE_CARLO_BLOCK_SIZE,
+    MONTE_CARLO_SEED
+)
+from core.tools.metrics import TRADING_DAYS_PER_YEAR
+
+logger = setup_logger(__name__)
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+def bootstrap_indices(n_obs: int, n_paths: int, path_length: Optional[int] = None,
+                      block_size: Optional[int] = None, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Draw resampling indices for all paths at once
+
+    With block_size > 1 this is a circular block bootstrap: random block starts followed by
+    consecutive observations (wrapping at the end), which keeps short-range autocorrelation.
+
+    Args:
+        n_obs: Number of observations to resample from
+        n_paths: Number of paths
+        path_length: Observations per path, defaults to n_obs
+        block_size: Block length, None or 1 for the i.i.d. bootstrap
+        seed: Random seed
+
+    Returns:
+        np.ndarray: Index array of shape (n_paths, path_length)
+    """
+    rng = np.random.default_rng(seed)
+    path_length = path_length or n_obs
+    if not block_size or block_size <= 1:
+        return rng.integers(0, n_obs, size=(n_paths, path_length))
+    n_blocks = -(-path_length // block_size)
+    starts = rng.integers(0, n_obs, size=(n_paths, n_blocks, 1))
+    indices = (starts + np.arange(block_size)) % n_obs
+    return indices.reshape(n_paths, n_blocks * block_size)[:, :path_length]
+
+def _path_statistics(returns: np.ndarray, periods_per_year: Optional[float]) -> Dict[str, np.ndarray]:
+    """Final return, max drawdown and Sharpe ratio of every row of a (paths, periods) return matrix"""
+    equity = np.cumprod(1.0 + returns, axis=1)
+    final_return = equity[:, -1] - 1.0
+    # the running peak starts at the initial capital (1.0)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_drawdown = np.max(1.0 - equity / peak, axis=1)
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.zeros(len(returns))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std, 0.0)
+    if periods_per_year:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+    return {'final_return': final_return, 'max_drawdown': max_drawdown, 'sharpe_ratio': sharpe}
+
+def _summarize(stats: Dict[str, np.ndarray], percentiles: Sequence[float]) -> Dict[str, Any]:
+    summary = {}
+    for name, values in stats.items():
+        levels = np.percentile(values, percentiles)
+        summary[name] = {f"p{p:g}": float(level) for p, level in zip(percentiles, levels)}
+        summary[name]['mean'] = float(values.mean())
+    summary['prob_loss'] = float((stats['final_return'] < 0).mean())
+    return summary
+
+def monte_carlo_returns(returns: Sequence[float],
+                        n_paths: int = MONTE_CARLO_PATHS,
+                        block_size: Optional[int] = MONTE_CARLO_BLOCK_SIZE,
+                        seed: Optional[int] = MONTE_CARLO_SEED,
+                        periods_per_year: float = TRADING_DAYS_PER_YEAR,
+                        percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """
+    Bootstrap a series of periodic (e.g. daily) returns
+
+    Args:
+        returns: Periodic simple returns of one equity curve
+        n_paths: Number of resampled paths
+        block_size: Block bootstrap length, None or 1 for the i.i.d. bootstrap
+        seed: Random seed
+        periods_per_year: Used to annualize the Sharpe ratio
+        percentiles: Percentiles reported for each statistic
+
+    Returns:
+        Dict[str, Any]: Percentiles (keys 'p5', 'p50', ...) and mean of final_return, max_drawdown
+                        and sharpe_ratio, plus prob_loss and the run settings
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[np.isfinite(returns)]
+    if len(returns) < 2:
+        raise ValueError("At least two returns are required for a Monte Carlo bootstrap")
+    sampled = returns[bootstrap_indices(len(returns), n_paths, block_size=block_size, seed=seed)]
+    summary = _summarize(_path_statistics(sampled, periods_per_year), percentiles)
+    summary.update({'method': 'returns', 'n_paths': n_paths, 'n_obs': len(returns), 'block_size': block_size})
+    return summary
+
+def monte_carlo_trades(pnls: Sequence[float],
+                       initial_capital: float,
+                       n_paths: int = MONTE_CARLO_PATHS,
+                       block_size: Optional[int] = MONTE_CARLO_BLOCK_SIZE,
+                       seed: Optional[int] = MONTE_CARLO_SEED,
+                       trades_per_year: Optional[float] = None,
+                       percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """
+    Bootstrap the sequence of closed trades
+
+    Each trade's PnL is turned into a return on the equity before it, so resampled
+    sequences compound the way the original did.
+
+    Args:
+        pnls: Net PnL of each closed trade, in order
+        initial_capital: Equity before the first trade
+        n_paths: Number of resampled paths
+        block_size: Block bootstrap length, None or 1 for the i.i.d. bootstrap
+        seed: Random seed
+        trades_per_year: Used to annualize the per-trade Sharpe ratio; None leaves it per trade
+        percentiles: Percentiles reported for each statistic
+
+    Returns:
+        Dict[str, Any]: Same layout as monte_carlo_returns
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    if len(pnls) < 2:
+        raise ValueError("At least two trades are required for a Monte Carlo bootstrap")
+    equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnls)[:-1]))
+    trade_returns = pnls / equity_before
+    sampled = trade_returns[bootstrap_indices(len(trade_returns), n_paths, block_size=block_size, seed=seed)]
+    summary = _summarize(_path_statistics(sampled, trades_per_year), percentiles)
+    summary.update({'method': 'trades', 'n_paths': n_paths, 'n_obs': len(pnls), 'block_size': block_size})
+    return summary
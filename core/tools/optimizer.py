@@ -0,0 +1,371 @@
+"""
+Parameter optimizer module
+Grid and random search over a strategy template's parameters, with backtests fanned
+out in chunks over a process pool and results streamed as they finish
+
+Parameter keys address the template in two ways:
+- 'SMA.period' sets strategy['params']['SMA']['period']
+- 'adx_threshold' fills the '{adx_threshold}' placeholder in the rule expressions
+"""
+
+import os
+import copy
+import time
+import random
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
+from utils.logger import setup_logger
+from config.settings import (
+    INITIAL_CAPITAL,
+    OPTIMIZER_ENGINE,
+    OPTIMIZER_OBJECTIVE,
+    OPTIMIZER_MAX_WORKERS,
+    OPTIMIZER_CHUNK_SIZE,
+    OPTIMIZER_PRUNE,
+    SHARED_MEMORY_TRANSPORT
+)
+from core.tools.indicator_registry import required_indicators, compute_indicators, get_indicator_spec
+from core.tools.sweep_indicators import add_sweep_columns
+from core.tools.backtest import backtest_strategy, evaluate_backtest
+from core.tools.strategy_tournament import OBJECTIVE_DIRECTIONS, objective_value
+from core.tools.metrics import equity_metrics, trade_metrics, performance_metrics, years_between
+from core.tools.pruning import DEFAULT_PRUNING
+from core.data.shared_frame import SharedFrame, SharedFrameHandle, resolve_frame
+
+logger = setup_logger(__name__)
+
+# indicators computed for all swept periods in one add_sweep_columns pass; the EMA and RSI
+# sweeps step through the bars in Python and lose to one TA-Lib call per period
+SWEPT_INDICATORS = ('SMA', 'ROC', 'DONCHIAN')
+
+# a list of values, or a (low, high) range sampled uniformly by random search
+ParamRange = Union[Sequence[Any], Tuple[float, float]]
+
+# state shared with worker processes, set once per worker by the pool initializer
+_worker_state = {}
+
+def _init_worker(data: Union[pd.DataFrame, SharedFrameHandle], template: Dict[str, Any], engine: str,
+                 objective: str, initial_capital: float, prune: bool = False) -> None:
+    _worker_state.update(data=resolve_frame(data), template=template, engine=engine,
+                         objective=objective, initial_capital=initial_capital,
+                         pruning=DEFAULT_PRUNING if prune else None)
+
+def apply_params(template: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a concrete strategy from a template and one parameter set
+
+    Args:
+        template: Strategy configuration, rule expressions may contain '{name}' placeholders
+        params: Parameter set, e.g. {'SMA.period': 50, 'adx_threshold': 25}
+
+    Returns:
+        Dict[str, Any]: Strategy configuration with the parameters applied
+    """
+    strategy = copy.deepcopy(template)
+    placeholders = {}
+    for key, value in params.items():
+        if '.' in key:
+            indicator_name, param_name = key.split('.', 1)
+            strategy.setdefault('params', {}).setdefault(indicator_name, {})[param_name] = value
+        else:
+            placeholders[key] = value
+    if isinstance(strategy['rule'], str):
+        strategy['rule'] = strategy['rule'].format(**placeholders)
+    else:
+        for rule in strategy['rule']:
+            rule['expr'] = rule['expr'].format(**placeholders)
+    return strategy
+
+def grid_space(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the parameter values
+
+    Args:
+        space: Parameter key -> list of values
+
+    Returns:
+        List[Dict[str, Any]]: Parameter sets
+    """
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+def random_space(space: Dict[str, ParamRange], n_iter: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Random parameter sets: lists are sampled by choice, (low, high) tuples uniformly
+    (integers when both bounds are integers)
+
+    Args:
+        space: Parameter key -> list of values or (low, high) range
+        n_iter: Number of parameter sets
+        seed: Random seed for reproducible searches
+
+    Returns:
+        List[Dict[str, Any]]: Distinct parameter sets (fewer than n_iter if the space is smaller)
+    """
+    rng = random.Random(seed)
+    samples = []
+    seen = set()
+    for _ in range(n_iter * 10):
+        if len(samples) >= n_iter:
+            break
+        params = {}
+        for key, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                params[key] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(list(values))
+        signature = tuple(sorted(params.items()))
+        if signature not in seen:
+            seen.add(signature)
+            samples.append(params)
+    return samples
+
+def prepare_optimizer_data(data: pd.DataFrame, template: Dict[str, Any],
+                           param_sets: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Compute every indicator column the parameter sets need once, before the data is shared
+
+    Indicators in SWEPT_INDICATORS that are swept over several periods are computed in one
+    pass per indicator with add_sweep_columns; everything else goes through a single
+    compute_indicators call (one fingerprint and cache round per search, not per column).
+
+    Args:
+        data: Data with lowercase OHLCV columns (e.g. from calculate_indicators)
+        template: Strategy template
+        param_sets: Parameter sets to evaluate
+
+    Returns:
+        pd.DataFrame: Data with the union of all required indicator columns
+    """
+    data = data.copy(deep=False)
+    requests = []
+    swept = {}
+    seen = set()
+    for params in param_sets:
+        for name, indicator_params in required_indicators(apply_params(template, params)):
+            spec = get_indicator_spec(name)
+            resolved = spec.resolve_params(indicator_params)
+            key = (name, tuple(sorted(resolved.items())))
+            if key in seen or all(col in data.columns for col in spec.columns(resolved)):
+                continue
+            seen.add(key)
+            if name in SWEPT_INDICATORS and list(resolved) == ['period']:
+                swept.setdefault(name, []).append(int(resolved['period']))
+            else:
+                requests.append((name, resolved))
+
+    for name, periods in swept.items():
+        # the prefix-sum kernels need gap-free inputs, TA-Lib handles the rest per period
+        inputs = list(get_indicator_spec(name).inputs)
+        if len(periods) > 1 and data[inputs].notna().all().all():
+            data = add_sweep_columns(data, name, periods)
+        else:
+            requests.extend((name, {'period': period}) for period in periods)
+    return compute_indicators(data, requests)
+
+def _backtest_params(params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Backtest one parameter set in a worker; errors become result rows
+
+    The backtest cache is bypassed: every set is distinct, and fingerprinting the full
+    indicator frame per set would cost more than the backtest itself.
+    """
+    state = _worker_state
+    row = dict(params)
+    try:
+        strategy = apply_params(state['template'], params)
+        result = backtest_strategy(data=state['data'], strategy=strategy,
+                                   initial_capital=state['initial_capital'], engine=state['engine'],
+                                   pruning=state['pruning'], use_cache=False)
+        return row, result
+    except Exception as e:
+        row['score'] = float('nan')
+        row['error'] = str(e)
+        return row, None
+
+def _score_row(row: Dict[str, Any], result: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill a result row from the backtest and its precomputed metrics"""
+    try:
+        # the Monte Carlo check only affects is_satisfactory, skip it for the search itself
+        evaluation = evaluate_backtest(result, monte_carlo_paths=0, metrics=metrics)
+        row.update(evaluation['performance_metrics'])
+        row['win_rate'] = evaluation['trading_statistics']['win_rate']
+        row['total_trades'] = evaluation['trading_statistics']['total_trades']
+        row['is_satisfactory'] = evaluation['is_satisfactory']
+        row['pruned'] = result['pruned']['reason'] if result.get('pruned') else None
+        row['score'] = objective_value(evaluation, _worker_state['objective'])
+        row['error'] = evaluation.get('error')
+    except Exception as e:
+        row['score'] = float('nan')
+        row['error'] = str(e)
+    return row
+
+def _run_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Backtest a chunk of parameter sets, then score all of their equity curves in one batch"""
+    initial_capital = _worker_state['initial_capital']
+    outcomes = [_backtest_params(params) for params in chunk]
+    finished = [(row, result) for row, result in outcomes if result is not None and not result.get('pruned')]
+    pruned = [(row, result) for row, result in outcomes if result is not None and result.get('pruned')]
+    if finished:
+        # every complete backtest ran on the same data, so the curves stack into one (runs, bars) matrix
+        batch = equity_metrics(np.vstack([result['equity'] for _, result in finished]),
+                               initial_capital=initial_capital,
+                               years=years_between(finished[0][1]['dates']))
+        for i, (row, result) in enumerate(finished):
+            metrics = {name: float(values[i]) for name, values in batch.items()}
+            metrics.update(trade_metrics(result['trade_log']['pnl']))
+            _score_row(row, result, metrics)
+    # pruned runs stopped at different bars, score their partial curves one by one
+    for row, result in pruned:
+        metrics = performance_metrics(result['equity'], result['trade_log']['pnl'],
+                                      initial_capital=initial_capital, years=years_between(result['dates']))
+        _score_row(row, result, metrics)
+    return [row for row, _ in outcomes]
+
+def iter_optimize(data: pd.DataFrame,
+                  template: Dict[str, Any],
+                  param_sets: List[Dict[str, Any]],
+                  objective: str = OPTIMIZER_OBJECTIVE,
+                  engine: str = OPTIMIZER_ENGINE,
+                  initial_capital: float = INITIAL_CAPITAL,
+                  max_workers: Optional[int] = OPTIMIZER_MAX_WORKERS,
+                  chunk_size: int = OPTIMIZER_CHUNK_SIZE,
+                  prune: bool = OPTIMIZER_PRUNE) -> Iterator[Dict[str, Any]]:
+    """
+    Backtest parameter sets and yield result rows as chunks finish (in completion order)
+
+    The data, template and settings reach each worker once through the pool initializer
+    (the data as a shared memory segment with SHARED_MEMORY_TRANSPORT); tasks only carry
+    parameter dictionaries. Each chunk's equity curves are scored
+    together with one batch metrics call.
+
+    Args:
+        data: Data with indicator columns (see prepare_optimizer_data)
+        template: Strategy template
+        param_sets: Parameter sets to evaluate
+        objective: Metric stored as 'score' (see OBJECTIVE_DIRECTIONS)
+        engine: Backtest engine, 'vector' or 'backtrader'
+        initial_capital: Initial capital for every backtest
+        max_workers: Worker processes; None uses the CPU count, 1 runs in-process
+        chunk_size: Parameter sets per pool task
+        prune: Stop each backtest once it can no longer be satisfactory (DEFAULT_PRUNING);
+               the rows of stopped runs name the violated constraint in 'pruned'. Applies to
+               the backtrader engine only: the vector engine computes the whole run at once,
+               so stopping it early saves nothing and would only leave partial rows
+
+    Yields:
+        Dict[str, Any]: Parameters plus metrics, 'score', 'pruned' and 'error'
+    """
+    if objective not in OBJECTIVE_DIRECTIONS:
+        raise ValueError(f"Unknown optimizer objective: {objective}. Choose from {list(OBJECTIVE_DIRECTIONS)}")
+    chunks = [param_sets[i:i + chunk_size] for i in range(0, len(param_sets), max(chunk_size, 1))]
+    workers = min(max_workers or os.cpu_count() or 1, max(len(chunks), 1))
+    prune = prune and engine == 'backtrader'
+    initargs = (data, template, engine, objective, initial_capital, prune)
+    logger.info(f"Optimizing {template.get('name', 'Unnamed Strategy')}: {len(param_sets)} parameter sets, "
+                f"{len(chunks)} chunks, {workers} workers, engine {engine}, pruning {'on' if prune else 'off'}")
+
+    if workers <= 1:
+        _init_worker(*initargs)
+        for chunk in chunks:
+            yield from _run_chunk(chunk)
+        return
+
+    done = set()
+    shared = None
+    try:
+        shared = SharedFrame(data) if SHARED_MEMORY_TRANSPORT else None
+        pool_initargs = (shared.handle,) + initargs[1:] if shared is not None else initargs
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=pool_initargs) as pool:
+            futures = {pool.submit(_run_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                rows = future.result()
+                done.add(futures[future])
+                yield from rows
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Process pool unavailable, running the remaining {len(chunks) - len(done)} "
+                       f"chunks in-process: {str(e)}")
+    finally:
+        if shared is not None:
+            shared.close()
+
+    # chunks lost with a broken pool (e.g. a killed worker) are run here, as the tournament does
+    if len(done) < len(chunks):
+        _init_worker(*initargs)
+        for i, chunk in enumerate(chunks):
+            if i not in done:
+                yield from _run_chunk(chunk)
+
+def optimize(data: pd.DataFrame,
+             template: Dict[str, Any],
+             space: Dict[str, ParamRange],
+             method: str = 'grid',
+             n_iter: int = 50,
+             seed: Optional[int] = None,
+             objective: str = OPTIMIZER_OBJECTIVE,
+             engine: str = OPTIMIZER_ENGINE,
+             initial_capital: float = INITIAL_CAPITAL,
+             max_workers: Optional[int] = OPTIMIZER_MAX_WORKERS,
+             chunk_size: int = OPTIMIZER_CHUNK_SIZE,
+             prune: bool = OPTIMIZER_PRUNE) -> Dict[str, Any]:
+    """
+    Search a strategy template's parameters and rank the results
+
+    Args:
+        data: Data with lowercase OHLCV columns (e.g. from calculate_indicators)
+        template: Strategy template
+        space: Parameter key -> values (grid) or values / (low, high) range (random)
+        method: 'grid' or 'random'
+        n_iter: Number of random parameter sets
+        seed: Random seed
+        objective: Metric to rank by (see OBJECTIVE_DIRECTIONS)
+        engine: Backtest engine, 'vector' or 'backtrader'
+        initial_capital: Initial capital for every backtest
+        max_workers: Worker processes; None uses the CPU count, 1 runs in-process
+        chunk_size: Parameter sets per pool task
+        prune: Stop each backtrader backtest once it can no longer be satisfactory; pruned
+               rows rank after all complete runs, since their metrics cover only part of the data
+
+    Returns:
+        Dict[str, Any]: {'table': results sorted best first, 'best_params', 'best_strategy', 'elapsed'}
+    """
+    if method == 'grid':
+        param_sets = grid_space(space)
+    elif method == 'random':
+        param_sets = random_space(space, n_iter, seed)
+    else:
+        raise ValueError(f"Unknown search method: {method}")
+    if not param_sets:
+        raise ValueError("Empty parameter space")
+
+    started = time.perf_counter()
+    data = prepare_optimizer_data(data, template, param_sets)
+    rows = list(iter_optimize(data, template, param_sets, objective, engine,
+                              initial_capital, max_workers, chunk_size, prune))
+
+    table = pd.DataFrame(rows)
+    table = table.sort_values('score', ascending=not OBJECTIVE_DIRECTIONS[objective],
+                              na_position='last', kind='stable').reset_index(drop=True)
+    pruned = table['pruned'].notna() if 'pruned' in table else pd.Series(False, index=table.index)
+    # complete runs, then pruned runs, then failures; the stable sort keeps each group ordered by score
+    group = np.where(table['score'].isna(), 2, np.where(pruned, 1, 0))
+    table = table.iloc[np.argsort(group, kind='stable')].reset_index(drop=True)
+    pruned_count = int(pruned.sum())
+    if pruned_count:
+        logger.info(f"{pruned_count} of {len(rows)} backtests were stopped early by pruning")
+        if pruned_count == len(rows):
+            logger.warning("Every backtest was pruned, the best parameters come from partial runs")
+    best_params = None
+    best_strategy = None
+    if pd.notna(table.loc[0, 'score']):
+        best_params = {key: table.loc[0, key] for key in space}
+        best_params = {key: value.item() if hasattr(value, 'item') else value for key, value in best_params.items()}
+        best_strategy = apply_params(template, best_params)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Optimization finished in {elapsed:.2f}s ({len(rows)} backtests), best params: {best_params}")
+    return {'table': table, 'best_params': best_params, 'best_strategy': best_strategy, 'elapsed': elapsed}
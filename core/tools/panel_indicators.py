@@ -0,0 +1,267 @@
+"""
+Panel indicator module
+Vectorized indicators over many symbols at once: each field is a 2-D array of
+shape (bars x symbols) and every indicator is computed for all symbols in one pass
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any
+from numpy.lib.stride_tricks import sliding_window_view
+from utils.logger import setup_logger
+from core.data.bulk_loader import load_historical_data_bulk, to_panel
+
+logger = setup_logger(__name__)
+
+PANEL_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+@dataclass
+class PricePanel:
+    """
+    Aligned multi-symbol price data
+
+    Attributes:
+        index: Union of all timestamps
+        symbols: Column order of every array
+        fields: Field name (lowercase, e.g. 'close') -> float64 array of shape (bars, symbols),
+                NaN where a symbol has no bar (e.g. equities on weekends next to crypto)
+    """
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    fields: Dict[str, np.ndarray]
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def to_frame(self, values: np.ndarray) -> pd.DataFrame:
+        """Wrap a (bars x symbols) array with the panel's index and symbols"""
+        return pd.DataFrame(values, index=self.index, columns=self.symbols)
+
+def build_panel(frames: Dict[str, pd.DataFrame], fields=PANEL_FIELDS) -> PricePanel:
+    """
+    Align per-symbol OHLCV frames into a panel
+
+    Args:
+        frames: Symbol -> DataFrame with capitalized OHLCV columns (as returned by get_historical_data)
+        fields: Fields to include
+
+    Returns:
+        PricePanel: Arrays aligned on the union of all timestamps
+    """
+    panels = {field: to_panel(frames, field) for field in fields}
+    index = panels[fields[0]].index
+    for field_panel in panels.values():
+        index = index.union(field_panel.index)
+    symbols = list(frames)
+    arrays = {
+        field.lower(): field_panel.reindex(index=index, columns=symbols).to_numpy(dtype=np.float64)
+        for field, field_panel in panels.items()
+    }
+    return PricePanel(index=pd.DatetimeIndex(index), symbols=symbols, fields=arrays)
+
+# ---- NaN-aware alignment ----
+# Each symbol's valid bars are packed to the top of its column, the indicator runs on
+# the packed array (so windows count the symbol's own bars, not calendar rows), and the
+# result is scattered back to the original positions.
+
+def _pack(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Move each column's valid values to the top, keeping their order"""
+    valid = ~np.isnan(values)
+    order = np.argsort(~valid, axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0), order, valid
+
+def _unpack(packed: np.ndarray, order: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Scatter packed results back to the original rows, NaN where the input had no bar"""
+    out = np.empty_like(packed)
+    np.put_along_axis(out, order, packed, axis=0)
+    out[~valid] = np.nan
+    return out
+
+def _aligned(kernel):
+    """Run a kernel on packed columns and scatter the result back"""
+    def wrapper(values: np.ndarray, *args, **kwargs) -> np.ndarray:
+        packed, order, valid = _pack(np.asarray(values, dtype=np.float64))
+        return _unpack(kernel(packed, *args, **kwargs), order, valid)
+    wrapper.__name__ = kernel.__name__
+    wrapper.__doc__ = kernel.__doc__
+    return wrapper
+
+def _rolling_sum(packed: np.ndarray, period: int) -> np.ndarray:
+    """Rolling sum over rows from a single cumulative sum, NaN before the window is full"""
+    cumsum = np.zeros((packed.shape[0] + 1, packed.shape[1]))
+    np.cumsum(np.nan_to_num(packed), axis=0, out=cumsum[1:])
+    out = np.full(packed.shape, np.nan)
+    out[period - 1:] = cumsum[period:] - cumsum[:-period]
+    return out
+
+# ---- kernels ----
+
+@_aligned
+def panel_sma(close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Simple moving average of every column"""
+    return _rolling_sum(close, period) / period
+
+@_aligned
+def panel_ema(close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Exponential moving average of every column, seeded with the SMA of the first period (as TA-Lib)"""
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] < period:
+        return out
+    alpha = 2.0 / (period + 1)
+    out[period - 1] = close[:period].mean(axis=0)
+    for t in range(period, close.shape[0]):
+        out[t] = alpha * close[t] + (1 - alpha) * out[t - 1]
+    return out
+
+@_aligned
+def panel_rolling_std(values: np.ndarray, period: int = 20, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation of every column (ddof=1 as pandas, ddof=0 as TA-Lib STDDEV)"""
+    # shift by the first value of each column to limit cancellation in the sum of squares
+    shifted = values - values[:1]
+    total = _rolling_sum(shifted, period)
+    total_sq = _rolling_sum(shifted * shifted, period)
+    variance = (total_sq - total * total / period) / (period - ddof)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+@_aligned
+def panel_pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Percentage change between a symbol's consecutive bars"""
+    out = np.full(values.shape, np.nan)
+    out[periods:] = values[periods:] / values[:-periods] - 1
+    return out
+
+def panel_roc(close: np.ndarray, period: int = 10) -> np.ndarray:
+    """Rate of change in percent (as TA-Lib ROC)"""
+    return panel_pct_change(close, period) * 100
+
+def panel_volatility(close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Rolling standard deviation of bar returns (the VOLATILITY column of calculate_indicators)"""
+    return panel_rolling_std(panel_pct_change(close), period)
+
+@_aligned
+def panel_rolling_max(values: np.ndarray, period: int = 20) -> np.ndarray:
+    """Rolling maximum of every column"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= period:
+        out[period - 1:] = sliding_window_view(values, period, axis=0).max(axis=-1)
+    return out
+
+@_aligned
+def panel_rolling_min(values: np.ndarray, period: int = 20) -> np.ndarray:
+    """Rolling minimum of every column"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= period:
+        out[period - 1:] = sliding_window_view(values, period, axis=0).min(axis=-1)
+    return out
+
+def panel_donchian(high: np.ndarray, low: np.ndarray, period: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Donchian channel (highest high, lowest low) of every column"""
+    return panel_rolling_max(high, period), panel_rolling_min(low, period)
+
+@_aligned
+def panel_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative strength index with Wilder smoothing of every column (as TA-Lib RSI)"""
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] <= period:
+        return out
+    change = np.diff(close, axis=0)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    avg_gain = gain[:period].mean(axis=0)
+    avg_loss = loss[:period].mean(axis=0)
+    for t in range(period, close.shape[0]):
+        if t > period:
+            avg_gain = (avg_gain * (period - 1) + gain[t - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + loss[t - 1]) / period
+        total = avg_gain + avg_loss
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[t] = np.where(total != 0, 100.0 * avg_gain / total, 0.0)
+    return out
+
+def compute_panel_indicators(panel: PricePanel, requests: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """
+    Compute indicators for every symbol of a panel
+
+    Args:
+        panel: Aligned price panel
+        requests: List of (indicator name, params), e.g. [('SMA', {'period': 50}), ('RSI', {})]
+                  Supported: SMA, EMA, RSI, ROC, VOLATILITY, DONCHIAN
+
+    Returns:
+        Dict[str, np.ndarray]: Column name (as in calculate_indicators, e.g. 'SMA_50') -> (bars x symbols) array
+    """
+    close = panel['close']
+    results = {}
+    for name, params in requests:
+        if name == 'SMA':
+            period = params.get('period', 20)
+            results[f"SMA_{period}"] = panel_sma(close, period)
+        elif name == 'EMA':
+            period = params.get('period', 20)
+            results[f"EMA_{period}"] = panel_ema(close, period)
+        elif name == 'RSI':
+            period = params.get('period', 14)
+            results['RSI' if period == 14 else f"RSI_{period}"] = panel_rsi(close, period)
+        elif name == 'ROC':
+            period = params.get('period', 10)
+            results['ROC' if period == 10 else f"ROC_{period}"] = panel_roc(close, period)
+        elif name == 'VOLATILITY':
+            period = params.get('period', 20)
+            results['VOLATILITY' if period == 20 else f"VOLATILITY_{period}"] = panel_volatility(close, period)
+        elif name == 'DONCHIAN':
+            period = params.get('period', 20)
+            suffix = '' if period == 20 else f"_{period}"
+            results[f"DONCHIAN_HIGH{suffix}"], results[f"DONCHIAN_LOW{suffix}"] = panel_donchian(panel['high'], panel['low'], period)
+        else:
+            raise ValueError(f"Indicator {name} is not supported in panel mode")
+    return results
+
+def latest_snapshot(panel: PricePanel, indicators: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Latest value of every indicator for every symbol, taken at each symbol's own last bar
+
+    Args:
+        panel: The panel the indicators were computed on
+        indicators: Output of compute_panel_indicators
+
+    Returns:
+        pd.DataFrame: One row per symbol with 'close', 'last_bar' and one column per indicator
+    """
+    valid = ~np.isnan(panel['close'])
+    has_data = valid.any(axis=0)
+    last_row = valid.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    columns = np.arange(len(panel.symbols))
+
+    snapshot = {
+        'last_bar': np.where(has_data, panel.index[last_row], pd.NaT),
+        'close': np.where(has_data, panel['close'][last_row, columns], np.nan)
+    }
+    for name, values in indicators.items():
+        snapshot[name] = np.where(has_data, values[last_row, columns], np.nan)
+    return pd.DataFrame(snapshot, index=panel.symbols)
+
+def scan_universe(universe: Any, requests: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Load a universe and compute indicators for all of its symbols in one panel pass
+
+    Args:
+        universe: POPULAR_ASSETS category key, 'all', or list of symbols
+        requests: Indicators to compute (see compute_panel_indicators)
+
+    Returns:
+        Dict[str, Any]: {'snapshot': latest values per symbol, 'panel': PricePanel,
+                         'indicators': full (bars x symbols) arrays, 'failed': per-symbol load failures}
+    """
+    loaded = load_historical_data_bulk(universe)
+    if not loaded['data']:
+        raise ValueError("No historical data loaded for the universe")
+    panel = build_panel(loaded['data'])
+    indicators = compute_panel_indicators(panel, requests)
+    logger.info(f"Panel scan computed {len(indicators)} indicators for {len(panel.symbols)} symbols x {len(panel.index)} bars")
+    return {
+        'snapshot': latest_snapshot(panel, indicators),
+        'panel': panel,
+        'indicators': indicators,
+        'failed': loaded['failed']
+    }
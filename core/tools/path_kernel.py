@@ -0,0 +1,206 @@
+"""
+Path kernel module
+Per-bar simulation of a long-only strategy for exits that depend on the path since
+entry (trailing stop, take-profit) and for slippage, which the vectorized state machine
+cannot express. The loop is compiled with numba when it is installed (an optional
+dependency, see requirements.txt); otherwise the same function runs as plain Python and
+produces identical results, at roughly 1M bars/s instead of tens of millions.
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional
+from utils.logger import setup_logger
+from config.settings import INITIAL_CAPITAL, COMMISSION_RATE, POSITION_SIZE, PATH_KERNEL_USE_NUMBA
+from core.tools.trade_log import empty_trade_log
+
+logger = setup_logger(__name__)
+
+try:
+    import numba
+except ImportError:  # optional: without it the kernel runs as plain Python
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# exit reason of each trade, indices into EXIT_REASONS
+EXIT_SIGNAL = 0
+EXIT_TRAILING_STOP = 1
+EXIT_TAKE_PROFIT = 2
+EXIT_REASONS = ('signal', 'trailing_stop', 'take_profit')
+
+# keys of a strategy's 'stops' section (named as in STRATEGY_PARAMS)
+STOP_KEYS = ('trailing_percent', 'profit_take')
+
+def strategy_stops(strategy: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Stop settings of a strategy configuration
+
+    A strategy enables them with e.g. "stops": {"trailing_percent": 0.02, "profit_take": 0.05}.
+    Both are checked on each bar's close while long, like the exit rule, and the exit
+    fills at the next bar's open.
+
+    Args:
+        strategy: Strategy configuration dictionary
+
+    Returns:
+        Dict[str, float]: 'trailing_percent' (fall from the highest close since entry) and
+                          'profit_take' (gain over the entry price); 0 disables a stop
+    """
+    stops = strategy.get('stops') or {}
+    unknown = set(stops) - set(STOP_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown stop settings: {sorted(unknown)}. Choose from {list(STOP_KEYS)}")
+    values = {key: float(stops.get(key) or 0.0) for key in STOP_KEYS}
+    if any(value < 0 for value in values.values()):
+        raise ValueError(f"Stop settings must not be negative: {values}")
+    return values
+
+def _path_loop(open_, high, low, close, entry, exit_, ready, initial_capital, position_size,
+               commission, slippage, trailing_percent, profit_take):
+    """
+    The per-bar loop (numba-compatible: arrays and scalars only)
+
+    Signals are decided on a bar's close and fill at the next bar's open; buys slip up
+    and sells slip down by the slippage fraction, capped at the bar's high / low (as
+    backtrader's set_slippage_perc). Orders decided on the last bar never fill.
+    """
+    length = len(close)
+    equity = np.empty(length)
+    in_trade = np.zeros(length, dtype=np.int8)
+    capacity = length // 2 + 1
+    entry_idx = np.zeros(capacity, dtype=np.int64)
+    exit_idx = np.zeros(capacity, dtype=np.int64)
+    entry_price = np.zeros(capacity)
+    exit_price = np.zeros(capacity)
+    size = np.zeros(capacity)
+    fees = np.zeros(capacity)
+    pnl = np.zeros(capacity)
+    reasons = np.zeros(capacity, dtype=np.int8)
+
+    cash = initial_capital
+    units = 0.0
+    peak = 0.0
+    closed = 0
+    order = 0  # 1 buy, -1 sell at the next open
+    order_size = 0.0
+    order_reason = EXIT_SIGNAL
+    for t in range(length):
+        if order == 1:
+            price = open_[t]
+            if slippage > 0:
+                price = min(price * (1 + slippage), high[t])
+            fee = order_size * price * commission
+            cash -= order_size * price + fee
+            units = order_size
+            entry_idx[closed] = t
+            entry_price[closed] = price
+            size[closed] = units
+            fees[closed] = fee
+            peak = price
+        elif order == -1:
+            price = open_[t]
+            if slippage > 0:
+                price = max(price * (1 - slippage), low[t])
+            fee = units * price * commission
+            cash += units * price - fee
+            exit_idx[closed] = t
+            exit_price[closed] = price
+            fees[closed] += fee
+            pnl[closed] = units * (price - entry_price[closed]) - fees[closed]
+            reasons[closed] = order_reason
+            closed += 1
+            units = 0.0
+        order = 0
+
+        equity[t] = cash + units * close[t]
+        if units > 0:
+            in_trade[t] = 1
+        if not ready[t]:
+            continue
+        if units == 0:
+            if entry[t]:
+                order = 1
+                order_size = cash * position_size / close[t]
+        else:
+            peak = max(peak, close[t])
+            if exit_[t]:
+                order = -1
+                order_reason = EXIT_SIGNAL
+            elif trailing_percent > 0 and close[t] <= peak * (1 - trailing_percent):
+                order = -1
+                order_reason = EXIT_TRAILING_STOP
+            elif profit_take > 0 and close[t] >= entry_price[closed] * (1 + profit_take):
+                order = -1
+                order_reason = EXIT_TAKE_PROFIT
+
+    open_trades = 1 if units > 0 else 0
+    return (equity, in_trade, closed, open_trades, entry_idx, exit_idx, entry_price,
+            exit_price, size, fees, pnl, reasons)
+
+_compiled_loop = None
+
+def _kernel(use_numba: bool):
+    """The compiled loop when numba is requested and installed, else the plain Python one"""
+    global _compiled_loop
+    if not (use_numba and NUMBA_AVAILABLE):
+        return _path_loop
+    if _compiled_loop is None:
+        _compiled_loop = numba.njit(cache=True, nogil=True)(_path_loop)
+    return _compiled_loop
+
+def simulate_path(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  entry: np.ndarray, exit_: np.ndarray, ready: Optional[np.ndarray] = None,
+                  initial_capital: float = INITIAL_CAPITAL,
+                  position_size: float = POSITION_SIZE,
+                  commission: float = COMMISSION_RATE,
+                  slippage: float = 0.0,
+                  trailing_percent: float = 0.0,
+                  profit_take: float = 0.0,
+                  use_numba: bool = PATH_KERNEL_USE_NUMBA) -> Dict[str, Any]:
+    """
+    Simulate a long-only strategy bar by bar
+
+    Args:
+        open_, high, low, close: Price arrays
+        entry: Boolean entry signal per bar (checked while flat)
+        exit_: Boolean exit signal per bar (checked while long)
+        ready: Bars on which signals and stops are evaluated, None for all bars
+        initial_capital: Starting cash
+        position_size: Fraction of cash committed per trade, sized on the signal bar's close
+        commission: Commission as a fraction of traded value, charged on entry and exit
+        slippage: Fill price slippage as a fraction of the open (e.g. SLIPPAGE); none by default, like the engines
+        trailing_percent: Exit once the close falls this fraction below the highest close
+                          since entry (entry price included), 0 to disable
+        profit_take: Exit once the close is this fraction above the entry price, 0 to disable
+        use_numba: Run the numba-compiled loop if numba is installed
+
+    Returns:
+        Dict[str, Any]: 'equity' (value at each close), 'in_trade' (1 on bars ending long),
+                        'trade_log' (closed trades, TRADE_DTYPE), 'exit_reason' (index into
+                        EXIT_REASONS per closed trade) and 'open_trades'
+    """
+    length = len(close)
+    as_float = lambda values: np.ascontiguousarray(values, dtype=np.float64)
+    as_bool = lambda values: np.ascontiguousarray(values, dtype=np.bool_)
+    (equity, in_trade, closed, open_trades, entry_idx, exit_idx, entry_price, exit_price,
+     size, fees, pnl, reasons) = _kernel(use_numba)(
+        as_float(open_), as_float(high), as_float(low), as_float(close),
+        as_bool(entry), as_bool(exit_), as_bool(np.ones(length, dtype=bool) if ready is None else ready),
+        float(initial_capital), float(position_size), float(commission), float(slippage),
+        float(trailing_percent), float(profit_take))
+
+    trade_log = empty_trade_log(closed)
+    trade_log['entry_idx'] = entry_idx[:closed]
+    trade_log['exit_idx'] = exit_idx[:closed]
+    trade_log['entry_price'] = entry_price[:closed]
+    trade_log['exit_price'] = exit_price[:closed]
+    trade_log['size'] = size[:closed]
+    trade_log['pnl'] = pnl[:closed]
+    trade_log['commission'] = fees[:closed]
+    return {
+        'equity': equity,
+        'in_trade': in_trade,
+        'trade_log': trade_log,
+        'exit_reason': reasons[:closed],
+        'open_trades': int(open_trades)
+    }
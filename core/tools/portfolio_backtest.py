@@ -0,0 +1,238 @@
+"""
+Portfolio backtest module
+Run one strategy, or a per-asset strategy map, across a symbol basket on a shared cash
+account. Signals are generated per symbol with the vectorized engine, calendars are
+aligned into a (bars x symbols) panel, and the portfolio is simulated on arrays with
+one step per calendar row (no per-symbol data feeds or callbacks).
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional, Union, Iterable
+from utils.logger import setup_logger
+from config.settings import (
+    INITIAL_CAPITAL,
+    COMMISSION_RATE,
+    PORTFOLIO_REBALANCE,
+    PORTFOLIO_POSITION_WEIGHT
+)
+from core.data.bulk_loader import align_index, load_historical_data_bulk
+from core.tools.vector_backtest import VectorBacktestEngine
+from core.tools.trade_log import TRADE_DTYPE, backtest_result
+from core.tools.metrics import TRADING_DAYS_PER_YEAR
+
+logger = setup_logger(__name__)
+
+REBALANCE_PERIODS = {'daily': 'D', 'weekly': 'W', 'monthly': 'M'}
+
+# the engines' trade record plus the symbol's column in the panel
+PORTFOLIO_TRADE_DTYPE = np.dtype(TRADE_DTYPE.descr + [('symbol', np.int64)])
+
+def _frame_times(frame: pd.DataFrame) -> pd.DatetimeIndex:
+    """A symbol's bar timestamps on the common aligned timeline"""
+    lower = {col.lower(): col for col in frame.columns}
+    times = frame[lower['datetime']] if 'datetime' in lower else frame.index
+    return align_index(pd.DatetimeIndex(times))
+
+def _desired_positions(frames: Dict[str, pd.DataFrame], strategies: Dict[str, Dict[str, Any]],
+                       rows: List[np.ndarray], n_rows: int) -> np.ndarray:
+    """
+    Per-symbol position wanted at each panel row's open: the state decided on the
+    symbol's previous bar, NaN on rows where the symbol has no bar
+    """
+    desired = np.full((n_rows, len(frames)), np.nan)
+    for column, (symbol, frame) in enumerate(frames.items()):
+        engine = VectorBacktestEngine()
+        engine.set_data(frame)
+        engine.add_strategy(strategies[symbol])
+        state = engine.signal_state().astype(np.float64)
+        # orders decided at bar t's close fill at bar t + 1's open
+        desired[rows[column], column] = np.concatenate(([0.0], state[:-1]))
+    return desired
+
+def _rebalance_rows(index: pd.DatetimeIndex, rebalance: str) -> np.ndarray:
+    """Boolean mask of rows starting a new rebalance period"""
+    if rebalance == 'none':
+        return np.zeros(len(index), dtype=bool)
+    if rebalance not in REBALANCE_PERIODS:
+        raise ValueError(f"Unknown rebalance frequency: {rebalance}. Choose from none, {', '.join(REBALANCE_PERIODS)}")
+    periods = index.to_period(REBALANCE_PERIODS[rebalance]).asi8
+    starts = np.ones(len(index), dtype=bool)
+    starts[1:] = periods[1:] != periods[:-1]
+    starts[0] = False
+    return starts
+
+def run_portfolio_backtest(frames: Dict[str, pd.DataFrame],
+                           strategy: Union[Dict[str, Any], Dict[str, Dict[str, Any]]],
+                           initial_capital: float = INITIAL_CAPITAL,
+                           commission: float = COMMISSION_RATE,
+                           position_weight: Optional[float] = PORTFOLIO_POSITION_WEIGHT,
+                           rebalance: str = PORTFOLIO_REBALANCE) -> Dict[str, Any]:
+    """
+    Backtest a strategy (or one strategy per symbol) over a basket with shared cash
+
+    Each symbol trades long-only on its own signals, filled at its next open. An entry
+    buys position_weight of the portfolio's equity; when cash runs short the bar's
+    entries are scaled down together. On rebalance dates open positions are brought
+    back to the target weight. Commission is charged on every traded value.
+
+    Args:
+        frames: Symbol -> OHLCV DataFrame (as returned by get_historical_data)
+        strategy: One strategy configuration for all symbols, or symbol -> strategy configuration
+        initial_capital: Starting cash of the whole portfolio
+        commission: Commission as a fraction of traded value
+        position_weight: Target weight per open position, None uses 1 / number of symbols
+        rebalance: 'none', 'daily', 'weekly' or 'monthly'
+
+    Returns:
+        Dict[str, Any]: Portfolio results with the same keys as the single-asset engines (the trade
+                        log adds a 'symbol' column index), plus 'volatility', 'exposure' (invested
+                        fraction per bar) and 'per_symbol' (DataFrame)
+    """
+    if not frames:
+        raise ValueError("No data provided for portfolio backtest")
+    symbols = list(frames)
+    if 'rule' in strategy:
+        strategies = {symbol: strategy for symbol in symbols}
+        name = strategy.get('name', 'Unnamed Strategy')
+    else:
+        missing = [symbol for symbol in symbols if symbol not in strategy]
+        if missing:
+            raise ValueError(f"No strategy configured for {missing}")
+        strategies = strategy
+        name = 'Per-asset strategies'
+    weight = position_weight or 1.0 / len(symbols)
+
+    started = time.perf_counter()
+    # calendar alignment across asset classes: union of every symbol's aligned timestamps
+    times = [_frame_times(frame) for frame in frames.values()]
+    index = times[0]
+    for symbol_times in times[1:]:
+        index = index.union(symbol_times)
+    index = pd.DatetimeIndex(index).sort_values()
+    rows = [index.get_indexer(symbol_times) for symbol_times in times]
+    opens = np.full((len(index), len(symbols)), np.nan)
+    closes = np.full((len(index), len(symbols)), np.nan)
+    for column, frame in enumerate(frames.values()):
+        lower = {col.lower(): col for col in frame.columns}
+        opens[rows[column], column] = frame[lower['open']].to_numpy(dtype=np.float64)
+        closes[rows[column], column] = frame[lower['close']].to_numpy(dtype=np.float64)
+    # positions are marked at the last known close on rows where a symbol has no bar
+    marks = pd.DataFrame(closes).ffill().to_numpy()
+    marks = np.nan_to_num(marks, nan=0.0)
+
+    desired = _desired_positions(frames, strategies, rows, len(index))
+    rebalance_rows = _rebalance_rows(index, rebalance)
+
+    n_rows, n_symbols = opens.shape
+    cash = float(initial_capital)
+    shares = np.zeros(n_symbols)
+    cost = np.zeros(n_symbols)      # cash spent on the open trade, including commission
+    proceeds = np.zeros(n_symbols)  # cash received from partial sells of the open trade
+    fees = np.zeros(n_symbols)      # commission paid on the open trade
+    entry_row = np.full(n_symbols, -1)
+    entry_price = np.zeros(n_symbols)
+    equity = np.empty(n_rows)
+    exposure = np.empty(n_rows)
+    closed_trades = []
+    prev_equity = float(initial_capital)
+
+    for row in range(n_rows):
+        price = opens[row]
+        tradable = ~np.isnan(price)
+        target = desired[row]
+        held = shares > 0
+
+        # exits first, so their cash is available to this bar's entries
+        exits = tradable & held & (target == 0)
+        if exits.any():
+            value = shares[exits] * price[exits]
+            cash += float(np.sum(value * (1 - commission)))
+            pnl = proceeds[exits] + value * (1 - commission) - cost[exits]
+            fee = fees[exits] + value * commission
+            for symbol_idx, trade_pnl, trade_fee in zip(np.flatnonzero(exits), pnl, fee):
+                closed_trades.append((entry_row[symbol_idx], row, entry_price[symbol_idx], price[symbol_idx],
+                                      shares[symbol_idx], trade_pnl, trade_fee, symbol_idx))
+            shares[exits] = 0.0
+            cost[exits] = 0.0
+            proceeds[exits] = 0.0
+            fees[exits] = 0.0
+            entry_row[exits] = -1
+
+        # target value per position from the equity marked at the previous close
+        target_value = weight * prev_equity
+        entries = tradable & (shares == 0) & (target == 1)
+        delta = np.zeros(n_symbols)
+        delta[entries] = target_value / price[entries]
+        if rebalance_rows[row]:
+            resize = tradable & (shares > 0) & (target == 1)
+            delta[resize] = target_value / price[resize] - shares[resize]
+
+        if delta.any():
+            buys = delta > 0
+            sells = delta < 0
+            sell_value = -delta[sells] * price[sells]
+            cash += float(np.sum(sell_value * (1 - commission)))
+            proceeds[sells] += sell_value * (1 - commission)
+            fees[sells] += sell_value * commission
+            buy_cost = delta[buys] * price[buys] * (1 + commission)
+            total_cost = float(np.sum(buy_cost))
+            if total_cost > cash:
+                # not enough cash: scale this bar's purchases down together
+                scale = max(cash, 0.0) / total_cost
+                delta[buys] *= scale
+                buy_cost *= scale
+                total_cost = float(np.sum(buy_cost))
+            cash -= total_cost
+            cost[buys] += buy_cost
+            fees[buys] += buy_cost * commission / (1 + commission)
+            shares += delta
+            opened = entries & (shares > 0)
+            entry_row[opened] = row
+            entry_price[opened] = price[opened]
+
+        invested = float(np.dot(shares, marks[row]))
+        equity[row] = cash + invested
+        exposure[row] = invested / equity[row] if equity[row] > 0 else 0.0
+        prev_equity = equity[row]
+
+    elapsed = time.perf_counter() - started
+    trade_log = np.array(closed_trades, dtype=PORTFOLIO_TRADE_DTYPE)
+    open_positions = int((shares > 0).sum())
+    result = backtest_result(name, index.tz_localize(None).values if index.tz is not None else index.values,
+                             equity, trade_log, initial_capital, open_trades=open_positions)
+    daily_returns = np.diff(equity) / equity[:-1] if n_rows > 1 else np.zeros(0)
+    result['volatility'] = float(daily_returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)) if n_rows > 2 else 0.0
+    result['exposure'] = exposure
+    result['per_symbol'] = pd.DataFrame({
+        'symbol': symbols,
+        'trades': np.bincount(trade_log['symbol'], minlength=n_symbols),
+        'realized_pnl': np.bincount(trade_log['symbol'], weights=trade_log['pnl'], minlength=n_symbols),
+        'open_value': shares * marks[-1]
+    })
+    logger.info(f"Portfolio backtest over {n_symbols} symbols and {n_rows} bars finished in {elapsed:.2f}s, "
+                f"return {result['total_return']:.2%}")
+    return result
+
+def portfolio_backtest(universe: Union[str, Iterable[str]],
+                       strategy: Union[Dict[str, Any], Dict[str, Dict[str, Any]]],
+                       **kwargs) -> Dict[str, Any]:
+    """
+    Load a basket with the bulk loader and run the portfolio backtest
+
+    Args:
+        universe: POPULAR_ASSETS category, 'all', a symbol or a list of symbols
+        strategy: One strategy configuration, or symbol -> strategy configuration
+        **kwargs: Further run_portfolio_backtest options
+
+    Returns:
+        Dict[str, Any]: Portfolio results plus 'failed' (symbols that could not be loaded)
+    """
+    loaded = load_historical_data_bulk(universe)
+    frames = loaded['data']
+    if not isinstance(strategy, dict) or 'rule' not in strategy:
+        frames = {symbol: frame for symbol, frame in frames.items() if symbol in strategy}
+    result = run_portfolio_backtest(frames, strategy, **kwargs)
+    result['failed'] = loaded['failed']
+    return result
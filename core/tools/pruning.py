@@ -0,0 +1,92 @@
+"""
+Backtest pruning module
+Constraints under which a running backtest can no longer end up satisfactory, so the
+engines can stop it early and return a partial result marked as pruned
+"""
+
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Tuple
+from config.settings import SATISFACTORY_MAX_DRAWDOWN, SATISFACTORY_MIN_TRADES
+
+@dataclass(frozen=True)
+class PruningConstraints:
+    """
+    Conditions that make a backtest provably unsatisfactory
+
+    Only conditions that cannot recover are checked: a drawdown once reached stays the
+    maximum drawdown, and trades need bars to happen. Sharpe ratio and win rate can still
+    change until the last bar, so they are never used for pruning.
+
+    Attributes:
+        max_drawdown: Stop once the drawdown from the running peak reaches this fraction, None to disable
+        min_trades: Stop once fewer than this many closed trades remain possible, None to disable
+    """
+    max_drawdown: Optional[float] = SATISFACTORY_MAX_DRAWDOWN
+    min_trades: Optional[int] = SATISFACTORY_MIN_TRADES
+
+    @staticmethod
+    def max_possible_trades(closed_trades: Any, open_trades: Any, bars_left: Any) -> Any:
+        """
+        Upper bound on the closed trades at the end of the backtest
+
+        Orders fill at the next bar's open, so closing the open trade takes one more bar
+        and every new trade takes two (entry fill, exit fill).
+        """
+        return closed_trades + (bars_left + open_trades) // 2
+
+    def check(self, drawdown: float, closed_trades: int, open_trades: int, bars_left: int) -> Optional[str]:
+        """
+        Check the state after one bar
+
+        Args:
+            drawdown: Maximum drawdown so far (fraction of the peak)
+            closed_trades: Trades closed so far
+            open_trades: 1 while a position is open, else 0
+            bars_left: Bars after the current one
+
+        Returns:
+            Optional[str]: Reason for pruning, None while the backtest can still pass
+        """
+        if self.max_drawdown is not None and drawdown >= self.max_drawdown:
+            return 'max_drawdown'
+        if self.min_trades is not None and \
+                self.max_possible_trades(closed_trades, open_trades, bars_left) < self.min_trades:
+            return 'min_trades'
+        return None
+
+    def first_breach(self, equity: np.ndarray, closed_trades: np.ndarray,
+                     open_trades: np.ndarray) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Vectorized check over a whole backtest: the first bar at which check would prune
+
+        Args:
+            equity: Portfolio value at each bar's close
+            closed_trades: Trades closed up to and including each bar
+            open_trades: 1 on bars that end with an open position
+
+        Returns:
+            Tuple[Optional[int], Optional[str]]: (bar index, reason), or (None, None)
+        """
+        length = len(equity)
+        bars = np.arange(length)
+        drawdown_bar = trade_bar = length
+        if self.max_drawdown is not None and length:
+            drawdown = np.maximum.accumulate(1 - equity / np.maximum.accumulate(equity))
+            breached = np.flatnonzero(drawdown >= self.max_drawdown)
+            drawdown_bar = breached[0] if len(breached) else length
+        if self.min_trades is not None and length:
+            possible = self.max_possible_trades(closed_trades, open_trades, length - 1 - bars)
+            breached = np.flatnonzero(possible < self.min_trades)
+            trade_bar = breached[0] if len(breached) else length
+        if min(drawdown_bar, trade_bar) >= length:
+            return None, None
+        # the drawdown check runs first on a bar, as in check
+        if drawdown_bar <= trade_bar:
+            return int(drawdown_bar), 'max_drawdown'
+        return int(trade_bar), 'min_trades'
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+DEFAULT_PRUNING = PruningConstraints()
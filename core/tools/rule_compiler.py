@@ -0,0 +1,259 @@
+"""
+Rule compiler module
+Parse strategy rule expressions once into a per-bar callable and a vectorized mask
+function. Only a small expression grammar is accepted (comparisons, and/or/not,
+arithmetic, numbers, indicator and CrossOver_* names), so rules coming from an LLM
+can never execute arbitrary Python.
+"""
+
+import ast
+import operator
+import numpy as np
+from typing import Dict, Any, Callable, Iterable, Optional, Set
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_COMPARE_OPS = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne
+}
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv
+}
+
+class RuleCompileError(ValueError):
+    """Raised when a rule expression is malformed or outside the rule grammar"""
+
+def allowed_rule_names(strategy: Dict[str, Any]) -> Set[str]:
+    """
+    Names a strategy's rules may refer to
+
+    Args:
+        strategy: Strategy configuration dictionary
+
+    Returns:
+        Set[str]: 'close', the strategy's indicators (plus MACD_SIGNAL) and their CrossOver_* signals
+    """
+    names = {'close'}
+    for indicator_name in strategy.get('indicators', []):
+        names.add(indicator_name)
+        names.add(f"CrossOver_{indicator_name}")
+        if indicator_name == 'MACD':
+            names.add('MACD_SIGNAL')
+    return names
+
+def _validate(node: ast.AST, allowed_names: Optional[Set[str]], used: Set[str]) -> None:
+    """Walk the parsed expression, rejecting anything outside the rule grammar"""
+    if isinstance(node, ast.Expression):
+        _validate(node.body, allowed_names, used)
+    elif isinstance(node, ast.BoolOp):
+        for value in node.values:
+            _validate(value, allowed_names, used)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+        _validate(node.operand, allowed_names, used)
+    elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        _validate(node.left, allowed_names, used)
+        _validate(node.right, allowed_names, used)
+    elif isinstance(node, ast.Compare):
+        for op in node.ops:
+            if type(op) not in _COMPARE_OPS:
+                raise RuleCompileError(f"Unsupported comparison in rule: {type(op).__name__}")
+        _validate(node.left, allowed_names, used)
+        for comparator in node.comparators:
+            _validate(comparator, allowed_names, used)
+    elif isinstance(node, ast.Name):
+        if allowed_names is not None and node.id not in allowed_names:
+            raise RuleCompileError(f"Unknown name in rule: {node.id} (allowed: {sorted(allowed_names)})")
+        used.add(node.id)
+    elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        pass
+    else:
+        raise RuleCompileError(f"Unsupported expression in rule: {ast.dump(node)}")
+
+def _build_scalar(node: ast.AST) -> Callable[[Dict[str, float]], Any]:
+    """Turn a validated expression into a function of one bar's values (Python short-circuit semantics)"""
+    if isinstance(node, ast.Expression):
+        return _build_scalar(node.body)
+    if isinstance(node, ast.BoolOp):
+        # fold 'a and b and c' into nested two-operand closures (no generator per bar)
+        parts = [_build_scalar(value) for value in node.values]
+        combined = parts[-1]
+        for part in reversed(parts[:-1]):
+            if isinstance(node.op, ast.And):
+                combined = (lambda first, rest: lambda values: first(values) and rest(values))(part, combined)
+            else:
+                combined = (lambda first, rest: lambda values: first(values) or rest(values))(part, combined)
+        return combined
+    if isinstance(node, ast.UnaryOp):
+        operand = _build_scalar(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda values: not operand(values)
+        if isinstance(node.op, ast.USub):
+            return lambda values: -operand(values)
+        return operand
+    if isinstance(node, ast.BinOp):
+        left, right, op = _build_scalar(node.left), _build_scalar(node.right), _BINARY_OPS[type(node.op)]
+        return lambda values: op(left(values), right(values))
+    if isinstance(node, ast.Compare):
+        operands = [_build_scalar(node.left)] + [_build_scalar(c) for c in node.comparators]
+        ops = [_COMPARE_OPS[type(op)] for op in node.ops]
+        if len(ops) == 1:
+            op = ops[0]
+            # 'NAME op number', the most common rule term, reads the value directly
+            if isinstance(node.left, ast.Name) and isinstance(node.comparators[0], ast.Constant):
+                name, constant = node.left.id, float(node.comparators[0].value)
+                return lambda values: op(values[name], constant)
+            left, right = operands
+            return lambda values: op(left(values), right(values))
+
+        def compare(values):
+            left = operands[0](values)
+            for op, operand in zip(ops, operands[1:]):
+                right = operand(values)
+                if not op(left, right):
+                    return False
+                left = right
+            return True
+        return compare
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda values: values[name]
+    value = float(node.value)
+    return lambda values: value
+
+def _build_mask(node: ast.AST) -> Callable[[Dict[str, np.ndarray]], Any]:
+    """Turn a validated expression into a function over whole columns ('and'/'or'/'not' become element-wise)"""
+    if isinstance(node, ast.Expression):
+        return _build_mask(node.body)
+    if isinstance(node, ast.BoolOp):
+        parts = [_build_mask(value) for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+        def bool_op(values):
+            out = np.asarray(parts[0](values), dtype=bool)
+            for part in parts[1:]:
+                out = combine(out, np.asarray(part(values), dtype=bool))
+            return out
+        return bool_op
+    if isinstance(node, ast.UnaryOp):
+        operand = _build_mask(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda values: ~np.asarray(operand(values), dtype=bool)
+        if isinstance(node.op, ast.USub):
+            return lambda values: -operand(values)
+        return operand
+    if isinstance(node, ast.BinOp):
+        left, right, op = _build_mask(node.left), _build_mask(node.right), _BINARY_OPS[type(node.op)]
+        return lambda values: op(left(values), right(values))
+    if isinstance(node, ast.Compare):
+        operands = [_build_mask(node.left)] + [_build_mask(c) for c in node.comparators]
+        ops = [_COMPARE_OPS[type(op)] for op in node.ops]
+
+        def compare(values):
+            left = operands[0](values)
+            out = None
+            for op, operand in zip(ops, operands[1:]):
+                right = operand(values)
+                result = op(left, right)
+                out = result if out is None else out & result
+                left = right
+            return out
+        return compare
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda values: values[name]
+    value = float(node.value)
+    return lambda values: value
+
+class CompiledRule:
+    def __init__(self, expr: str, allowed_names: Optional[Iterable[str]] = None):
+        """
+        Parse and validate a rule expression once
+
+        Args:
+            expr: Rule expression, e.g. "CrossOver_SMA > 0 and ADX > 25"
+            allowed_names: Names the rule may use; None accepts any name
+        """
+        self.expr = expr
+        allowed = set(allowed_names) if allowed_names is not None else None
+        try:
+            tree = ast.parse(expr, mode='eval')
+        except SyntaxError as e:
+            raise RuleCompileError(f"Invalid rule expression '{expr}': {e.msg}") from e
+
+        used = set()
+        _validate(tree, allowed, used)
+        self.names = frozenset(used)
+        self._scalar = _build_scalar(tree)
+        self._mask = _build_mask(tree)
+
+    def __call__(self, values: Dict[str, float]) -> bool:
+        """
+        Evaluate the rule on one bar
+
+        Args:
+            values: Name -> current bar value
+
+        Returns:
+            bool: Whether the rule holds
+        """
+        return bool(self._scalar(values))
+
+    def mask(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Evaluate the rule over whole columns
+
+        Args:
+            values: Name -> array of bar values
+
+        Returns:
+            np.ndarray: Boolean mask of bars where the rule holds
+        """
+        length = len(next(iter(values.values())))
+        result = self._mask(values)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (length,)).copy()
+
+    def __repr__(self) -> str:
+        return f"CompiledRule({self.expr!r})"
+
+def compile_rule(expr: str, allowed_names: Optional[Iterable[str]] = None) -> CompiledRule:
+    """
+    Compile a rule expression
+
+    Args:
+        expr: Rule expression
+        allowed_names: Names the rule may use; None accepts any name
+
+    Returns:
+        CompiledRule: Validated rule with a per-bar callable and a vectorized mask
+    """
+    return CompiledRule(expr, allowed_names)
+
+def compile_strategy_rules(strategy: Dict[str, Any]) -> Dict[str, Optional[CompiledRule]]:
+    """
+    Compile a strategy's entry and exit rules against its indicators
+
+    Args:
+        strategy: Strategy configuration dictionary with 'rule' in list format
+
+    Returns:
+        Dict[str, Optional[CompiledRule]]: {'entry': ..., 'exit': ...}, None for a missing rule
+    """
+    allowed_names = allowed_rule_names(strategy)
+    compiled = {'entry': None, 'exit': None}
+    for rule_type in compiled:
+        expr = next((rule['expr'] for rule in strategy['rule'] if rule['type'] == rule_type), None)
+        if expr:
+            compiled[rule_type] = compile_rule(expr, allowed_names)
+    logger.info(f"Compiled rules for {strategy.get('name', 'Unnamed Strategy')}: "
+                f"{ {k: v.expr if v else None for k, v in compiled.items()} }")
+    return compiled
@@ -0,0 +1,236 @@
+"""
+Strategy tournament module
+Backtest every candidate strategy in parallel on a process pool against the same
+loaded data and rank them by a configurable objective
+"""
+
+import os
+import copy
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Union
+from utils.logger import setup_logger
+from config.settings import (
+    INITIAL_CAPITAL,
+    STRATEGY_CONFIG,
+    TOURNAMENT_OBJECTIVE,
+    TOURNAMENT_MAX_WORKERS,
+    SHARED_MEMORY_TRANSPORT
+)
+from core.tools.indicators_process import get_historical_data, calculate_indicators
+from core.tools.indicator_registry import required_indicators, compute_indicators, strategy_columns
+from core.tools.backtest import backtest_strategy, evaluate_backtest, generate_live_signal, build_quant_report
+from core.data.shared_frame import SharedFrame, SharedFrameHandle, resolve_frame
+
+logger = setup_logger(__name__)
+
+# objective -> True when higher is better
+OBJECTIVE_DIRECTIONS = {
+    'total_return': True,
+    'annual_return': True,
+    'sharpe_ratio': True,
+    'sortino_ratio': True,
+    'calmar_ratio': True,
+    'win_rate': True,
+    'profit_factor': True,
+    'avg_trade_return': True,
+    'max_drawdown': False,
+    'rolling_sharpe_min': True,
+    'volatility': False,
+    'max_consecutive_losses': False,
+    'max_drawdown_duration': False,
+    'ulcer_index': False
+}
+
+TABLE_COLUMNS = [
+    'rank', 'candidate', 'strategy_name', 'score', 'is_satisfactory', 'total_return', 'annual_return',
+    'sharpe_ratio', 'sortino_ratio', 'calmar_ratio', 'max_drawdown', 'win_rate', 'total_trades', 'error'
+]
+
+# data shared with worker processes, set once per worker by the pool initializer
+_tournament_data = None
+
+def _init_worker(data: Union[pd.DataFrame, SharedFrameHandle]) -> None:
+    global _tournament_data
+    _tournament_data = resolve_frame(data)
+
+def objective_value(evaluation: Dict[str, Any], objective: str) -> float:
+    """Read an objective from an evaluate_backtest report (performance or trading metrics)"""
+    for section in ('performance_metrics', 'trading_statistics', 'risk_metrics'):
+        if objective in evaluation.get(section, {}):
+            value = float(evaluation[section][objective])
+            return abs(value) if objective == 'max_drawdown' else value
+    raise ValueError(f"Unknown tournament objective: {objective}")
+
+def _run_candidate(strategy: Dict[str, Any], initial_capital: float,
+                   data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Backtest and evaluate one candidate; errors are reported instead of raised"""
+    data = _tournament_data if data is None else data
+    try:
+        started = time.perf_counter()
+        # each candidate runs once per tournament, caching would only add fingerprinting and copies
+        result = backtest_strategy(data=data, strategy=copy.deepcopy(strategy), initial_capital=initial_capital,
+                                   use_cache=False)
+        evaluation = evaluate_backtest(result)
+        return {'strategy': strategy, 'evaluation': evaluation, 'error': None,
+                'elapsed': time.perf_counter() - started}
+    except Exception as e:
+        logger.error(f"Tournament backtest failed for {strategy.get('name', 'Unnamed Strategy')}: {str(e)}")
+        return {'strategy': strategy, 'evaluation': None, 'error': str(e), 'elapsed': 0.0}
+
+def prepare_tournament_data(data: pd.DataFrame, strategies: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Normalize raw history and compute the indicator columns of every candidate once
+
+    Args:
+        data: Historical data as returned by get_historical_data
+        strategies: Candidate strategies
+
+    Returns:
+        pd.DataFrame: Data with the union of all candidates' indicator columns
+    """
+    data = calculate_indicators(data, strategies[0])
+    if data is None:
+        raise ValueError("Failed to calculate technical indicators")
+    for strategy in strategies[1:]:
+        data = compute_indicators(data, required_indicators(strategy))
+    return data
+
+def rank_candidates(outcomes: List[Dict[str, Any]], objective: str = TOURNAMENT_OBJECTIVE) -> pd.DataFrame:
+    """
+    Build the ranked table: satisfactory strategies first, then by objective
+
+    Args:
+        outcomes: Results of the candidate runs, in candidate order
+        objective: Metric to rank by (see OBJECTIVE_DIRECTIONS)
+
+    Returns:
+        pd.DataFrame: One row per candidate ('candidate' is its position in outcomes), best first
+    """
+    if objective not in OBJECTIVE_DIRECTIONS:
+        raise ValueError(f"Unknown tournament objective: {objective}. Choose from {list(OBJECTIVE_DIRECTIONS)}")
+    higher_is_better = OBJECTIVE_DIRECTIONS[objective]
+
+    rows = []
+    for candidate, outcome in enumerate(outcomes):
+        evaluation = outcome['evaluation']
+        row = {'candidate': candidate, 'strategy_name': outcome['strategy'].get('name', 'Unnamed Strategy'),
+               'error': outcome['error']}
+        if evaluation is None or 'error' in evaluation:
+            row.update({'score': float('nan'), 'is_satisfactory': False,
+                        'error': outcome['error'] or evaluation.get('error')})
+        else:
+            row.update(evaluation['performance_metrics'])
+            row['win_rate'] = evaluation['trading_statistics']['win_rate']
+            row['total_trades'] = evaluation['trading_statistics']['total_trades']
+            row['is_satisfactory'] = evaluation['is_satisfactory']
+            row['score'] = objective_value(evaluation, objective)
+        rows.append(row)
+
+    table = pd.DataFrame(rows).reindex(columns=TABLE_COLUMNS[1:])
+    table = table.sort_values(['is_satisfactory', 'score'], ascending=[False, not higher_is_better],
+                              na_position='last', kind='stable').reset_index(drop=True)
+    table.insert(0, 'rank', range(1, len(table) + 1))
+    return table
+
+def run_tournament(data: pd.DataFrame,
+                   strategies: Optional[List[Dict[str, Any]]] = None,
+                   objective: str = TOURNAMENT_OBJECTIVE,
+                   initial_capital: float = INITIAL_CAPITAL,
+                   max_workers: Optional[int] = TOURNAMENT_MAX_WORKERS) -> Dict[str, Any]:
+    """
+    Backtest every candidate strategy on the same data and rank them
+
+    The data is sent to each worker process once (pool initializer), not once per task;
+    with SHARED_MEMORY_TRANSPORT workers attach to a shared memory copy instead.
+
+    Args:
+        data: Data with indicator columns (see prepare_tournament_data)
+        strategies: Candidate strategies, defaults to STRATEGY_CONFIG
+        objective: Metric to rank by (see OBJECTIVE_DIRECTIONS)
+        initial_capital: Initial capital for every backtest
+        max_workers: Worker processes; None uses one per candidate capped at the CPU count, 1 runs in-process
+
+    Returns:
+        Dict[str, Any]: {'best': winning strategy or None, 'evaluation': its evaluation,
+                         'table': ranked DataFrame, 'elapsed': seconds}
+    """
+    strategies = list(STRATEGY_CONFIG if strategies is None else strategies)
+    if not strategies:
+        raise ValueError("No candidate strategies for the tournament")
+    if objective not in OBJECTIVE_DIRECTIONS:
+        raise ValueError(f"Unknown tournament objective: {objective}. Choose from {list(OBJECTIVE_DIRECTIONS)}")
+    workers = max_workers or min(len(strategies), os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    logger.info(f"Running strategy tournament: {len(strategies)} candidates, {workers} workers, objective {objective}")
+    outcomes = None
+    if workers > 1:
+        shared = None
+        try:
+            shared = SharedFrame(data) if SHARED_MEMORY_TRANSPORT else None
+            initargs = (shared.handle if shared is not None else data,)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                outcomes = list(pool.map(_run_candidate, strategies, [initial_capital] * len(strategies)))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Process pool unavailable, running tournament sequentially: {str(e)}")
+        finally:
+            if shared is not None:
+                shared.close()
+    if outcomes is None:
+        outcomes = [_run_candidate(strategy, initial_capital, data) for strategy in strategies]
+
+    table = rank_candidates(outcomes, objective)
+    best = None
+    best_evaluation = None
+    if len(table) and pd.notna(table.loc[0, 'score']):
+        winner = outcomes[int(table.loc[0, 'candidate'])]
+        best, best_evaluation = winner['strategy'], winner['evaluation']
+    elapsed = time.perf_counter() - started
+    logger.info(f"Strategy tournament finished in {elapsed:.2f}s, winner: {best['name'] if best else None}")
+    logger.info(f"Tournament ranking:\n{table.to_string(index=False)}")
+    return {'best': best, 'evaluation': best_evaluation, 'table': table, 'elapsed': elapsed}
+
+def strategy_tournament(symbol: str,
+                        strategies: Optional[List[Dict[str, Any]]] = None,
+                        objective: str = TOURNAMENT_OBJECTIVE) -> Dict[str, Any]:
+    """
+    Load the asset's history once, run the tournament and report on the winner
+
+    Args:
+        symbol: Asset symbol
+        strategies: Candidate strategies, defaults to STRATEGY_CONFIG
+        objective: Metric to rank by
+
+    Returns:
+        Dict[str, Any]: {'strategy': winner, 'report': quant_analysis-style report, 'table': ranked records}
+    """
+    strategies = list(STRATEGY_CONFIG if strategies is None else strategies)
+    historical_data = get_historical_data(symbol)
+    if historical_data is None:
+        raise ValueError(f"Failed to get historical data for asset {symbol}")
+    data = prepare_tournament_data(historical_data, strategies)
+
+    outcome = run_tournament(data, strategies, objective)
+    table = outcome['table'].astype(object).where(outcome['table'].notna(), None).to_dict(orient='records')
+    if outcome['best'] is None:
+        return {
+            'strategy': None,
+            'report': {'status': 'error', 'symbol': symbol, 'error': 'All tournament backtests failed'},
+            'table': table
+        }
+
+    strategy = outcome['best']
+    # the live signal prompt only sees the winner's indicators, as in quant_analysis
+    other_columns = {column for candidate in strategies for column in strategy_columns(candidate).values()}
+    other_columns -= set(strategy_columns(strategy).values())
+    try:
+        live_signal = generate_live_signal(data.drop(columns=list(other_columns)), strategy)
+    except Exception as e:
+        logger.warning(f"Failed to get real-time trading signal: {str(e)}")
+        live_signal = "HOLD"  # Default hold
+    report = build_quant_report(symbol, strategy, live_signal, outcome['evaluation'])
+    report['objective'] = objective
+    return {'strategy': strategy, 'report': report, 'table': table}
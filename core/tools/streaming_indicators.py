@@ -0,0 +1,364 @@
+"""
+Streaming indicator module
+Stateful technical indicators updated one bar at a time in O(1), matching the
+batch TA-Lib outputs used by calculate_indicators. A standalone utility for callers
+that consume bars one at a time; the backtest engines read precomputed columns instead
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+NAN = float('nan')
+# TA-Lib treats values within this distance of zero as zero
+_EPSILON = 1e-14
+
+def _field(bar: Any, name: str) -> float:
+    """Read a price field from a bar given as a number (close only), a mapping or an object"""
+    if isinstance(bar, (int, float)):
+        return float(bar)
+    if isinstance(bar, dict):
+        if name in bar:
+            return float(bar[name])
+        return float(bar[name.capitalize()])
+    return float(getattr(bar, name))
+
+def _is_zero(value: float) -> bool:
+    return -_EPSILON < value < _EPSILON
+
+class StreamingIndicator(ABC):
+    """Base class of streaming indicators"""
+
+    def __init__(self):
+        self.count = 0
+        self.value: Any = NAN
+
+    @property
+    def ready(self) -> bool:
+        """Whether the indicator has produced its first value"""
+        value = self.value[0] if isinstance(self.value, tuple) else self.value
+        return not math.isnan(value)
+
+    @abstractmethod
+    def push(self, bar: Any) -> Any:
+        """
+        Update the indicator with a new bar
+
+        Args:
+            bar: Close price, or a mapping/object with open/high/low/close fields
+
+        Returns:
+            The current indicator value (NaN until enough bars have been pushed)
+        """
+
+class StreamingSMA(StreamingIndicator):
+    """Simple moving average (TA-Lib SMA)"""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def push(self, bar: Any) -> float:
+        close = _field(bar, 'close')
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(close)
+        self.total += close
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self.total / self.period
+        return self.value
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential moving average seeded with the SMA of the first period (TA-Lib EMA)"""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.seed_total = 0.0
+
+    def push(self, bar: Any) -> float:
+        close = _field(bar, 'close')
+        self.count += 1
+        if self.count < self.period:
+            self.seed_total += close
+        elif self.count == self.period:
+            self.value = (self.seed_total + close) / self.period
+        else:
+            self.value = (close - self.value) * self.alpha + self.value
+        return self.value
+
+class StreamingRSI(StreamingIndicator):
+    """Relative strength index with Wilder smoothing (TA-Lib RSI)"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def push(self, bar: Any) -> float:
+        close = _field(bar, 'close')
+        self.count += 1
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+
+        change = close - self.prev_close
+        self.prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if self.count <= self.period:
+            # accumulate the first period of changes
+            self.avg_gain += gain
+            self.avg_loss += loss
+            return self.value
+        if self.count == self.period + 1:
+            self.avg_gain = (self.avg_gain + gain) / self.period
+            self.avg_loss = (self.avg_loss + loss) / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        total = self.avg_gain + self.avg_loss
+        self.value = 100.0 * self.avg_gain / total if not _is_zero(total) else 0.0
+        return self.value
+
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD line, signal line and histogram (TA-Lib MACD)
+
+    As in TA-Lib, the fast EMA is seeded on the same bars that end the slow EMA's
+    seed window, and all three outputs start once the signal line is seeded.
+    The value is a (macd, signal, hist) tuple.
+    """
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.fast_alpha = 2.0 / (fast_period + 1)
+        self.slow_alpha = 2.0 / (slow_period + 1)
+        self.signal = StreamingEMA(signal_period)
+        self.fast_window = deque(maxlen=fast_period)
+        self.slow_total = 0.0
+        self.fast_ema = NAN
+        self.slow_ema = NAN
+        self.value = (NAN, NAN, NAN)
+
+    def push(self, bar: Any) -> Tuple[float, float, float]:
+        close = _field(bar, 'close')
+        self.count += 1
+        if self.count < self.slow_period:
+            self.slow_total += close
+            self.fast_window.append(close)
+            return self.value
+        if self.count == self.slow_period:
+            self.fast_window.append(close)
+            self.slow_ema = (self.slow_total + close) / self.slow_period
+            self.fast_ema = sum(self.fast_window) / self.fast_period
+            self.fast_window.clear()
+        else:
+            self.fast_ema = (close - self.fast_ema) * self.fast_alpha + self.fast_ema
+            self.slow_ema = (close - self.slow_ema) * self.slow_alpha + self.slow_ema
+
+        macd = self.fast_ema - self.slow_ema
+        signal = self.signal.push(macd)
+        if not math.isnan(signal):
+            self.value = (macd, signal, macd - signal)
+        return self.value
+
+class StreamingATR(StreamingIndicator):
+    """Average true range with Wilder smoothing (TA-Lib ATR)"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.tr_total = 0.0
+
+    def push(self, bar: Any) -> float:
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        self.count += 1
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+
+        true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        if self.count <= self.period:
+            self.tr_total += true_range
+        elif self.count == self.period + 1:
+            self.value = (self.tr_total + true_range) / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
+
+class StreamingADX(StreamingIndicator):
+    """Average directional index (TA-Lib ADX)"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev_high: Optional[float] = None
+        self.prev_low = 0.0
+        self.prev_close = 0.0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.dx_total = 0.0
+
+    def push(self, bar: Any) -> float:
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        self.count += 1
+        if self.prev_high is None:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return self.value
+
+        diff_plus = high - self.prev_high
+        diff_minus = self.prev_low - low
+        true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        plus_dm = diff_plus if diff_plus > 0 and diff_plus > diff_minus else 0.0
+        minus_dm = diff_minus if diff_minus > 0 and diff_plus < diff_minus else 0.0
+
+        period = self.period
+        # the first period - 1 moves only accumulate the smoothed sums
+        if self.count < period + 1:
+            self.plus_dm += plus_dm
+            self.minus_dm += minus_dm
+            self.tr += true_range
+            return self.value
+
+        self.plus_dm = self.plus_dm - self.plus_dm / period + plus_dm
+        self.minus_dm = self.minus_dm - self.minus_dm / period + minus_dm
+        self.tr = self.tr - self.tr / period + true_range
+
+        dx = None
+        if not _is_zero(self.tr):
+            plus_di = 100.0 * self.plus_dm / self.tr
+            minus_di = 100.0 * self.minus_dm / self.tr
+            di_total = plus_di + minus_di
+            if not _is_zero(di_total):
+                dx = 100.0 * abs(minus_di - plus_di) / di_total
+
+        # the next period moves seed the ADX with the average DX, then Wilder smoothing
+        if self.count < 2 * period:
+            if dx is not None:
+                self.dx_total += dx
+        elif self.count == 2 * period:
+            if dx is not None:
+                self.dx_total += dx
+            self.value = self.dx_total / period
+        elif dx is not None:
+            self.value = (self.value * (period - 1) + dx) / period
+        return self.value
+
+class StreamingBollinger(StreamingIndicator):
+    """Bollinger bands on a simple moving average with population standard deviation (TA-Lib BBANDS)"""
+
+    def __init__(self, period: int = 20, nbdev_up: float = 2.0, nbdev_down: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.nbdev_up = nbdev_up
+        self.nbdev_down = nbdev_down
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.value = (NAN, NAN, NAN)
+
+    def push(self, bar: Any) -> Tuple[float, float, float]:
+        close = _field(bar, 'close')
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        self.window.append(close)
+        self.total += close
+        self.total_sq += close * close
+        self.count += 1
+        if self.count >= self.period:
+            middle = self.total / self.period
+            variance = self.total_sq / self.period - middle * middle
+            std = math.sqrt(variance) if variance > 0 else 0.0
+            self.value = (middle + self.nbdev_up * std, middle, middle - self.nbdev_down * std)
+        return self.value
+
+class StreamingDonchian(StreamingIndicator):
+    """Donchian channel (highest high, lowest low) using monotonic deques, amortized O(1)"""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self.highs = deque()  # (index, high), decreasing highs
+        self.lows = deque()   # (index, low), increasing lows
+        self.value = (NAN, NAN)
+
+    def push(self, bar: Any) -> Tuple[float, float]:
+        high, low = _field(bar, 'high'), _field(bar, 'low')
+        index = self.count
+        self.count += 1
+
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((index, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((index, low))
+
+        # drop values that left the window
+        oldest = index - self.period + 1
+        while self.highs[0][0] < oldest:
+            self.highs.popleft()
+        while self.lows[0][0] < oldest:
+            self.lows.popleft()
+
+        if self.count >= self.period:
+            self.value = (self.highs[0][1], self.lows[0][1])
+        return self.value
+
+STREAMING_INDICATORS = {
+    'SMA': StreamingSMA,
+    'EMA': StreamingEMA,
+    'RSI': StreamingRSI,
+    'MACD': StreamingMACD,
+    'ATR': StreamingATR,
+    'ADX': StreamingADX,
+    'BBANDS': StreamingBollinger,
+    'DONCHIAN': StreamingDonchian
+}
+
+def create_streaming_indicator(name: str, params: Optional[Dict[str, Any]] = None) -> StreamingIndicator:
+    """
+    Create a streaming indicator from a strategy-style name and params
+
+    Args:
+        name: Indicator name, e.g. 'SMA' or 'MACD'
+        params: Strategy params, e.g. {'period': 50} or {'period_me1': 12, 'period_me2': 26, 'period_signal': 9}
+
+    Returns:
+        StreamingIndicator: A fresh indicator instance
+    """
+    params = params or {}
+    if name not in STREAMING_INDICATORS:
+        raise ValueError(f"No streaming implementation for indicator: {name}")
+    if name == 'MACD':
+        return StreamingMACD(params.get('period_me1', 12), params.get('period_me2', 26), params.get('period_signal', 9))
+    if name == 'BBANDS':
+        return StreamingBollinger(params.get('period', 20))
+    defaults = {'SMA': 20, 'EMA': 20, 'RSI': 14, 'ATR': 14, 'ADX': 14, 'DONCHIAN': 20}
+    return STREAMING_INDICATORS[name](params.get('period', defaults[name]))
+
+def run_streaming(indicator: StreamingIndicator, bars: Iterable[Any]) -> List[Any]:
+    """Push every bar through an indicator and collect the values"""
+    return [indicator.push(bar) for bar in bars]
@@ -0,0 +1,226 @@
+"""
+Parameter-sweep indicator module
+Compute one indicator for many periods in a single pass, returning a (bars x periods) matrix
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+from utils.logger import setup_logger
+from core.tools.indicator_registry import indicator_columns
+
+logger = setup_logger(__name__)
+
+class IndicatorSweep:
+    """A (bars x periods) matrix of one indicator, indexable by period"""
+
+    def __init__(self, name: str, periods: Sequence[int], values: np.ndarray):
+        """
+        Initialize sweep result
+
+        Args:
+            name: Indicator output name, e.g. 'SMA' or 'DONCHIAN_HIGH'
+            periods: Periods in column order
+            values: Array of shape (bars, len(periods))
+        """
+        self.name = name
+        self.periods = [int(p) for p in periods]
+        self.values = values
+        self._positions = {period: i for i, period in enumerate(self.periods)}
+
+    def column(self, period: int) -> np.ndarray:
+        """Values for one period (a view into the matrix)"""
+        return self.values[:, self._positions[period]]
+
+    def __getitem__(self, period: int) -> np.ndarray:
+        return self.column(period)
+
+def _as_periods(periods: Sequence[int]) -> np.ndarray:
+    periods = np.asarray(list(periods), dtype=np.int64)
+    if periods.size == 0 or (periods < 1).any():
+        raise ValueError("Periods must be a non-empty list of positive integers")
+    return periods
+
+def _prefix_sum(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum with a leading zero, so that sum(values[a:b]) = cs[b] - cs[a]"""
+    cs = np.zeros(len(values) + 1)
+    np.cumsum(values, out=cs[1:])
+    return cs
+
+def _window_sums(cs: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Trailing window sums for every period from one prefix sum, NaN before a window is full"""
+    n = len(cs) - 1
+    out = np.full((n, len(periods)), np.nan, order='F')
+    for j, period in enumerate(periods):
+        if period <= n:
+            np.subtract(cs[period:], cs[:n + 1 - period], out=out[period - 1:, j])
+    return out
+
+def sma_sweep(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Simple moving averages for all periods from a single cumulative sum"""
+    close = np.asarray(close, dtype=np.float64)
+    periods = _as_periods(periods)
+    sums = _window_sums(_prefix_sum(close), periods)
+    sums /= periods
+    return sums
+
+def std_sweep(values: np.ndarray, periods: Sequence[int], ddof: int = 0) -> np.ndarray:
+    """Rolling standard deviations for all periods from cumulative sums of values and squares"""
+    values = np.asarray(values, dtype=np.float64)
+    periods = _as_periods(periods)
+    shifted = values - values[0]
+    total = _window_sums(_prefix_sum(shifted), periods)
+    total_sq = _window_sums(_prefix_sum(shifted * shifted), periods)
+    variance = (total_sq - total * total / periods) / (periods - ddof)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+def ema_sweep(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Exponential moving averages for all periods, each seeded with its SMA (as TA-Lib), in one pass over the bars"""
+    close = np.asarray(close, dtype=np.float64)
+    periods = _as_periods(periods)
+    n = len(close)
+    out = np.full((n, len(periods)), np.nan)
+    alpha = 2.0 / (periods + 1)
+    seeds = _window_sums(_prefix_sum(close), periods) / periods
+    ema = np.full(len(periods), np.nan)
+    for t in range(int(periods.min()) - 1, n):
+        seeding = periods - 1 == t
+        running = periods - 1 < t
+        ema[seeding] = seeds[t, seeding]
+        ema[running] = alpha[running] * close[t] + (1 - alpha[running]) * ema[running]
+        out[t] = ema
+    return out
+
+def rsi_sweep(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Wilder RSI for all periods (as TA-Lib), in one pass over the bars"""
+    close = np.asarray(close, dtype=np.float64)
+    periods = _as_periods(periods)
+    n = len(close)
+    out = np.full((n, len(periods)), np.nan)
+    if n < 2:
+        return out
+    change = np.diff(close)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    seed_gain = _window_sums(_prefix_sum(gain), periods) / periods
+    seed_loss = _window_sums(_prefix_sum(loss), periods) / periods
+    avg_gain = np.full(len(periods), np.nan)
+    avg_loss = np.full(len(periods), np.nan)
+    for t in range(int(periods.min()), n):
+        seeding = periods == t
+        running = periods < t
+        avg_gain[seeding] = seed_gain[t - 1, seeding]
+        avg_loss[seeding] = seed_loss[t - 1, seeding]
+        avg_gain[running] = (avg_gain[running] * (periods[running] - 1) + gain[t - 1]) / periods[running]
+        avg_loss[running] = (avg_loss[running] * (periods[running] - 1) + loss[t - 1]) / periods[running]
+        total = avg_gain + avg_loss
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[t] = np.where(total != 0, 100.0 * avg_gain / total, np.where(np.isnan(total), np.nan, 0.0))
+    return out
+
+def roc_sweep(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Rate of change in percent for all periods (as TA-Lib ROC)"""
+    close = np.asarray(close, dtype=np.float64)
+    periods = _as_periods(periods)
+    n = len(close)
+    out = np.full((n, len(periods)), np.nan, order='F')
+    for j, period in enumerate(periods):
+        if period < n:
+            out[period:, j] = (close[period:] / close[:n - period] - 1) * 100
+    return out
+
+def _rolling_extreme_sweep(values: np.ndarray, periods: Sequence[int], reduce) -> np.ndarray:
+    """
+    Rolling max/min for all periods with a sparse table
+
+    Level k holds the extreme of the 2**k bars ending at each row; any window of
+    length p is covered by two overlapping level-floor(log2 p) blocks.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    periods = _as_periods(periods)
+    n = len(values)
+    levels = [values]
+    span = 1
+    while span * 2 <= min(int(periods.max()), max(n, 1)):
+        prev = levels[-1]
+        level = prev.copy()
+        level[span:] = reduce(prev[span:], prev[:-span])
+        levels.append(level)
+        span *= 2
+
+    out = np.full((n, len(periods)), np.nan, order='F')
+    rows = np.arange(n)
+    for j, period in enumerate(periods):
+        if period > n:
+            continue
+        k = int(np.floor(np.log2(period)))
+        block = levels[k]
+        valid = rows[period - 1:]
+        out[period - 1:, j] = reduce(block[valid], block[valid - period + (1 << k)])
+    return out
+
+def rolling_max_sweep(values: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Rolling maximum for all periods"""
+    return _rolling_extreme_sweep(values, periods, np.maximum)
+
+def rolling_min_sweep(values: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """Rolling minimum for all periods"""
+    return _rolling_extreme_sweep(values, periods, np.minimum)
+
+# indicator name -> (input column, sweep kernel)
+SWEEP_KERNELS = {
+    'SMA': ('close', sma_sweep),
+    'EMA': ('close', ema_sweep),
+    'RSI': ('close', rsi_sweep),
+    'ROC': ('close', roc_sweep)
+}
+
+# indicators sweep_indicator and add_sweep_columns accept (all take a single 'period' param)
+SWEEP_INDICATORS = tuple(SWEEP_KERNELS) + ('DONCHIAN',)
+
+def sweep_indicator(data: pd.DataFrame, name: str, periods: Sequence[int]) -> Dict[str, IndicatorSweep]:
+    """
+    Compute an indicator for many periods at once
+
+    Args:
+        data: DataFrame with lowercase OHLCV columns
+        name: 'SMA', 'EMA', 'RSI', 'ROC' or 'DONCHIAN'
+        periods: Periods to compute
+
+    Returns:
+        Dict[str, IndicatorSweep]: Output name -> sweep matrix ('DONCHIAN' returns DONCHIAN_HIGH and DONCHIAN_LOW)
+    """
+    if name == 'DONCHIAN':
+        return {
+            'DONCHIAN_HIGH': IndicatorSweep('DONCHIAN_HIGH', periods, rolling_max_sweep(data['high'].to_numpy(), periods)),
+            'DONCHIAN_LOW': IndicatorSweep('DONCHIAN_LOW', periods, rolling_min_sweep(data['low'].to_numpy(), periods))
+        }
+    if name not in SWEEP_KERNELS:
+        raise ValueError(f"Indicator {name} has no sweep kernel. Available: {list(SWEEP_KERNELS) + ['DONCHIAN']}")
+    column, kernel = SWEEP_KERNELS[name]
+    return {name: IndicatorSweep(name, periods, kernel(data[column].to_numpy(), periods))}
+
+def add_sweep_columns(data: pd.DataFrame, name: str, periods: Sequence[int]) -> pd.DataFrame:
+    """
+    Add an indicator for many periods as regular columns, named as calculate_indicators would
+    (e.g. SMA_10 ... SMA_200, RSI_5 ... RSI), so backtests find them without recomputing
+
+    Args:
+        data: DataFrame with lowercase OHLCV columns
+        name: Indicator name (see sweep_indicator)
+        periods: Periods to compute
+
+    Returns:
+        pd.DataFrame: A shallow copy of the frame with the columns added
+    """
+    data = data.copy(deep=False)
+    sweeps = sweep_indicator(data, name, periods)
+    new_columns = {}
+    for position, period in enumerate(periods):
+        columns = indicator_columns(name, {'period': int(period)})
+        for column, sweep in zip(columns, sweeps.values()):
+            new_columns[column] = sweep.values[:, position]
+    for column, values in new_columns.items():
+        data[column] = values
+    logger.info(f"Added {len(new_columns)} {name} sweep columns for periods {list(periods)}")
+    return data
@@ -0,0 +1,124 @@
+"""
+Trade log module
+Compact result layout shared by the backtest engines: closed trades as a structured
+NumPy array and the portfolio value as a float64 array with one entry per bar, from
+which the summary metrics are computed directly
+"""
+
+import numpy as np
+from typing import List, Dict, Any, Optional
+from core.tools.metrics import equity_metrics, years_between
+
+# one record per closed trade; indices are bar positions in the result's 'dates' / 'equity' arrays
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', np.int64),
+    ('exit_idx', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('size', np.float64),
+    ('pnl', np.float64),         # net of commission
+    ('commission', np.float64)   # entry plus exit
+])
+
+def empty_trade_log(length: int = 0) -> np.ndarray:
+    """
+    Allocate a trade log
+
+    Args:
+        length: Number of trades
+
+    Returns:
+        np.ndarray: Zeroed structured array of TRADE_DTYPE
+    """
+    return np.zeros(length, dtype=TRADE_DTYPE)
+
+def trade_summary(trade_log: np.ndarray, open_trades: int = 0) -> Dict[str, Any]:
+    """
+    Aggregate trade statistics in the nested layout of backtrader's TradeAnalyzer
+
+    Args:
+        trade_log: Closed trades
+        open_trades: Trades still open at the end of the backtest
+
+    Returns:
+        Dict[str, Any]: 'total', 'won', 'lost' and 'pnl' (gross and net) sections
+    """
+    net = trade_log['pnl']
+    gross = net + trade_log['commission']
+    closed = len(trade_log)
+    won = int((net > 0).sum())
+    return {
+        'total': {'total': closed + open_trades, 'open': open_trades, 'closed': closed},
+        'won': {'total': won},
+        'lost': {'total': closed - won},
+        'pnl': {
+            'gross': {'total': float(gross.sum()), 'average': float(gross.mean()) if closed else 0.0},
+            'net': {'total': float(net.sum()), 'average': float(net.mean()) if closed else 0.0}
+        }
+    }
+
+def trade_records(trade_log: np.ndarray, dates: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Closed trades as a list of dictionaries with ISO dates, for reports and JSON output
+
+    Args:
+        trade_log: Closed trades
+        dates: Bar timestamps of the result
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per trade
+    """
+    labels = np.datetime_as_string(np.asarray(dates, dtype='datetime64[s]'), unit='s')
+    return [
+        {
+            'entry_date': str(labels[trade['entry_idx']]),
+            'exit_date': str(labels[trade['exit_idx']]),
+            'entry_price': float(trade['entry_price']),
+            'exit_price': float(trade['exit_price']),
+            'size': float(trade['size']),
+            'pnl': float(trade['pnl']),
+            'commission': float(trade['commission'])
+        }
+        for trade in trade_log
+    ]
+
+def backtest_result(strategy_name: str, dates: np.ndarray, equity: np.ndarray, trade_log: np.ndarray,
+                    initial_capital: float, open_trades: int = 0,
+                    pruned: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the backtest result dictionary from the daily equity and the trade log
+
+    Args:
+        strategy_name: Strategy name
+        dates: Bar timestamps (datetime64, local wall-clock time)
+        equity: Portfolio value at each bar's close
+        trade_log: Closed trades (TRADE_DTYPE)
+        initial_capital: Starting cash
+        open_trades: Trades still open at the end of the backtest
+        pruned: For runs stopped early: {'reason', 'bar', 'date'} of the stop
+
+    Returns:
+        Dict[str, Any]: Summary metrics plus 'trades' (aggregate statistics), 'trade_log',
+                        'equity', 'dates' and 'pruned' (None for complete runs)
+    """
+    dates = np.asarray(dates, dtype='datetime64[s]')
+    equity = np.asarray(equity, dtype=np.float64)
+
+    metrics = equity_metrics(equity, initial_capital=initial_capital, years=years_between(dates) or 1 / 365)
+
+    closed = len(trade_log)
+    won = int((trade_log['pnl'] > 0).sum())
+    return {
+        'strategy_name': strategy_name,
+        'total_return': metrics['total_return'],
+        'annual_return': metrics['cagr'],
+        'max_drawdown': metrics['max_drawdown'],
+        'sharpe_ratio': metrics['sharpe_ratio'],
+        'win_rate': won / closed if closed > 0 else 0,
+        'total_trades': closed,
+        'trades': trade_summary(trade_log, open_trades),
+        'trade_log': trade_log,
+        'equity': equity,
+        'dates': dates,
+        'pruned': pruned
+    }
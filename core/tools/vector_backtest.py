@@ -0,0 +1,344 @@
+"""
+Vectorized backtest module
+Alternative to the backtrader engine for rule-based strategies: entry/exit rules are
+evaluated as boolean arrays over precomputed indicator columns and positions are
+derived with a vectorized long-only state machine. Strategies with stops, or runs with
+slippage, go through the per-bar path kernel instead
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+from utils.logger import setup_logger
+from config.settings import INITIAL_CAPITAL, COMMISSION_RATE, POSITION_SIZE
+from core.tools.indicator_registry import required_indicators, strategy_columns, compute_indicators
+from core.tools.rule_compiler import compile_strategy_rules
+from core.tools.pruning import PruningConstraints
+from core.tools.path_kernel import simulate_path, strategy_stops
+from core.tools.trade_log import empty_trade_log, backtest_result
+
+logger = setup_logger(__name__)
+
+# bump when a change to the simulation alters results, so cached ones are not reused
+ENGINE_VERSION = '3'
+
+def _ffill(values: np.ndarray, initial: float = 0.0) -> np.ndarray:
+    """Forward-fill NaN values of a 1-D array, using initial before the first value"""
+    positions = np.where(~np.isnan(values), np.arange(len(values)), -1)
+    np.maximum.accumulate(positions, out=positions)
+    filled = np.where(positions >= 0, values[np.maximum(positions, 0)], initial)
+    return filled
+
+def _crossover(current: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """1 where current crosses above reference, -1 where it crosses below, 0 otherwise (as the backtrader strategy)"""
+    prev_current = np.roll(current, 1)
+    prev_reference = np.roll(reference, 1)
+    up = (current > reference) & (prev_current <= prev_reference)
+    down = (current < reference) & (prev_current >= prev_reference)
+    signal = np.where(up, 1.0, np.where(down, -1.0, 0.0))
+    signal[0] = 0.0
+    return signal
+
+def positions_from_signals(entry: np.ndarray, exit_: np.ndarray) -> np.ndarray:
+    """
+    Long-only state machine without a per-bar loop
+
+    The state after bar t is: entry[t] when flat, not exit[t] when long. Bars with
+    only an entry (or only an exit) set the state outright; bars with both toggle it,
+    so the state is the last outright value flipped once per toggle since then.
+
+    Args:
+        entry: Boolean entry mask
+        exit_: Boolean exit mask
+
+    Returns:
+        np.ndarray: 1 while long, 0 while flat (state decided at each bar's close)
+    """
+    set_long = entry & ~exit_
+    set_flat = exit_ & ~entry
+    toggle = entry & exit_
+
+    base = _ffill(np.where(set_long, 1.0, np.where(set_flat, 0.0, np.nan)), initial=0.0)
+    toggles = np.cumsum(toggle)
+    toggles_at_base = _ffill(np.where(set_long | set_flat, toggles, np.nan), initial=0.0)
+    parity = (toggles - toggles_at_base).astype(np.int64) % 2
+    return (base.astype(np.int64) ^ parity).astype(np.int8)
+
+class VectorBacktestEngine:
+    def __init__(self, initial_capital: float = INITIAL_CAPITAL,
+                 commission: float = COMMISSION_RATE,
+                 position_size: float = POSITION_SIZE,
+                 warmup: Optional[int] = None,
+                 pruning: Optional[PruningConstraints] = None,
+                 slippage: float = 0.0,
+                 close_at_end: bool = False):
+        """
+        Initialize vectorized backtest engine
+
+        Args:
+            initial_capital: Starting cash
+            commission: Commission as a fraction of traded value, charged on entry and exit
+            position_size: Fraction of cash committed per trade (as PercentSizer in the backtrader engine)
+            warmup: Leading bars on which rules never fire; None uses the strategy's longest
+                    indicator period (as the backtrader strategy). Use 0 when the indicator
+                    columns were computed on earlier history, e.g. for out-of-sample windows
+            pruning: Stop at the first bar where the run can no longer be satisfactory and
+                     return the partial result (marked in 'pruned'), None to always run to the end
+            slippage: Fill price slippage as a fraction of the open (e.g. SLIPPAGE), as
+                      backtrader's set_slippage_perc
+            close_at_end: Exit a position still open at the end with an exit signal on the
+                          second to last bar (filled at the last bar's open, with commission
+                          and a trade record), and open no new one there
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.position_size = position_size
+        self.warmup = warmup
+        self.pruning = pruning
+        self.slippage = slippage
+        self.close_at_end = close_at_end
+        self.data = None
+        self.strategy_config = None
+        self.rules = None
+
+    def set_data(self, data: pd.DataFrame) -> None:
+        """
+        Set backtest data
+
+        Args:
+            data: DataFrame containing historical prices and technical indicators
+        """
+        if data is None or len(data) == 0:
+            logger.error("No data provided for backtest")
+            raise ValueError("No data provided for backtest")
+
+        data = data.copy(deep=False)
+        # OHLCV and datetime lowercase, indicator columns uppercase (as calculate_indicators)
+        data.columns = [col.lower() if col.lower() in ('open', 'high', 'low', 'close', 'volume', 'datetime') else col.upper()
+                        for col in data.columns]
+
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        if not all(col in data.columns for col in required_columns):
+            logger.error(f"Missing required columns. Required: {required_columns}, Got: {data.columns.tolist()}")
+            raise ValueError("Backtest data must contain OHLCV data")
+        if data[required_columns].isnull().any().any():
+            raise ValueError("Data contains null values")
+
+        self.data = data
+
+    def add_strategy(self, strategy_config: Dict[str, Any]) -> None:
+        """
+        Add strategy
+
+        Args:
+            strategy_config: Strategy configuration dictionary
+        """
+        logger.info(f"Adding strategy: {strategy_config.get('name', 'Unnamed Strategy')}")
+        if isinstance(strategy_config['rule'], str):
+            # if string format, convert to list format (as the backtrader engine)
+            strategy_config['rule'] = [
+                {"type": "entry", "expr": strategy_config['rule']},
+                {"type": "exit", "expr": strategy_config['rule'].replace('>', '<')}
+            ]
+        self.strategy_config = strategy_config
+        # parse and validate once; rejects names outside the strategy and non-rule syntax
+        self.rules = compile_strategy_rules(strategy_config)
+
+    def _times(self) -> pd.DatetimeIndex:
+        if 'datetime' in self.data.columns:
+            times = self.data['datetime']
+            return pd.DatetimeIndex(times if pd.api.types.is_datetime64_any_dtype(times) else pd.to_datetime(times))
+        if isinstance(self.data.index, pd.DatetimeIndex):
+            return self.data.index
+        return pd.DatetimeIndex(pd.to_datetime(self.data.index))
+
+    def build_rule_values(self) -> Dict[str, np.ndarray]:
+        """
+        Build the arrays the strategy rules refer to: close, indicators and CrossOver_* signals
+
+        Returns:
+            Dict[str, np.ndarray]: Name -> values, NaN during indicator warm-up
+        """
+        strategy = self.strategy_config
+        data = compute_indicators(self.data, required_indicators(strategy))
+        columns = strategy_columns(strategy)
+
+        close = data['close'].to_numpy(dtype=np.float64)
+        values = {'close': close}
+        for name, column in columns.items():
+            if name == 'MACD_HIST':
+                continue
+            values[name] = data[column].to_numpy(dtype=np.float64)
+
+        for name in strategy['indicators']:
+            if name == 'MACD':
+                values['CrossOver_MACD'] = _crossover(values['MACD'], values['MACD_SIGNAL'])
+            elif name in values:
+                values[f"CrossOver_{name}"] = _crossover(close, values[name])
+        return values
+
+    def _warmup_mask(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Bars on which rules may be evaluated: indicators ready and past the strategy's longest period"""
+        params = self.strategy_config.get('params', {})
+        min_period = self.warmup if self.warmup is not None else max(
+            params.get('SMA', {}).get('period', 0),
+            params.get('EMA', {}).get('period', 0),
+            params.get('ADX', {}).get('period', 0),
+            params.get('RSI', {}).get('period', 0),
+            params.get('MACD', {}).get('period_me1', 0),
+            params.get('MACD', {}).get('period_me2', 0),
+            params.get('MACD', {}).get('period_signal', 0)
+        )
+        length = len(values['close'])
+        ready = np.arange(length) >= min_period
+        for name, series in values.items():
+            if not name.startswith('CrossOver_'):
+                ready &= ~np.isnan(series)
+        # the first ready bar has no previous values, so no crossover (as the backtrader strategy)
+        first_ready = np.argmax(ready) if ready.any() else length
+        for name in values:
+            if name.startswith('CrossOver_') and first_ready < length:
+                values[name][first_ready] = 0.0
+        return ready
+
+    def run_backtest(self) -> Dict[str, Any]:
+        """
+        Run backtest
+
+        Signals are evaluated on each bar's close and filled at the next bar's open,
+        as market orders in the backtrader engine.
+
+        Returns:
+            Dict[str, Any]: Backtest results with the same keys as BacktestEngine.run_backtest
+        """
+        stops = strategy_stops(self.strategy_config)
+        if self.slippage or any(stops.values()):
+            # exits that depend on the path since entry need the per-bar kernel
+            return self._simulate_path(*self.signal_masks(), stops)
+        return self._simulate(self.signal_state())
+
+    def signal_masks(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Entry and exit signals decided at each bar's close
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (entry, exit, ready) boolean masks;
+                entry and exit are False on bars that are not ready
+        """
+        values = self.build_rule_values()
+        ready = self._warmup_mask(values)
+
+        length = len(values['close'])
+        entry = self.rules['entry'].mask(values) & ready if self.rules['entry'] else np.zeros(length, dtype=bool)
+        exit_ = self.rules['exit'].mask(values) & ready if self.rules['exit'] else np.zeros(length, dtype=bool)
+        if self.close_at_end and length >= 2:
+            entry[-2] = False
+            exit_[-2] = True
+            ready[-2] = True
+        return entry, exit_, ready
+
+    def signal_state(self) -> np.ndarray:
+        """
+        Position state decided at each bar's close (before fills), without stops
+
+        Returns:
+            np.ndarray: 1 while the strategy wants to be long, 0 while flat
+        """
+        entry, exit_, _ = self.signal_masks()
+        return positions_from_signals(entry, exit_)
+
+    def _local_dates(self) -> np.ndarray:
+        """Bar timestamps in local wall-clock time"""
+        times = self._times()
+        return (times.tz_localize(None) if times.tz is not None else times).values
+
+    def _simulate_path(self, entry: np.ndarray, exit_: np.ndarray, ready: np.ndarray,
+                       stops: Dict[str, float]) -> Dict[str, Any]:
+        """Simulate bar by bar with the path kernel (stops, take-profit, slippage)"""
+        data = self.data
+        path = simulate_path(
+            data['open'].to_numpy(dtype=np.float64), data['high'].to_numpy(dtype=np.float64),
+            data['low'].to_numpy(dtype=np.float64), data['close'].to_numpy(dtype=np.float64),
+            entry, exit_, ready,
+            initial_capital=self.initial_capital, position_size=self.position_size,
+            commission=self.commission, slippage=self.slippage,
+            trailing_percent=stops['trailing_percent'], profit_take=stops['profit_take'])
+        return self._result(self._local_dates(), path['equity'], path['trade_log'],
+                            path['in_trade'].astype(bool), path['open_trades'])
+
+    def _simulate(self, state: np.ndarray) -> Dict[str, Any]:
+        """Turn the position state into fills, trades and an equity curve"""
+        data = self.data
+        open_ = data['open'].to_numpy(dtype=np.float64)
+        close = data['close'].to_numpy(dtype=np.float64)
+        length = len(close)
+
+        # orders decided on bar t fill at the open of bar t + 1; orders on the last bar never fill
+        change = np.diff(state.astype(np.int8), prepend=0)
+        signal_bars = np.flatnonzero(change[:-1] != 0)
+        entry_signals = signal_bars[change[signal_bars] > 0]
+        exit_signals = signal_bars[change[signal_bars] < 0]
+        entry_fills = entry_signals + 1
+        exit_fills = exit_signals + 1
+        trade_count = len(entry_fills)
+        closed_count = len(exit_fills)
+
+        # position size depends on cash, and cash only changes when a trade closes,
+        # so the cash path is a cumulative product of per-trade growth factors
+        entry_price = open_[entry_fills]
+        exit_price = open_[exit_fills]
+        size_per_cash = self.position_size / close[entry_signals]
+        growth = np.ones(trade_count)
+        growth[:closed_count] = 1 + size_per_cash[:closed_count] * (
+            exit_price - entry_price[:closed_count]
+            - self.commission * (entry_price[:closed_count] + exit_price)
+        )
+        cash_before = self.initial_capital * np.concatenate(([1.0], np.cumprod(growth)))[:trade_count]
+        size = cash_before * size_per_cash
+        entry_commission = size * entry_price * self.commission
+        exit_commission = size[:closed_count] * exit_price * self.commission
+        gross_pnl = size[:closed_count] * (exit_price - entry_price[:closed_count])
+        net_pnl = gross_pnl - entry_commission[:closed_count] - exit_commission
+
+        # equity: cash while flat, cash + marked position while long
+        fills = np.zeros(length, dtype=np.int64)
+        fills[entry_fills] += 1
+        fills[exit_fills] += 1
+        trade_index = np.cumsum(fills)  # odd while a trade is open
+        in_trade = (trade_index % 2) == 1
+        current_trade = np.clip((trade_index - 1) // 2, 0, max(trade_count - 1, 0))
+        cash_after_close = self.initial_capital * np.concatenate(([1.0], np.cumprod(growth[:closed_count])))
+        flat_cash = cash_after_close[np.minimum(trade_index // 2, closed_count)]
+        equity = flat_cash.astype(np.float64)
+        if trade_count:
+            cash_in_trade = cash_before - size * entry_price - entry_commission
+            equity = np.where(in_trade, cash_in_trade[current_trade] + size[current_trade] * close, flat_cash)
+
+        trade_log = empty_trade_log(closed_count)
+        trade_log['entry_idx'] = entry_fills[:closed_count]
+        trade_log['exit_idx'] = exit_fills
+        trade_log['entry_price'] = entry_price[:closed_count]
+        trade_log['exit_price'] = exit_price
+        trade_log['size'] = size[:closed_count]
+        trade_log['pnl'] = net_pnl
+        trade_log['commission'] = entry_commission[:closed_count] + exit_commission
+
+        return self._result(self._local_dates(), equity, trade_log, in_trade, trade_count - closed_count)
+
+    def _result(self, dates: np.ndarray, equity: np.ndarray, trade_log: np.ndarray,
+                in_trade: np.ndarray, open_trades: int) -> Dict[str, Any]:
+        """Build the result, cut at the first bar that breaches the pruning constraints"""
+        pruned = None
+        if self.pruning is not None:
+            closed_by_bar = np.cumsum(np.bincount(trade_log['exit_idx'], minlength=len(equity)))
+            stop, reason = self.pruning.first_breach(equity, closed_by_bar, in_trade.astype(np.int64))
+            if stop is not None:
+                # keep what the run would have produced up to the bar it was stopped on
+                pruned = {'reason': reason, 'bar': stop, 'date': str(np.datetime64(dates[stop], 's'))}
+                trade_log = trade_log[trade_log['exit_idx'] <= stop]
+                open_trades = int(in_trade[stop])
+                equity = equity[:stop + 1]
+                dates = dates[:stop + 1]
+
+        return backtest_result(self.strategy_config['name'], dates, equity, trade_log,
+                               self.initial_capital, open_trades=open_trades, pruned=pruned)
@@ -0,0 +1,298 @@
+"""
+Walk-forward analysis module
+Optimize strategy parameters on each in-sample window, evaluate them on the following
+out-of-sample window, and stitch the out-of-sample equity curves together. Indicator
+columns are computed once on the full history and sliced per window; windows are
+independent and run in parallel.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+from utils.logger import setup_logger
+from config.settings import (
+    INITIAL_CAPITAL,
+    OPTIMIZER_OBJECTIVE,
+    WALK_FORWARD_TRAIN_BARS,
+    WALK_FORWARD_TEST_BARS,
+    WALK_FORWARD_ANCHORED,
+    WALK_FORWARD_MAX_WORKERS,
+    WALK_FORWARD_LOOKBACK_DAYS,
+    SHARED_MEMORY_TRANSPORT
+)
+from core.tools.indicators_process import get_historical_data, calculate_indicators
+from core.tools.optimizer import ParamRange, apply_params, grid_space, random_space, prepare_optimizer_data, optimize
+from core.tools.vector_backtest import VectorBacktestEngine
+from core.tools.trade_log import empty_trade_log, backtest_result
+from core.tools.backtest import evaluate_backtest, generate_live_signal, build_quant_report
+from core.data.shared_frame import SharedFrame, SharedFrameHandle, resolve_frame
+
+logger = setup_logger(__name__)
+
+# state shared with worker processes, set once per worker by the pool initializer
+_worker_state = {}
+
+def _init_worker(data: Union[pd.DataFrame, SharedFrameHandle], template: Dict[str, Any],
+                 options: Dict[str, Any]) -> None:
+    _worker_state.update(data=resolve_frame(data), template=template, options=options)
+
+def walk_forward_windows(length: int,
+                         train_bars: int = WALK_FORWARD_TRAIN_BARS,
+                         test_bars: int = WALK_FORWARD_TEST_BARS,
+                         anchored: bool = WALK_FORWARD_ANCHORED,
+                         step: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+    """
+    Split bar positions into consecutive in-sample / out-of-sample windows
+
+    Args:
+        length: Number of bars
+        train_bars: In-sample bars (the first window's length when anchored)
+        test_bars: Out-of-sample bars per window
+        anchored: Train windows all start at bar 0 and grow, instead of rolling
+        step: Bars between window starts, defaults to test_bars; it must not be smaller than
+              test_bars, overlapping test windows would count their common bars twice when stitched
+
+    Returns:
+        List[Tuple[int, int, int, int]]: (train_start, train_end, test_start, test_end), ends exclusive
+    """
+    step = step or test_bars
+    if step < test_bars:
+        raise ValueError(f"Walk-forward step ({step}) must be at least test_bars ({test_bars}), "
+                         f"otherwise the out-of-sample windows overlap")
+    windows = []
+    train_end = train_bars
+    while train_end < length:
+        test_end = min(train_end + test_bars, length)
+        train_start = 0 if anchored else train_end - train_bars
+        windows.append((train_start, train_end, train_end, test_end))
+        train_end += step
+    return windows
+
+def _run_window(window: Tuple[int, int, int, int]) -> Dict[str, Any]:
+    """Optimize on the in-sample slice, then backtest the best params out of sample"""
+    data, template, options = _worker_state['data'], _worker_state['template'], _worker_state['options']
+    train_start, train_end, test_start, test_end = window
+    outcome = {'window': window, 'best_params': None, 'in_sample_score': float('nan'), 'oos': None, 'error': None}
+    try:
+        # no pruning: the window needs its best complete run even when none is satisfactory
+        search = optimize(data.iloc[train_start:train_end], template, options['space'],
+                          method=options['method'], n_iter=options['n_iter'], seed=options['seed'],
+                          objective=options['objective'], initial_capital=options['initial_capital'],
+                          max_workers=1, prune=False)
+        if search['best_strategy'] is None:
+            raise ValueError("No valid parameter set in the in-sample window")
+        outcome['best_params'] = search['best_params']
+        outcome['in_sample_score'] = float(search['table'].loc[0, 'score'])
+
+        # indicators in the test slice were computed on the full history, so no warm-up is needed;
+        # a position still open at the window end is closed there, not carried into the next window
+        engine = VectorBacktestEngine(initial_capital=options['initial_capital'], warmup=0, close_at_end=True)
+        engine.set_data(data.iloc[test_start:test_end])
+        engine.add_strategy(search['best_strategy'])
+        outcome['oos'] = engine.run_backtest()
+    except Exception as e:
+        logger.error(f"Walk-forward window {window} failed: {str(e)}")
+        outcome['error'] = str(e)
+    return outcome
+
+def stitch_out_of_sample(outcomes: List[Dict[str, Any]], strategy_name: str,
+                         initial_capital: float = INITIAL_CAPITAL) -> Dict[str, Any]:
+    """
+    Chain the out-of-sample results: each window starts with the capital the previous one ended with
+
+    Position sizing is proportional to cash, so scaling a window's equity and trades by
+    its starting capital gives the same result as running it with that capital. Windows
+    end flat (see _run_window), so only cash is carried from one window to the next.
+
+    Args:
+        outcomes: Window results in chronological order
+        strategy_name: Name reported in the results
+        initial_capital: Capital at the start of the first window
+
+    Returns:
+        Dict[str, Any]: Backtest results with the same keys as the backtest engines, plus
+                        'failed_windows': windows without a result, whose dates the stitched
+                        curve skips (empty when the results cover every window)
+    """
+    capital = initial_capital
+    date_parts, equity_parts, log_parts = [], [], []
+    failed_windows = []
+    offset = 0
+    for outcome in outcomes:
+        result = outcome['oos']
+        if result is None:
+            failed_windows.append(outcome['window'])
+            continue
+        scale = capital / initial_capital
+        equity = result['equity'] * scale
+        trade_log = result['trade_log'].copy()
+        for field in ('size', 'pnl', 'commission'):
+            trade_log[field] *= scale
+        trade_log['entry_idx'] += offset
+        trade_log['exit_idx'] += offset
+        date_parts.append(result['dates'])
+        equity_parts.append(equity)
+        log_parts.append(trade_log)
+        offset += len(equity)
+        capital = float(equity[-1])
+
+    if not equity_parts:
+        stitched = backtest_result(strategy_name, np.array([], dtype='datetime64[s]'), np.array([], dtype=np.float64),
+                                   empty_trade_log(), initial_capital)
+    else:
+        stitched = backtest_result(strategy_name, np.concatenate(date_parts), np.concatenate(equity_parts),
+                                   np.concatenate(log_parts), initial_capital)
+    stitched['failed_windows'] = failed_windows
+    return stitched
+
+def walk_forward(data: pd.DataFrame,
+                 template: Dict[str, Any],
+                 space: Dict[str, ParamRange],
+                 train_bars: int = WALK_FORWARD_TRAIN_BARS,
+                 test_bars: int = WALK_FORWARD_TEST_BARS,
+                 anchored: bool = WALK_FORWARD_ANCHORED,
+                 step: Optional[int] = None,
+                 method: str = 'grid',
+                 n_iter: int = 50,
+                 seed: Optional[int] = None,
+                 objective: str = OPTIMIZER_OBJECTIVE,
+                 initial_capital: float = INITIAL_CAPITAL,
+                 max_workers: Optional[int] = WALK_FORWARD_MAX_WORKERS) -> Dict[str, Any]:
+    """
+    Run a walk-forward analysis of a strategy template
+
+    Args:
+        data: Data with lowercase OHLCV columns (e.g. from calculate_indicators)
+        template: Strategy template (see core.tools.optimizer.apply_params)
+        space: Parameter space searched in every in-sample window
+        train_bars: In-sample bars per window
+        test_bars: Out-of-sample bars per window
+        anchored: Anchored (expanding) instead of rolling in-sample windows
+        step: Bars between windows, defaults to test_bars
+        method: 'grid' or 'random' search
+        n_iter: Number of random parameter sets
+        seed: Random seed
+        objective: Metric optimized in-sample
+        initial_capital: Capital at the start of the first out-of-sample window
+        max_workers: Worker processes for the windows; None uses the CPU count, 1 runs in-process
+
+    Returns:
+        Dict[str, Any]: {'windows': per-window table, 'oos_result': stitched out-of-sample results,
+                         'oos_evaluation': evaluate_backtest of the stitched results (never satisfactory
+                         when a window failed), 'incomplete': whether any window failed, 'elapsed': seconds}
+    """
+    windows = walk_forward_windows(len(data), train_bars, test_bars, anchored, step)
+    if not windows:
+        raise ValueError(f"Not enough data for walk-forward: {len(data)} bars, {train_bars} in-sample bars required")
+
+    started = time.perf_counter()
+    # every indicator column any parameter set needs, computed once on the full history
+    param_sets = grid_space(space) if method == 'grid' else random_space(space, n_iter, seed)
+    data = prepare_optimizer_data(data, template, param_sets)
+
+    options = {'space': space, 'method': method, 'n_iter': n_iter, 'seed': seed,
+               'objective': objective, 'initial_capital': initial_capital}
+    workers = min(max_workers or os.cpu_count() or 1, len(windows))
+    logger.info(f"Walk-forward {template.get('name', 'Unnamed Strategy')}: {len(windows)} windows "
+                f"({'anchored' if anchored else 'rolling'}, {train_bars}/{test_bars} bars), {workers} workers")
+    if workers <= 1:
+        _init_worker(data, template, options)
+        outcomes = [_run_window(window) for window in windows]
+    else:
+        shared = SharedFrame(data) if SHARED_MEMORY_TRANSPORT else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.handle if shared is not None else data, template, options)) as pool:
+                outcomes = list(pool.map(_run_window, windows))
+        finally:
+            if shared is not None:
+                shared.close()
+
+    rows = []
+    for outcome in outcomes:
+        train_start, train_end, test_start, test_end = outcome['window']
+        oos = outcome['oos'] or {}
+        rows.append({
+            'train_start': str(data['datetime'].iloc[train_start]) if 'datetime' in data.columns else train_start,
+            'test_start': str(data['datetime'].iloc[test_start]) if 'datetime' in data.columns else test_start,
+            'test_end': str(data['datetime'].iloc[test_end - 1]) if 'datetime' in data.columns else test_end - 1,
+            'best_params': outcome['best_params'],
+            'in_sample_score': outcome['in_sample_score'],
+            'oos_return': oos.get('total_return', float('nan')),
+            'oos_sharpe': oos.get('sharpe_ratio', float('nan')),
+            'oos_max_drawdown': oos.get('max_drawdown', float('nan')),
+            'oos_trades': oos.get('total_trades', 0),
+            'error': outcome['error']
+        })
+
+    oos_result = stitch_out_of_sample(outcomes, f"{template.get('name', 'Unnamed Strategy')} (walk-forward OOS)",
+                                      initial_capital)
+    oos_evaluation = evaluate_backtest(oos_result)
+    failed = oos_result['failed_windows']
+    if failed:
+        # the stitched curve skips the failed windows' dates, so it does not cover the whole period
+        logger.warning(f"Walk-forward out-of-sample results are incomplete: {len(failed)} of {len(windows)} windows failed")
+        oos_evaluation.setdefault('conclusion', {}).setdefault('weaknesses', []).append(
+            f"{len(failed)} of {len(windows)} walk-forward windows failed, out-of-sample results are incomplete")
+        oos_evaluation['is_satisfactory'] = False
+    elapsed = time.perf_counter() - started
+    logger.info(f"Walk-forward finished in {elapsed:.2f}s, OOS return {oos_result['total_return']:.2%}")
+    return {
+        'windows': pd.DataFrame(rows),
+        'oos_result': oos_result,
+        'oos_evaluation': oos_evaluation,
+        'incomplete': bool(failed),
+        'elapsed': elapsed
+    }
+
+def walk_forward_analysis(symbol: str,
+                          template: Dict[str, Any],
+                          space: Dict[str, ParamRange],
+                          lookback_days: int = WALK_FORWARD_LOOKBACK_DAYS,
+                          **kwargs) -> Dict[str, Any]:
+    """
+    Walk-forward counterpart of quant_analysis: the report and is_satisfactory are based
+    on the stitched out-of-sample results instead of a single in-sample backtest
+
+    Args:
+        symbol: Asset symbol
+        template: Strategy template
+        space: Parameter space searched in every in-sample window
+        lookback_days: Calendar days of history to load
+        **kwargs: Further walk_forward options (train_bars, test_bars, anchored, ...)
+
+    Returns:
+        Dict[str, Any]: quant_analysis-style report plus 'walk_forward' window records
+    """
+    try:
+        historical_data = get_historical_data(symbol, lookback_days=lookback_days)
+        if historical_data is None:
+            raise ValueError(f"Failed to get historical data for asset {symbol}")
+        data = calculate_indicators(historical_data, template)
+        if data is None:
+            raise ValueError("Failed to calculate technical indicators")
+
+        result = walk_forward(data, template, space, **kwargs)
+        # the live signal uses the parameters chosen on the most recent in-sample window
+        latest_params = next((params for params in reversed(result['windows']['best_params'].tolist()) if params), {})
+        strategy = apply_params(template, latest_params)
+        try:
+            live_signal = generate_live_signal(calculate_indicators(historical_data, strategy), strategy)
+        except Exception as e:
+            logger.warning(f"Failed to get real-time trading signal: {str(e)}")
+            live_signal = "HOLD"  # Default hold
+        report = build_quant_report(symbol, strategy, live_signal, result['oos_evaluation'])
+        report['latest_params'] = latest_params
+        report['walk_forward'] = result['windows'].to_dict(orient='records')
+        return report
+
+    except Exception as e:
+        logger.error(f"Failed to run walk-forward analysis: {str(e)}")
+        return {
+            'status': 'error',
+            'symbol': symbol,
+            'error': str(e)
+        }
@@ -1,4 +1,4 @@
-from typing import TypedDict, Annotated, Sequence, Dict, Any, NotRequired, Optional
+from typing import TypedDict, Annotated, Sequence, Dict, Any, List, NotRequired, Optional
 from langgraph.graph import Graph, StateGraph
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import pandas as pd
@@ -8,6 +8,8 @@ from core.agents.function_call_agent import function_call_agent
 from core.tools.finance_market_sentiment_analyse import analyze_market_sentiment
 from core.tools.strategy_generation import generate_strategy
 from core.tools.backtest import quant_analysis
+from core.tools.strategy_tournament import strategy_tournament
+from config.settings import STRATEGY_SELECTION_MODE, TOURNAMENT_OBJECTIVE
 import json
 
 # Configure logging
@@ -55,6 +57,7 @@ class WorkflowState(TypedDict, total=False):
     # === Backtest related ===
     trading_strategy:  NotRequired[Dict[str, Any]]            
     quant_analysis:  NotRequired[Dict[str, Any]]       
+    strategy_tournament: NotRequired[List[Dict[str, Any]]]  # ranked candidates, best first
 
     # === Market sentiment ===
     sentiment_analysis: NotRequired[Dict[str, Any]]
@@ -70,6 +73,19 @@ def create_workflow_graph() -> Graph:
     # Create workflow graph
     workflow = StateGraph(WorkflowState)
     
+    if STRATEGY_SELECTION_MODE == 'tournament':
+        # backtest every candidate in parallel and keep the best, no retry loop
+        workflow.add_node("run_strategy_tournament", strategy_tournament_node)
+        workflow.add_node("analyze_market_sentiment", analyze_market_sentiment_node)
+        workflow.add_node("generate_final_report", generate_final_report_node)
+        
+        workflow.add_edge("run_strategy_tournament", "analyze_market_sentiment")
+        workflow.add_edge("analyze_market_sentiment", "generate_final_report")
+        
+        workflow.set_entry_point("run_strategy_tournament")
+        workflow.set_finish_point("generate_final_report")
+        return workflow.compile()
+    
     # Define nodes
     workflow.add_node("generate_trading_strategy", generate_trading_strategy_node)
     workflow.add_node("run_quant_analysis", quant_analysis_node)
@@ -161,6 +177,33 @@ def quant_analysis_node(state: WorkflowState) -> WorkflowState:
         logger.error(f"Quantitative analysis error: {str(e)}")
         raise
 
+def strategy_tournament_node(state: WorkflowState) -> WorkflowState:
+    """Backtest all candidate strategies in parallel and select the best one"""
+    try:
+        logger.info("Running strategy tournament")
+        
+        # Check necessary state
+        if state.get('symbol') is None:
+            logger.error("Asset code not obtained")
+            raise ValueError("Asset code not obtained")
+        
+        result = strategy_tournament(state['symbol'], objective=TOURNAMENT_OBJECTIVE)
+        if result['strategy'] is None:
+            logger.error("Strategy tournament failed")
+            raise ValueError(result['report'].get('error', "Strategy tournament failed"))
+        
+        # Update state
+        state['trading_strategy'] = result['strategy']
+        state['quant_analysis'] = result['report']
+        state['strategy_tournament'] = result['table']
+        state['strategy_attempts'] = 1
+        logger.info(f"Strategy tournament completed, selected: {result['strategy']['name']}")
+        
+        return state
+    except Exception as e:
+        logger.error(f"Strategy tournament error: {str(e)}")
+        raise
+
 def analyze_market_sentiment_node(state: WorkflowState) -> WorkflowState:
     """Analyze market sentiment node"""
     try:
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import core.tools.backtest as backtest
+import core.tools.backtest_cache as backtest_cache
+from core.tools.backtest_cache import BacktestCache, fingerprint_data
+from core.tools.backtest import backtest_strategy, evaluate_backtest
+import test_helpers
+
+STRATEGY = {
+    'name': 'RSI Test',
+    'indicators': ['RSI'],
+    'params': {'RSI': {'period': 14}},
+    'rule': [
+        {'type': 'entry', 'expr': 'RSI < 40'},
+        {'type': 'exit', 'expr': 'RSI > 60'}
+    ]
+}
+
+def make_data(n=400, seed=11):
+    return test_helpers.make_data(n, seed, drift=0.0, start='2023-01-02', max_volume=2_000_000)
+
+def use_fresh_cache(disk_dir=None, max_entries=64):
+    backtest_cache._backtest_cache = BacktestCache(max_entries=max_entries, disk_dir=disk_dir)
+    return backtest_cache._backtest_cache
+
+def test_repeated_backtest_hits_cache():
+    cache = use_fresh_cache()
+    data = make_data()
+    first = backtest_strategy(data, dict(STRATEGY), engine='vector')
+    second = backtest_strategy(data, dict(STRATEGY), engine='vector')
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 1
+    assert second['cache_key'] == first['cache_key']
+    assert second['total_return'] == first['total_return']
+
+    # the evaluation report is memoized under the backtest's key
+    report = evaluate_backtest(first, monte_carlo_paths=200)
+    assert evaluate_backtest(second, monte_carlo_paths=200) == report
+    assert cache.stats()['hits'] == 2
+
+def test_key_changes_with_strategy_data_and_settings():
+    data = make_data()
+    fingerprint = fingerprint_data(data)
+    base = BacktestCache.make_key(STRATEGY, fingerprint, 100000.0, 0.001, 0.1, 'vector', '1')
+    # dict ordering does not matter
+    reordered = dict(reversed(list(STRATEGY.items())))
+    assert BacktestCache.make_key(reordered, fingerprint, 100000.0, 0.001, 0.1, 'vector', '1') == base
+
+    changed_params = dict(STRATEGY, params={'RSI': {'period': 10}})
+    changed_data = data.copy()
+    changed_data.loc[200, 'close'] *= 1.01
+    keys = [
+        BacktestCache.make_key(changed_params, fingerprint, 100000.0, 0.001, 0.1, 'vector', '1'),
+        BacktestCache.make_key(STRATEGY, fingerprint_data(changed_data), 100000.0, 0.001, 0.1, 'vector', '1'),
+        BacktestCache.make_key(STRATEGY, fingerprint, 50000.0, 0.001, 0.1, 'vector', '1'),
+        BacktestCache.make_key(STRATEGY, fingerprint, 100000.0, 0.002, 0.1, 'vector', '1'),
+        BacktestCache.make_key(STRATEGY, fingerprint, 100000.0, 0.001, 0.1, 'vector', '2'),
+        BacktestCache.make_key(STRATEGY, fingerprint, 100000.0, 0.001, 0.1, 'backtrader', '1')
+    ]
+    assert base not in keys and len(set(keys)) == len(keys)
+
+def test_key_changes_with_evaluation_settings(monkeypatch):
+    use_fresh_cache()
+    data = make_data()
+    first = backtest_strategy(data, dict(STRATEGY), engine='vector')
+    report = evaluate_backtest(first, monte_carlo_paths=0)
+    # a stricter threshold must not be answered from the cache
+    monkeypatch.setattr(backtest, 'SATISFACTORY_MIN_TRADES', 10_000)
+    second = backtest_strategy(data, dict(STRATEGY), engine='vector')
+    assert second['cache_key'] != first['cache_key']
+    assert not evaluate_backtest(second, monte_carlo_paths=0)['is_satisfactory']
+    monkeypatch.setattr(backtest, 'METRICS_VAR_LEVEL', 0.99)
+    assert backtest_strategy(data, dict(STRATEGY), engine='vector')['cache_key'] != second['cache_key']
+    assert 'is_satisfactory' in report
+
+def test_lru_eviction_and_disk_tier():
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = BacktestCache(max_entries=2, disk_dir=disk_dir)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, {'value': key})
+        assert cache.stats()['evictions'] == 1 and cache.stats()['entries'] == 2
+
+        # evicted from memory but still on disk
+        assert cache.get('a') == {'value': 'a'}
+        assert cache.stats()['disk_hits'] == 1
+
+        # a new process (fresh memory tier) reads the disk tier
+        restarted = BacktestCache(max_entries=2, disk_dir=disk_dir)
+        assert restarted.get('c') == {'value': 'c'}
+        restarted.clear(disk=True)
+        assert restarted.get('c') is None
+
+def test_disk_tier_is_bounded():
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = BacktestCache(max_entries=1, disk_dir=disk_dir, max_disk_entries=3)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, {'value': key})
+        os.utime(os.path.join(disk_dir, 'a.pkl'), (0, 0))
+        os.utime(os.path.join(disk_dir, 'b.pkl'), (1, 1))
+        # reading 'a' from disk marks it as recently used, so 'b' is the oldest file
+        assert cache.get('a') == {'value': 'a'}
+        cache.put('d', {'value': 'd'})
+        assert sorted(os.listdir(disk_dir)) == ['a.pkl', 'c.pkl', 'd.pkl']
+        assert cache.stats()['disk_evictions'] == 1 and cache.stats()['disk_entries'] == 3
+        # rewriting an existing key does not count as a new file
+        cache.put('d', {'value': 'd2'})
+        assert len(os.listdir(disk_dir)) == 3 and cache.stats()['disk_evictions'] == 1
+
+def test_cached_results_are_copies():
+    cache = BacktestCache(disk_dir=None)
+    cache.put('key', {'trades': [1, 2]})
+    cache.get('key')['trades'].append(3)
+    assert cache.get('key') == {'trades': [1, 2]}
+
+if __name__ == "__main__":
+    test_repeated_backtest_hits_cache()
+    test_key_changes_with_strategy_data_and_settings()
+    test_lru_eviction_and_disk_tier()
+    test_disk_tier_is_bounded()
+    test_cached_results_are_copies()
+    print("Backtest cache tests passed")
@@ -0,0 +1,111 @@
+import copy
+import numpy as np
+import pytest
+import core.tools.backtest as backtest
+from core.tools.backtest import BacktestEngine
+from core.tools.indicator_registry import required_indicators, compute_indicators
+from core.tools.vector_backtest import VectorBacktestEngine
+from core.tools.pruning import PruningConstraints
+import test_helpers
+
+STRATEGY = {
+    'name': 'RSI Test',
+    'indicators': ['RSI'],
+    'params': {'RSI': {'period': 14}},
+    'rule': [
+        {'type': 'entry', 'expr': 'RSI < 45'},
+        {'type': 'exit', 'expr': 'RSI > 55'}
+    ]
+}
+
+TREND = {
+    'name': 'ADX MACD Test',
+    'indicators': ['ADX', 'MACD'],
+    'params': {'ADX': {'period': 14}, 'MACD': {'period_me1': 12, 'period_me2': 26, 'period_signal': 9}},
+    'rule': [
+        {'type': 'entry', 'expr': 'ADX > 20 and MACD > MACD_SIGNAL'},
+        {'type': 'exit', 'expr': 'MACD < MACD_SIGNAL'}
+    ]
+}
+
+def make_data(n=300, seed=5):
+    return test_helpers.make_data(n, seed, drift=0.0, start='2023-01-02 09:30', tz='America/New_York',
+                                  max_volume=2_000_000)
+
+def run(data, **kwargs):
+    engine = BacktestEngine(**kwargs)
+    engine.set_data(data, required_indicators(STRATEGY))
+    engine.add_strategy(copy.deepcopy(STRATEGY))
+    return engine.run_backtest()
+
+def assert_same(a, b):
+    assert np.array_equal(a['equity'], b['equity'])
+    assert np.array_equal(a['trade_log'], b['trade_log'])
+    assert np.array_equal(a['dates'], b['dates'])
+    assert a['pruned'] == b['pruned']
+
+def test_fast_profile_matches_standard():
+    data = make_data()
+    standard = run(data, fast=False)
+    assert standard['total_trades'] > 0
+    assert_same(run(data, fast=True), standard)
+
+def test_bounded_buffers_match_and_prune_at_the_same_bar():
+    data = make_data()
+    pruning = PruningConstraints(max_drawdown=None, min_trades=run(data)['total_trades'] + 1)
+    standard = run(data, fast=False, pruning=pruning)
+    assert standard['pruned']['reason'] == 'min_trades'
+    min_bars = backtest.BACKTRADER_EXACTBARS_MIN_BARS
+    backtest.BACKTRADER_EXACTBARS_MIN_BARS = 0
+    try:
+        assert_same(run(data, fast=True, pruning=pruning), standard)
+    finally:
+        backtest.BACKTRADER_EXACTBARS_MIN_BARS = min_bars
+
+def test_only_requested_analyzers_are_attached():
+    data = make_data()
+    assert 'analyzers' not in run(data)
+    result = run(data, analyzers=['trades', 'drawdown'])
+    assert list(result['analyzers']) == ['trades', 'drawdown']
+    assert result['analyzers']['trades']['total']['closed'] == result['total_trades']
+    with pytest.raises(ValueError):
+        BacktestEngine(analyzers=['unknown'])
+
+def test_strategy_reads_indicator_columns_as_lines():
+    data = make_data()
+    engine = BacktestEngine(fast=False)
+    engine.set_data(data, required_indicators(TREND))
+    engine.add_strategy(copy.deepcopy(TREND))
+    result = engine.run_backtest()
+    assert result['total_trades'] > 0
+
+    frame = data.rename(columns=lambda col: col if col in ('datetime', 'open', 'high', 'low', 'close', 'volume') else col.upper())
+    frame = compute_indicators(frame, required_indicators(TREND))
+    feed = engine.cerebro.datas[0]
+    for column in ('ADX', 'MACD', 'MACD_SIGNAL'):
+        line = np.array(getattr(feed.lines, column.lower()).array)
+        assert np.allclose(line, frame[column].to_numpy(), equal_nan=True), column
+
+    # the vector engine evaluates the same rules on the frame columns directly
+    vector = VectorBacktestEngine()
+    vector.set_data(frame)
+    vector.add_strategy(copy.deepcopy(TREND))
+    expected = vector.run_backtest()['trade_log']
+    assert len(result['trade_log']) == len(expected)
+    assert np.array_equal(result['trade_log']['entry_idx'], expected['entry_idx'])
+    assert np.array_equal(result['trade_log']['exit_idx'], expected['exit_idx'])
+    assert np.allclose(result['trade_log']['pnl'], expected['pnl'])
+
+def test_missing_indicator_columns_are_rejected():
+    engine = BacktestEngine()
+    engine.set_data(make_data())
+    with pytest.raises(ValueError, match='missing indicator columns'):
+        engine.add_strategy(copy.deepcopy(TREND))
+
+if __name__ == "__main__":
+    test_fast_profile_matches_standard()
+    test_bounded_buffers_match_and_prune_at_the_same_bar()
+    test_only_requested_analyzers_are_attached()
+    test_strategy_reads_indicator_columns_as_lines()
+    test_missing_indicator_columns_are_rejected()
+    print("Backtrader profile tests passed")
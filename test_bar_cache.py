@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+import core.tools.indicators_process as indicators_process
+from core.data.bar_cache import BarCache
+from test_helpers import make_history
+
+HISTORY = make_history(60, seed=4, start='2024-01-01', freq='D', tz='America/New_York')
+
+class FakeFeed:
+    """Serves bars of HISTORY between two dates and records every request"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+        self.partial = {}
+
+    def __call__(self, symbol, start_date, end_date, interval):
+        self.calls.append((start_date, end_date))
+        if self.fail:
+            raise ConnectionError("provider unavailable")
+        bars = HISTORY[(HISTORY.index >= pd.Timestamp(start_date, tz=HISTORY.index.tz)) &
+                       (HISTORY.index < pd.Timestamp(end_date, tz=HISTORY.index.tz))].copy()
+        # the bar of the last day is still forming, with a close that changes later
+        for day, close in self.partial.items():
+            if day in bars.index:
+                bars.loc[day, 'Close'] = close
+        return bars
+
+@pytest.fixture(params=['parquet', 'pkl'])
+def feed(request, tmp_path, monkeypatch):
+    cache = BarCache(str(tmp_path))
+    cache.extension = request.param
+    fake = FakeFeed()
+    monkeypatch.setattr(indicators_process, 'get_bar_cache', lambda: cache)
+    monkeypatch.setattr(indicators_process, '_fetch_history', fake)
+    fake.cache = cache
+    return fake
+
+def load(start, end):
+    return indicators_process._get_cached_history('TEST', start, end, '1d')
+
+def test_cold_fill_then_warm_read_without_fetch(feed):
+    bars = load('2024-01-05', '2024-01-20')
+    assert feed.calls == [('2024-01-05', '2024-01-20')]
+    assert len(bars) == 15
+    assert feed.cache.load_meta('TEST', '1d')['start'] == '2024-01-05'
+
+    again = load('2024-01-05', '2024-01-20')
+    assert len(feed.calls) == 1
+    pd.testing.assert_frame_equal(again, bars, check_freq=False)
+
+def test_incremental_append_replaces_the_last_cached_bar(feed):
+    last_day = pd.Timestamp('2024-01-19', tz=HISTORY.index.tz)
+    feed.partial = {last_day: -1.0}
+    assert load('2024-01-05', '2024-01-20').loc[last_day, 'Close'] == -1.0
+
+    feed.partial = {}
+    bars = load('2024-01-05', '2024-01-25')
+    # the refresh starts at the last cached bar, which may have been partial
+    assert feed.calls[-1] == ('2024-01-19', '2024-01-25')
+    assert bars.index.is_unique and bars.index.is_monotonic_increasing
+    assert len(bars) == 20
+    assert bars.loc[last_day, 'Close'] == HISTORY.loc[last_day, 'Close']
+    assert feed.cache.load_meta('TEST', '1d')['end'] == '2024-01-25'
+
+def test_failed_incremental_fetch_serves_cached_bars(feed):
+    cached = load('2024-01-05', '2024-01-20')
+    feed.fail = True
+    bars = load('2024-01-05', '2024-01-25')
+    assert len(feed.calls) == 2
+    pd.testing.assert_frame_equal(bars, cached, check_freq=False)
+    # the cached range is unchanged, so the next call retries the refresh
+    assert feed.cache.load_meta('TEST', '1d')['end'] == '2024-01-20'
+
+def test_start_before_cached_range_refetches_everything(feed):
+    load('2024-01-10', '2024-01-20')
+    bars = load('2024-01-03', '2024-01-20')
+    assert feed.calls[-1] == ('2024-01-03', '2024-01-20')
+    assert bars.index[0] == pd.Timestamp('2024-01-03', tz=HISTORY.index.tz)
+    assert feed.cache.load_meta('TEST', '1d')['start'] == '2024-01-03'
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-q'])
@@ -0,0 +1,59 @@
+"""
+Shared test helpers
+Synthetic OHLCV bars and the parameterized strategy template used by the test modules
+"""
+
+import numpy as np
+import pandas as pd
+
+TEMPLATE = {
+    'name': 'Trend Template',
+    'indicators': ['SMA', 'ADX'],
+    'params': {'SMA': {'period': 50}, 'ADX': {'period': 14}},
+    'rule': [
+        {'type': 'entry', 'expr': 'CrossOver_SMA > 0 and ADX > {adx_threshold}'},
+        {'type': 'exit', 'expr': 'CrossOver_SMA < 0'}
+    ]
+}
+
+def make_data(n: int = 500, seed: int = 7, drift: float = 0.0003, volatility: float = 0.015,
+              start: str = '2022-01-03', freq: str = 'B', tz: str = None,
+              max_volume: int = 5_000_000) -> pd.DataFrame:
+    """
+    Synthetic bars in the backtest engine layout
+
+    Args:
+        n: Number of bars
+        seed: Random seed
+        drift: Mean log return per bar
+        volatility: Standard deviation of the log returns
+        start: First timestamp
+        freq: Bar frequency ('B' for equities, 'D' for crypto)
+        tz: Time zone of the timestamps, None for naive
+        max_volume: Upper bound of the random volume
+
+    Returns:
+        pd.DataFrame: Lowercase OHLCV columns and a 'datetime' column
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, volatility, n)))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        'datetime': pd.date_range(start, periods=n, freq=freq, tz=tz),
+        'open': open_,
+        'high': np.maximum(open_, close) * 1.005,
+        'low': np.minimum(open_, close) * 0.995,
+        'close': close,
+        'volume': rng.integers(1_000_000, max_volume, n).astype(float)
+    })
+
+def make_history(n: int = 500, seed: int = 7, **kwargs) -> pd.DataFrame:
+    """
+    The bars of make_data in the get_historical_data layout
+
+    Returns:
+        pd.DataFrame: Capitalized OHLCV columns on a 'Date' index
+    """
+    data = make_data(n, seed, **kwargs)
+    data = data.rename(columns={col: col.capitalize() for col in data.columns if col != 'datetime'})
+    return data.set_index(pd.DatetimeIndex(data.pop('datetime'), name='Date'))
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from core.tools.indicator_cache import IndicatorCache, fingerprint_bars
+from test_helpers import make_data
+
+def column(n=1000, value=1.0):
+    return {'SMA_20': np.full(n, value)}
+
+def test_hit_and_miss_counters():
+    cache = IndicatorCache(max_bytes=1 << 20, disk_dir=None)
+    key = IndicatorCache.make_key('bars', 'SMA', {'period': 20})
+    assert cache.get(key) is None
+    stored = cache.put(key, column())
+    cached = cache.get(key)
+    assert cached['SMA_20'] is stored['SMA_20']
+    # cached arrays are shared, so they are read-only
+    with pytest.raises(ValueError):
+        cached['SMA_20'][0] = 0.0
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+    assert stats['bytes'] == 8000
+
+    cache.clear()
+    assert cache.stats()['hits'] == 0 and cache.get(key) is None
+
+def test_byte_bounded_lru_eviction():
+    # room for two 8000-byte entries
+    cache = IndicatorCache(max_bytes=20_000, disk_dir=None)
+    cache.put('a', column())
+    cache.put('b', column())
+    cache.get('a')
+    cache.put('c', column())
+    # 'b' was the least recently used
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2 and stats['bytes'] <= stats['max_bytes']
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    first = IndicatorCache(max_bytes=1 << 20, disk_dir=str(tmp_path))
+    first.put('a', column(value=3.0))
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+
+    second = IndicatorCache(max_bytes=1 << 20, disk_dir=str(tmp_path))
+    loaded = second.get('a')
+    assert np.array_equal(loaded['SMA_20'], column(value=3.0)['SMA_20'])
+    assert not loaded['SMA_20'].flags.writeable
+    second.get('a')
+    stats = second.stats()
+    assert (stats['disk_hits'], stats['hits'], stats['misses']) == (1, 1, 0)
+
+def test_fingerprint_changes_with_any_bar():
+    data = make_data(300, seed=2)
+    fingerprint = fingerprint_bars(data)
+    assert fingerprint_bars(data.copy()) == fingerprint
+
+    changed = data.copy()
+    changed.loc[150, 'close'] += 0.01
+    assert fingerprint_bars(changed) != fingerprint
+    shifted = data.copy()
+    shifted.loc[299, 'datetime'] += np.timedelta64(1, 'D')
+    assert fingerprint_bars(shifted) != fingerprint
+    assert fingerprint_bars(data.iloc[:-1]) != fingerprint
+
+if __name__ == "__main__":
+    test_hit_and_miss_counters()
+    test_byte_bounded_lru_eviction()
+    test_fingerprint_changes_with_any_bar()
+    print("Indicator cache tests passed")
@@ -0,0 +1,54 @@
+import numpy as np
+from core.tools.metrics import equity_metrics, trade_metrics, rolling_sharpe
+
+def make_equity(n=500, seed=5):
+    rng = np.random.default_rng(seed)
+    return 100000.0 * np.cumprod(1 + rng.normal(0.0004, 0.01, n))
+
+def test_single_curve_matches_direct_formulas():
+    equity = make_equity()
+    metrics = equity_metrics(equity)
+    returns = np.diff(equity) / equity[:-1]
+    assert np.isclose(metrics['sharpe_ratio'], returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    assert np.isclose(metrics['sortino_ratio'], returns.mean() / downside * np.sqrt(252))
+
+    # drawdown and its duration from an explicit bar loop
+    peak, max_dd, since_peak, longest = equity[0], 0.0, 0, 0
+    for value in equity:
+        if value >= peak:
+            peak, since_peak = value, 0
+        else:
+            since_peak += 1
+        max_dd = max(max_dd, 1 - value / peak)
+        longest = max(longest, since_peak)
+    assert np.isclose(metrics['max_drawdown'], max_dd)
+    assert metrics['max_drawdown_duration'] == longest
+    assert metrics['expected_shortfall'] <= metrics['value_at_risk'] < 0
+
+def test_batch_rows_match_single_curves():
+    curves = np.vstack([make_equity(seed=seed) for seed in range(8)])
+    batch = equity_metrics(curves)
+    for i, curve in enumerate(curves):
+        single = equity_metrics(curve)
+        for name, value in single.items():
+            assert np.isclose(batch[name][i], value), name
+
+def test_rolling_sharpe_matches_windows():
+    returns = np.diff(make_equity(n=200)) / make_equity(n=200)[:-1]
+    rolling = rolling_sharpe(returns, window=20)
+    window = returns[30:50]
+    assert np.isclose(rolling[30], window.mean() / window.std(ddof=1) * np.sqrt(252))
+
+def test_trade_streaks_and_profit_factor():
+    stats = trade_metrics([100.0, -50.0, -25.0, -10.0, 40.0, 60.0])
+    assert stats['max_consecutive_losses'] == 3
+    assert stats['max_consecutive_wins'] == 2
+    assert np.isclose(stats['profit_factor'], 200.0 / 85.0)
+
+if __name__ == "__main__":
+    test_single_curve_matches_direct_formulas()
+    test_batch_rows_match_single_curves()
+    test_rolling_sharpe_matches_windows()
+    test_trade_streaks_and_profit_factor()
+    print("Performance metrics tests passed")
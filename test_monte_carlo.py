@@ -0,0 +1,29 @@
+import numpy as np
+from core.tools.monte_carlo import bootstrap_indices, monte_carlo_returns, monte_carlo_trades
+
+def test_block_bootstrap_keeps_consecutive_runs():
+    indices = bootstrap_indices(100, n_paths=50, path_length=40, block_size=8, seed=1)
+    assert indices.shape == (50, 40)
+    blocks = indices.reshape(50, 5, 8)
+    assert np.all(np.diff(blocks, axis=2) % 100 == 1)
+
+def test_returns_bootstrap_percentiles():
+    returns = np.random.default_rng(0).normal(0.0005, 0.01, 252)
+    result = monte_carlo_returns(returns, n_paths=10000, block_size=5, seed=7)
+    for name in ('final_return', 'max_drawdown', 'sharpe_ratio'):
+        levels = [result[name][key] for key in ('p5', 'p25', 'p50', 'p75', 'p95')]
+        assert levels == sorted(levels)
+    assert 0.0 <= result['max_drawdown']['p5'] <= result['max_drawdown']['p95'] < 1.0
+    assert result == monte_carlo_returns(returns, n_paths=10000, block_size=5, seed=7)
+
+def test_trade_bootstrap_of_winning_trades_never_loses():
+    result = monte_carlo_trades([100.0, 250.0, 50.0, 300.0], initial_capital=100000.0, n_paths=1000, seed=3)
+    assert result['prob_loss'] == 0.0
+    assert result['max_drawdown']['p95'] == 0.0
+    assert result['final_return']['p5'] > 0
+
+if __name__ == "__main__":
+    test_block_bootstrap_keeps_consecutive_runs()
+    test_returns_bootstrap_percentiles()
+    test_trade_bootstrap_of_winning_trades_never_loses()
+    print("Monte Carlo tests passed")
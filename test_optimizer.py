@@ -0,0 +1,80 @@
+import numpy as np
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import core.tools.optimizer as optimizer
+from core.tools.optimizer import apply_params, grid_space, random_space, optimize, prepare_optimizer_data
+from core.tools.indicator_registry import compute_indicators
+from test_helpers import TEMPLATE, make_data
+
+def test_apply_params_and_spaces():
+    strategy = apply_params(TEMPLATE, {'SMA.period': 20, 'adx_threshold': 30})
+    assert strategy['params']['SMA']['period'] == 20
+    assert strategy['rule'][0]['expr'] == 'CrossOver_SMA > 0 and ADX > 30'
+    assert TEMPLATE['params']['SMA']['period'] == 50
+
+    assert len(grid_space({'a': [1, 2, 3], 'b': [4, 5]})) == 6
+    samples = random_space({'a': (5, 50), 'b': [1, 2]}, n_iter=10, seed=0)
+    assert len(samples) == 10
+    assert all(5 <= s['a'] <= 50 and isinstance(s['a'], int) for s in samples)
+    assert samples == random_space({'a': (5, 50), 'b': [1, 2]}, n_iter=10, seed=0)
+
+def test_optimize_returns_sorted_table():
+    space = {'SMA.period': [10, 20, 50], 'adx_threshold': [15, 25]}
+    result = optimize(make_data(), TEMPLATE, space, max_workers=1, prune=False)
+    table = result['table']
+    assert len(table) == 6
+    assert table['error'].isna().all()
+    assert table['score'].is_monotonic_decreasing
+    assert result['best_params'] == {key: table.loc[0, key] for key in space}
+    assert result['best_strategy']['params']['SMA']['period'] == result['best_params']['SMA.period']
+
+def test_prepare_optimizer_data_sweeps_periods():
+    data = make_data()
+    param_sets = grid_space({'SMA.period': [10, 20, 50, 100], 'adx_threshold': [15, 25]})
+    prepared = prepare_optimizer_data(data, TEMPLATE, param_sets)
+    assert list(data.columns) == ['datetime', 'open', 'high', 'low', 'close', 'volume']
+    expected = compute_indicators(data.copy(), [('SMA', {'period': p}) for p in (10, 20, 50, 100)] +
+                                  [('ADX', {})], use_cache=False)
+    assert set(prepared.columns) == set(expected.columns)
+    for column in expected.columns.drop('datetime'):
+        assert np.allclose(prepared[column], expected[column], rtol=1e-8, equal_nan=True)
+
+class BreakingPool:
+    """Runs the first chunk in-process, then fails like a pool whose worker was killed"""
+
+    def __init__(self, max_workers, initializer, initargs):
+        initializer(*initargs)
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, chunk):
+        future = Future()
+        if self.submitted == 0:
+            future.set_result(fn(chunk))
+        else:
+            future.set_exception(BrokenProcessPool("worker killed"))
+        self.submitted += 1
+        return future
+
+def test_broken_pool_falls_back_to_in_process(monkeypatch):
+    monkeypatch.setattr(optimizer, 'ProcessPoolExecutor', BreakingPool)
+    space = {'SMA.period': [10, 20, 50], 'adx_threshold': [15, 25]}
+    data = make_data()
+    result = optimize(data, TEMPLATE, space, max_workers=2, chunk_size=2, prune=False)
+    table = result['table']
+    # every parameter set is scored exactly once, as in a run without a pool
+    expected = optimize(data, TEMPLATE, space, max_workers=1, prune=False)['table']
+    assert len(table) == 6 and table['error'].isna().all()
+    key = ['SMA.period', 'adx_threshold']
+    assert np.allclose(table.sort_values(key)['score'], expected.sort_values(key)['score'], equal_nan=True)
+
+if __name__ == "__main__":
+    test_apply_params_and_spaces()
+    test_optimize_returns_sorted_table()
+    test_prepare_optimizer_data_sweeps_periods()
+    print("Optimizer tests passed")
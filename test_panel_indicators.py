@@ -0,0 +1,64 @@
+import numpy as np
+import talib
+from core.tools.panel_indicators import build_panel, compute_panel_indicators, latest_snapshot
+from test_helpers import make_history
+
+def make_frames():
+    """Crypto trades every day, equities on business days only (one with a holiday gap and a later listing)"""
+    listed = make_history(230, 3, volatility=0.02, start='2023-03-01', tz='America/New_York')
+    return {
+        'BTC-USD': make_history(400, 1, volatility=0.02, start='2023-01-01', freq='D', tz='UTC'),
+        'AAPL': make_history(285, 2, volatility=0.02, start='2023-01-02', tz='America/New_York'),
+        'NEW': listed.drop(listed.index[40])
+    }
+
+REQUESTS = [('SMA', {'period': 20}), ('EMA', {'period': 10}), ('RSI', {}), ('RSI', {'period': 7}),
+            ('ROC', {}), ('VOLATILITY', {}), ('DONCHIAN', {'period': 15})]
+
+def expected_columns(df):
+    """Per-symbol reference results on the symbol's own bars"""
+    close, high, low = df['Close'], df['High'], df['Low']
+    return {
+        'SMA_20': talib.SMA(close, timeperiod=20),
+        'EMA_10': talib.EMA(close, timeperiod=10),
+        'RSI': talib.RSI(close, timeperiod=14),
+        'RSI_7': talib.RSI(close, timeperiod=7),
+        'ROC': talib.ROC(close, timeperiod=10),
+        'VOLATILITY': close.pct_change().rolling(window=20).std(),
+        'DONCHIAN_HIGH_15': high.rolling(window=15).max(),
+        'DONCHIAN_LOW_15': low.rolling(window=15).min()
+    }
+
+def test_panel_matches_per_symbol_results_on_mixed_calendars():
+    frames = make_frames()
+    panel = build_panel(frames)
+    indicators = compute_panel_indicators(panel, REQUESTS)
+    assert set(indicators) == set(expected_columns(frames['AAPL']))
+
+    # weekends exist for crypto only, so equity columns have NaN rows between their bars
+    assert np.isnan(panel['close'][:, panel.symbols.index('AAPL')]).any()
+    for j, symbol in enumerate(panel.symbols):
+        rows = ~np.isnan(panel['close'][:, j])
+        assert rows.sum() == len(frames[symbol])
+        for name, expected in expected_columns(frames[symbol]).items():
+            values = indicators[name][:, j]
+            # no values on rows where the symbol has no bar
+            assert np.isnan(values[~rows]).all()
+            ours, reference = values[rows], expected.to_numpy()
+            assert np.array_equal(np.isnan(ours), np.isnan(reference)), (symbol, name)
+            mask = ~np.isnan(reference)
+            assert np.allclose(ours[mask], reference[mask], rtol=1e-8, atol=1e-10), (symbol, name)
+
+def test_latest_snapshot_uses_each_symbols_last_bar():
+    frames = make_frames()
+    panel = build_panel(frames)
+    indicators = compute_panel_indicators(panel, [('SMA', {'period': 20})])
+    snapshot = latest_snapshot(panel, indicators)
+    for symbol, df in frames.items():
+        assert snapshot.loc[symbol, 'close'] == df['Close'].iloc[-1]
+        assert np.isclose(snapshot.loc[symbol, 'SMA_20'], df['Close'].iloc[-20:].mean())
+
+if __name__ == "__main__":
+    test_panel_matches_per_symbol_results_on_mixed_calendars()
+    test_latest_snapshot_uses_each_symbols_last_bar()
+    print("Panel indicator tests passed")
@@ -0,0 +1,106 @@
+import copy
+import numpy as np
+import pytest
+import core.tools.path_kernel as path_kernel
+from core.tools.path_kernel import simulate_path, strategy_stops, EXIT_REASONS
+from core.tools.vector_backtest import VectorBacktestEngine
+from core.tools.backtest import backtest_strategy
+from config.settings import STRATEGY_PARAMS, SLIPPAGE
+import test_helpers
+
+STRATEGY = {
+    'name': 'RSI Test',
+    'indicators': ['RSI'],
+    'params': {'RSI': {'period': 14}},
+    'rule': [
+        {'type': 'entry', 'expr': 'RSI < 45'},
+        {'type': 'exit', 'expr': 'RSI > 70'}
+    ]
+}
+
+def make_data(n=500, seed=9):
+    return test_helpers.make_data(n, seed, drift=0.0, start='2023-01-02', max_volume=2_000_000)
+
+def run_vector(data, strategy, slippage=0.0):
+    engine = VectorBacktestEngine(slippage=slippage)
+    engine.set_data(data)
+    engine.add_strategy(copy.deepcopy(strategy))
+    return engine
+
+def test_stops_and_slippage_on_a_known_path():
+    close = np.array([100, 100, 104, 110, 107, 107, 100, 100, 100, 100], dtype=float)
+    open_ = close.copy()
+    high, low = close * 1.01, close * 0.99
+    entry = np.zeros(10, dtype=bool)
+    entry[[0, 4]] = True
+    exit_ = np.zeros(10, dtype=bool)
+    path = simulate_path(open_, high, low, close, entry, exit_, commission=0.0, slippage=0.0,
+                         trailing_percent=0.02, profit_take=0.5)
+    # entry fills on bar 1, peak 110 on bar 3, 107 is 2.7% below it on bar 4: exit at bar 5's open
+    log = path['trade_log']
+    assert list(log['entry_idx']) == [1] and list(log['exit_idx']) == [5]
+    assert EXIT_REASONS[path['exit_reason'][0]] == 'trailing_stop'
+    # the bar-4 entry signal comes while still long, so there is no second trade
+    assert path['open_trades'] == 0 and path['in_trade'].tolist() == [0, 1, 1, 1, 1, 0, 0, 0, 0, 0]
+
+    path = simulate_path(open_, high, low, close, entry, exit_, commission=0.0, slippage=0.01,
+                         profit_take=0.05)
+    log = path['trade_log']
+    assert EXIT_REASONS[path['exit_reason'][0]] == 'take_profit' and log['exit_idx'][0] == 4
+    # buys slip up, sells slip down, both capped at the bar's range
+    assert log['entry_price'][0] == pytest.approx(min(100 * 1.01, high[1]))
+    assert log['exit_price'][0] == pytest.approx(max(107 * 0.99, low[4]))
+
+    # like the engines, direct callers get no slippage unless they ask for it
+    path = simulate_path(open_, high, low, close, entry, exit_, commission=0.0, trailing_percent=0.02)
+    assert path['trade_log']['entry_price'][0] == open_[1]
+
+def test_kernel_without_stops_matches_vectorized_simulation():
+    engine = run_vector(make_data(), STRATEGY)
+    vectorized = engine.run_backtest()
+    path = engine._simulate_path(*engine.signal_masks(), strategy_stops(STRATEGY))
+    assert vectorized['total_trades'] > 0
+    assert np.allclose(path['equity'], vectorized['equity'], rtol=1e-12)
+    for field in vectorized['trade_log'].dtype.names:
+        assert np.allclose(path['trade_log'][field], vectorized['trade_log'][field], rtol=1e-10)
+
+@pytest.mark.skipif(not path_kernel.NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_and_python_loops_are_identical():
+    data = make_data(2000)
+    engine = run_vector(data, STRATEGY)
+    entry, exit_, ready = engine.signal_masks()
+    prices = [data[col].to_numpy() for col in ('open', 'high', 'low', 'close')]
+    compiled = simulate_path(*prices, entry, exit_, ready, trailing_percent=0.02, profit_take=0.05, use_numba=True)
+    python = simulate_path(*prices, entry, exit_, ready, trailing_percent=0.02, profit_take=0.05, use_numba=False)
+    assert np.array_equal(compiled['equity'], python['equity'])
+    assert np.array_equal(compiled['trade_log'], python['trade_log'])
+
+def test_stops_match_backtrader():
+    classic = STRATEGY_PARAMS['ClassicTrendFollow']
+    strategy = dict(STRATEGY, stops={'trailing_percent': classic['trailing_percent'],
+                                     'profit_take': classic['profit_take']})
+    data = make_data()
+    expected = backtest_strategy(data, copy.deepcopy(strategy), engine='backtrader', use_cache=False, slippage=SLIPPAGE)
+    result = backtest_strategy(data, copy.deepcopy(strategy), engine='vector', use_cache=False, slippage=SLIPPAGE)
+    assert result['total_trades'] == expected['total_trades'] > 0
+    assert result['trades']['total'] == expected['trades']['total']
+    assert np.allclose(result['equity'], expected['equity'], rtol=1e-10)
+    for field in expected['trade_log'].dtype.names:
+        assert np.allclose(result['trade_log'][field], expected['trade_log'][field], rtol=1e-9)
+
+def test_strategy_stops_validation():
+    assert strategy_stops(STRATEGY) == {'trailing_percent': 0.0, 'profit_take': 0.0}
+    assert strategy_stops(dict(STRATEGY, stops={'profit_take': 0.05}))['profit_take'] == 0.05
+    with pytest.raises(ValueError):
+        strategy_stops(dict(STRATEGY, stops={'stop_loss': 0.05}))
+    with pytest.raises(ValueError):
+        strategy_stops(dict(STRATEGY, stops={'trailing_percent': -0.02}))
+
+if __name__ == "__main__":
+    test_stops_and_slippage_on_a_known_path()
+    test_kernel_without_stops_matches_vectorized_simulation()
+    if path_kernel.NUMBA_AVAILABLE:
+        test_numba_and_python_loops_are_identical()
+    test_stops_match_backtrader()
+    test_strategy_stops_validation()
+    print("Path kernel tests passed")
@@ -0,0 +1,46 @@
+import numpy as np
+from core.tools.portfolio_backtest import run_portfolio_backtest
+from core.tools.vector_backtest import VectorBacktestEngine
+import test_helpers
+
+STRATEGY = {
+    'name': 'EMA Trend',
+    'indicators': ['EMA'],
+    'params': {'EMA': {'period': 10}},
+    'rule': [
+        {'type': 'entry', 'expr': 'CrossOver_EMA > 0'},
+        {'type': 'exit', 'expr': 'CrossOver_EMA < 0'}
+    ]
+}
+
+def make_history(n=260, seed=0, freq='B', tz='America/New_York'):
+    return test_helpers.make_history(n, seed, start='2023-01-02', freq=freq, tz=tz)
+
+def test_single_asset_trades_match_vector_engine():
+    data = make_history(seed=1)
+    result = run_portfolio_backtest({'AAA': data}, STRATEGY, position_weight=0.1, rebalance='none')
+    engine = VectorBacktestEngine()
+    engine.set_data(data)
+    engine.add_strategy(STRATEGY)
+    expected = engine.run_backtest()
+    assert result['total_trades'] == expected['total_trades']
+    entry_days = result['dates'][result['trade_log']['entry_idx']].astype('datetime64[D]')
+    expected_days = expected['dates'][expected['trade_log']['entry_idx']].astype('datetime64[D]')
+    assert np.array_equal(entry_days, expected_days)
+
+def test_mixed_calendars_share_cash():
+    frames = {f'EQ{i}': make_history(seed=i) for i in range(30)}
+    frames['BTC-USD'] = make_history(n=365, seed=99, freq='D', tz='UTC')
+    result = run_portfolio_backtest(frames, STRATEGY, rebalance='monthly')
+    # equities and crypto on one calendar: every crypto day is a row
+    assert len(result['equity']) == len(result['dates']) == 365
+    equity = result['equity']
+    assert np.all(equity > 0)
+    assert result['exposure'].max() <= 1.0 + 1e-9
+    assert result['per_symbol']['trades'].sum() == result['total_trades']
+    assert np.isclose(equity[-1] / 100000 - 1, result['total_return'])
+
+if __name__ == "__main__":
+    test_single_asset_trades_match_vector_engine()
+    test_mixed_calendars_share_cash()
+    print("Portfolio backtest tests passed")
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+import core.data.providers as providers
+import core.tools.indicators_process as indicators_process
+from core.data.providers import FileReplayProvider, YFinanceProvider, get_provider, set_provider
+from test_helpers import make_history
+
+def make_recording(n=120):
+    """Daily bars ending on 2024-04-29, with yfinance's 'Stock Splits' column name"""
+    bars = make_history(n, seed=8, start='2024-01-01', freq='D', tz='UTC')
+    bars['Stock Splits'] = 0.0
+    return bars
+
+@pytest.fixture
+def provider_reset(monkeypatch):
+    # restore the active provider after each test
+    monkeypatch.setattr(providers, '_provider', None)
+
+def test_csv_and_parquet_replay(tmp_path):
+    bars = make_recording()
+    bars.to_csv(tmp_path / 'CSVSYM_1d.csv')
+    provider = FileReplayProvider(str(tmp_path))
+    provider.record_history('pqsym', '1d', bars)
+
+    for symbol in ('CSVSYM', 'PQSYM'):
+        replayed = provider.get_history(symbol, '2024-02-01', '2024-03-01', '1d')
+        expected = bars[(bars.index >= '2024-02-01') & (bars.index < '2024-03-01')]
+        assert len(replayed) == 29
+        assert 'Stock_Splits' in replayed.columns
+        assert (replayed.index == expected.index).all()
+        assert replayed['Close'].to_numpy() == pytest.approx(expected['Close'].to_numpy())
+
+    assert provider.get_history('MISSING', '2024-02-01', '2024-03-01', '1d').empty
+
+def test_window_is_anchored_to_the_end_of_the_recording(tmp_path):
+    bars = make_recording()
+    provider = FileReplayProvider(str(tmp_path))
+    provider.record_history('AAPL', '1d', bars)
+    replayed = provider.get_history('AAPL', '2025-01-01', '2025-01-31', '1d')
+    # the same 30 days, ending with the last recorded bar
+    assert len(replayed) == 30
+    assert replayed.index[-1] == bars.index[-1]
+
+def test_replay_bypasses_the_bar_cache(tmp_path, monkeypatch, provider_reset):
+    provider = FileReplayProvider(str(tmp_path))
+    provider.record_history('AAPL', '1d', make_recording())
+    set_provider(provider)
+    assert not provider.cacheable
+
+    def no_cache():
+        raise AssertionError("the bar cache must not be used for replayed data")
+
+    monkeypatch.setattr(indicators_process, 'USE_DATA_CACHE', True)
+    monkeypatch.setattr(indicators_process, 'get_bar_cache', no_cache)
+    data = indicators_process.get_historical_data('AAPL', lookback_days=30)
+    assert len(data) == 30
+
+def test_provider_selection(monkeypatch, provider_reset):
+    monkeypatch.setattr(providers, 'DATA_PROVIDER', 'replay')
+    provider = get_provider()
+    assert isinstance(provider, FileReplayProvider)
+    assert get_provider() is provider
+
+    set_provider(YFinanceProvider())
+    assert isinstance(get_provider(), YFinanceProvider)
+
+    monkeypatch.setattr(providers, '_provider', None)
+    monkeypatch.setattr(providers, 'DATA_PROVIDER', 'unknown')
+    with pytest.raises(ValueError):
+        get_provider()
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-q'])
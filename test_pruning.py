@@ -0,0 +1,95 @@
+import numpy as np
+from core.tools.pruning import PruningConstraints
+from core.tools.vector_backtest import VectorBacktestEngine
+from core.tools.backtest import evaluate_backtest
+from core.tools.optimizer import optimize
+import test_helpers
+
+STRATEGY = {
+    'name': 'RSI Test',
+    'indicators': ['RSI'],
+    'params': {'RSI': {'period': 14}},
+    'rule': [
+        {'type': 'entry', 'expr': 'RSI < 45'},
+        {'type': 'exit', 'expr': 'RSI > 55'}
+    ]
+}
+
+def make_data(n=400, seed=3):
+    return test_helpers.make_data(n, seed, drift=0.0, volatility=0.02, start='2023-01-02', max_volume=2_000_000)
+
+def run(data, pruning=None):
+    engine = VectorBacktestEngine(pruning=pruning)
+    engine.set_data(data)
+    engine.add_strategy(dict(STRATEGY))
+    return engine.run_backtest()
+
+def test_constraint_check():
+    constraints = PruningConstraints(max_drawdown=0.2, min_trades=5)
+    # an open trade closes on the next bar, new trades need two bars each
+    assert PruningConstraints.max_possible_trades(2, 1, 5) == 5
+    assert PruningConstraints.max_possible_trades(2, 0, 5) == 4
+    assert constraints.check(0.1, 2, 1, 5) is None
+    assert constraints.check(0.1, 2, 0, 5) == 'min_trades'
+    assert constraints.check(0.25, 2, 1, 5) == 'max_drawdown'
+    assert PruningConstraints(max_drawdown=None, min_trades=None).check(0.9, 0, 0, 0) is None
+
+def test_vector_engine_stops_at_first_breach():
+    data = make_data()
+    full = run(data)
+    assert full['pruned'] is None
+    limit = full['max_drawdown'] / 2
+    pruned = run(data, PruningConstraints(max_drawdown=limit, min_trades=None))
+    stop = pruned['pruned']['bar']
+    assert pruned['pruned']['reason'] == 'max_drawdown'
+    assert len(pruned['equity']) == len(pruned['dates']) == stop + 1 < len(full['equity'])
+
+    # the partial result is the prefix of the complete run
+    assert np.array_equal(pruned['equity'], full['equity'][:stop + 1])
+    assert np.array_equal(pruned['trade_log'], full['trade_log'][full['trade_log']['exit_idx'] <= stop])
+    assert pruned['max_drawdown'] >= limit
+    drawdown = 1 - full['equity'] / np.maximum.accumulate(full['equity'])
+    assert drawdown[:stop].max() < limit <= drawdown[stop]
+
+def test_min_trades_pruning():
+    data = make_data()
+    full = run(data)
+    # one more trade than the run can possibly close: pruned before the end
+    pruned = run(data, PruningConstraints(max_drawdown=None, min_trades=full['total_trades'] + 1))
+    assert pruned['pruned']['reason'] == 'min_trades'
+    assert len(pruned['equity']) < len(full['equity'])
+    assert run(data, PruningConstraints(max_drawdown=None, min_trades=full['total_trades']))['pruned'] is None
+
+def test_pruned_result_is_not_satisfactory():
+    data = make_data()
+    result = run(data, PruningConstraints(max_drawdown=0.01, min_trades=None))
+    report = evaluate_backtest(result, monte_carlo_paths=0)
+    assert report['pruned']['reason'] == 'max_drawdown'
+    assert report['is_satisfactory'] is False
+    assert any('stopped early' in weakness for weakness in report['conclusion']['weaknesses'])
+
+def test_optimizer_ranks_pruned_runs_last():
+    space = {'RSI.period': [7, 14, 21], 'entry_level': [30, 45]}
+    template = dict(STRATEGY, rule=[
+        {'type': 'entry', 'expr': 'RSI < {entry_level}'},
+        {'type': 'exit', 'expr': 'RSI > 55'}
+    ])
+    # the vector engine computes whole runs, pruning it would save nothing
+    assert optimize(make_data(), template, space, max_workers=1, engine='vector')['table']['pruned'].isna().all()
+
+    table = optimize(make_data(), template, space, max_workers=1, engine='backtrader')['table']
+    assert len(table) == 6 and table['error'].isna().all()
+    pruned = table['pruned'].notna()
+    assert pruned.any()
+    # complete runs first, each group ordered by score
+    assert not (pruned.values[:-1] & ~pruned.values[1:]).any()
+    assert table.loc[~pruned, 'score'].is_monotonic_decreasing
+    assert table.loc[pruned, 'score'].is_monotonic_decreasing
+
+if __name__ == "__main__":
+    test_constraint_check()
+    test_vector_engine_stops_at_first_breach()
+    test_min_trades_pruning()
+    test_pruned_result_is_not_satisfactory()
+    test_optimizer_ranks_pruned_runs_last()
+    print("Pruning tests passed")
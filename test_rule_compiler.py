@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from core.tools.rule_compiler import compile_rule, compile_strategy_rules, RuleCompileError
+
+STRATEGY = {
+    'name': 'SMA + ADX',
+    'indicators': ['SMA', 'ADX', 'MACD'],
+    'params': {},
+    'rule': [
+        {'type': 'entry', 'expr': 'CrossOver_SMA > 0 and ADX > 25'},
+        {'type': 'exit', 'expr': 'CrossOver_SMA < 0 or not ADX >= 20'}
+    ]
+}
+
+def test_per_bar_and_mask_agree():
+    rng = np.random.default_rng(3)
+    columns = {
+        'close': rng.normal(100, 5, 200),
+        'SMA': rng.normal(100, 5, 200),
+        'ADX': rng.uniform(0, 50, 200),
+        'MACD': rng.normal(0, 1, 200),
+        'MACD_SIGNAL': rng.normal(0, 1, 200),
+        'CrossOver_SMA': rng.integers(-1, 2, 200).astype(float)
+    }
+    rules = compile_strategy_rules(STRATEGY)
+    extra = compile_rule('close > SMA * 1.01 and MACD - MACD_SIGNAL > -0.5', {'close', 'SMA', 'MACD', 'MACD_SIGNAL'})
+    for rule in (rules['entry'], rules['exit'], extra):
+        mask = rule.mask(columns)
+        per_bar = [rule({name: values[i] for name, values in columns.items()}) for i in range(200)]
+        assert mask.tolist() == per_bar
+
+def test_per_bar_callable_follows_python_semantics():
+    rule = compile_rule('20 < ADX <= 40 and not -MACD > 1 or close / 2 == 50')
+    for values in ({'ADX': 30, 'MACD': 0.5, 'close': 0}, {'ADX': 40, 'MACD': -2, 'close': 0},
+                   {'ADX': 10, 'MACD': 0, 'close': 100}, {'ADX': 41, 'MACD': 0, 'close': 99}):
+        assert rule(values) == bool(eval(rule.expr, {}, dict(values)))
+    # 'and' short-circuits, so names behind a false condition need not be present
+    assert compile_rule('ADX > 100 and RSI > 0')({'ADX': 10}) is False
+
+def test_rejects_unknown_names_and_python():
+    allowed = {'close', 'RSI'}
+    for expr in ('EMA > 0',
+                 '__import__("os").system("echo hi")',
+                 'close.__class__',
+                 'RSI[0] > 30',
+                 '(lambda: 1)()',
+                 'RSI if close else 0',
+                 'RSI ** 2 > 900',
+                 'RSI > "30"',
+                 'RSI >'):
+        with pytest.raises(RuleCompileError):
+            compile_rule(expr, allowed)
+
+if __name__ == "__main__":
+    test_per_bar_and_mask_agree()
+    test_per_bar_callable_follows_python_semantics()
+    test_rejects_unknown_names_and_python()
+    print("Rule compiler tests passed")
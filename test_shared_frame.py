@@ -0,0 +1,102 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from core.data.shared_frame import SharedFrame, attach_frame, release_attached, resolve_frame
+import core.tools.optimizer as optimizer
+import test_helpers
+from test_helpers import TEMPLATE
+
+def make_data(n=500, seed=7):
+    """Bars of every column kind a shared frame carries: float, int, bool, object and tz-aware datetime"""
+    data = test_helpers.make_data(n, seed, tz='America/New_York')
+    data['volume'] = data['volume'].astype(np.int64)
+    data['signal'] = np.random.default_rng(seed).random(n) < 0.1
+    data['symbol'] = 'TEST'
+    return data
+
+def _worker_sum(handle):
+    frame = attach_frame(handle)
+    return float(frame['close'].sum()), str(frame['datetime'].iloc[-1])
+
+def test_round_trip_range_index():
+    data = make_data()
+    with SharedFrame(data) as shared:
+        frame = attach_frame(shared.handle)
+        pd.testing.assert_frame_equal(frame, data)
+        # the handle carries the layout and the non-numeric column only
+        assert list(shared.handle.extra) == ['symbol']
+        del frame
+    release_attached()
+
+    numeric = data.drop(columns='symbol')
+    with SharedFrame(numeric) as shared:
+        assert len(pickle.dumps(shared.handle)) < len(pickle.dumps(numeric)) / 10
+
+def test_round_trip_datetime_index():
+    data = make_data().drop(columns='symbol').set_index('datetime')
+    data.index = data.index.tz_localize(None)
+    data.index.freq = 'B'
+    with SharedFrame(data) as shared:
+        frame = attach_frame(shared.handle)
+        pd.testing.assert_frame_equal(frame, data)
+        assert frame.index.freq == data.index.freq
+        del frame
+    release_attached()
+
+def test_views_are_zero_copy_and_read_only():
+    data = make_data()
+    with SharedFrame(data) as shared:
+        frame = attach_frame(shared.handle)
+        close = frame['close'].to_numpy()
+        assert not close.flags.writeable
+        with pytest.raises(ValueError):
+            close[0] = 0.0
+        # a second attach in the same process maps the same memory
+        again = attach_frame(shared.handle)['close'].to_numpy()
+        assert np.shares_memory(close, again)
+        assert resolve_frame(data) is data
+        del frame, close, again
+    release_attached()
+
+def test_workers_attach_and_segment_is_unlinked():
+    data = make_data()
+    with SharedFrame(data) as shared:
+        name = shared.name
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_worker_sum, [shared.handle] * 4))
+        expected = (float(data['close'].sum()), str(data['datetime'].iloc[-1]))
+        assert results == [expected] * 4
+        # worker exit must not unlink the owner's segment
+        attach_frame(shared.handle)
+        release_attached(name)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+def test_rejects_unsupported_index():
+    data = make_data().set_index('symbol')
+    with pytest.raises(ValueError):
+        SharedFrame(data)
+
+def test_optimizer_results_match_pickled_transport(monkeypatch):
+    data = optimizer.prepare_optimizer_data(make_data().drop(columns=['signal', 'symbol']), TEMPLATE,
+                                            optimizer.grid_space({'adx_threshold': [15, 20, 25, 30]}))
+    space = {'adx_threshold': [15, 20, 25, 30]}
+    tables = []
+    for transport in (True, False):
+        monkeypatch.setattr(optimizer, 'SHARED_MEMORY_TRANSPORT', transport)
+        result = optimizer.optimize(data, TEMPLATE, space, max_workers=2, chunk_size=1, prune=False)
+        # chunks finish in any order, so equal scores may rank differently
+        table = result['table'].sort_values('adx_threshold').reset_index(drop=True)
+        tables.append(table.drop(columns=['rank', 'elapsed'], errors='ignore'))
+    pd.testing.assert_frame_equal(tables[0], tables[1])
+
+if __name__ == "__main__":
+    test_round_trip_range_index()
+    test_round_trip_datetime_index()
+    test_views_are_zero_copy_and_read_only()
+    test_workers_attach_and_segment_is_unlinked()
+    test_rejects_unsupported_index()
+    print("All shared frame tests passed")
@@ -0,0 +1,69 @@
+import threading
+import time
+from utils.singleflight import SingleFlight
+
+THREADS = 8
+
+def run_concurrently(flight, fn):
+    """Call flight.do from THREADS threads while the first call is blocked, then release it"""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    outcomes = [None] * THREADS
+    arrived = threading.Semaphore(0)
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return fn()
+
+    def caller(i):
+        if i > 0:
+            arrived.release()
+        try:
+            outcomes[i] = ('result', flight.do('AAPL', slow))
+        except Exception as e:
+            outcomes[i] = ('error', e)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(THREADS)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for _ in threads[1:]:
+        arrived.acquire()
+    # every follower is about to call do, give them time to join the in-flight call
+    time.sleep(0.1)
+    assert flight.in_flight() == 1
+    release.set()
+    for thread in threads:
+        thread.join()
+    return calls, outcomes
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    result = object()
+    calls, outcomes = run_concurrently(flight, lambda: result)
+    assert len(calls) == 1
+    assert all(kind == 'result' and value is result for kind, value in outcomes)
+    # the key is released, a later call executes again
+    assert flight.in_flight() == 0
+    assert flight.do('AAPL', lambda: 42) == 42
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    error = ConnectionError("provider unavailable")
+
+    def fail():
+        raise error
+
+    calls, outcomes = run_concurrently(flight, fail)
+    assert len(calls) == 1
+    assert all(kind == 'error' and value is error for kind, value in outcomes)
+    assert flight.in_flight() == 0
+    assert flight.do('AAPL', lambda: 42) == 42
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_execution()
+    test_exception_reaches_every_waiter()
+    print("Single-flight tests passed")
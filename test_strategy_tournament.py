@@ -0,0 +1,36 @@
+from config.settings import STRATEGY_CONFIG
+from core.tools.strategy_tournament import prepare_tournament_data, run_tournament, rank_candidates
+from test_helpers import make_history
+
+def fake_outcome(name, sharpe, satisfactory):
+    evaluation = {
+        'performance_metrics': {'total_return': 0.0, 'annual_return': 0.0, 'max_drawdown': 0.1,
+                                'sharpe_ratio': sharpe, 'sortino_ratio': 0.0, 'calmar_ratio': 0.0, 'volatility': 0.0},
+        'trading_statistics': {'total_trades': 10, 'win_rate': 0.5},
+        'is_satisfactory': satisfactory
+    }
+    return {'strategy': {'name': name}, 'evaluation': evaluation, 'error': None}
+
+def test_satisfactory_strategies_rank_first():
+    outcomes = [
+        fake_outcome('A', 2.0, False),
+        fake_outcome('B', 1.2, True),
+        {'strategy': {'name': 'C'}, 'evaluation': None, 'error': 'boom'},
+        fake_outcome('D', 0.5, False)
+    ]
+    table = rank_candidates(outcomes, 'sharpe_ratio')
+    assert table['strategy_name'].tolist() == ['B', 'A', 'D', 'C']
+    assert table['candidate'].tolist() == [1, 0, 3, 2]
+
+def test_tournament_backtests_every_candidate():
+    data = prepare_tournament_data(make_history(600, seed=5), STRATEGY_CONFIG)
+    result = run_tournament(data, STRATEGY_CONFIG, max_workers=1)
+    table = result['table']
+    assert len(table) == len(STRATEGY_CONFIG)
+    assert result['best']['name'] == table.loc[0, 'strategy_name']
+    assert table['error'].isna().all()
+
+if __name__ == "__main__":
+    test_satisfactory_strategies_rank_first()
+    test_tournament_backtests_every_candidate()
+    print("Strategy tournament tests passed")
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import talib
+from core.tools.streaming_indicators import (
+    StreamingSMA, StreamingEMA, StreamingRSI, StreamingMACD, StreamingATR,
+    StreamingADX, StreamingBollinger, StreamingDonchian, run_streaming
+)
+
+def make_bars(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 2, n)
+    low = close - rng.uniform(0, 2, n)
+    bars = [{'high': h, 'low': l, 'close': c} for h, l, c in zip(high, low, close)]
+    return bars, high, low, close
+
+def assert_matches(streamed, expected):
+    streamed = np.asarray(streamed, dtype=float)
+    assert np.array_equal(np.isnan(streamed), np.isnan(expected))
+    mask = ~np.isnan(expected)
+    assert np.allclose(streamed[mask], expected[mask], rtol=1e-9, atol=1e-8)
+
+def test_moving_averages_match_talib():
+    _, _, _, close = make_bars()
+    for period in (5, 20, 50):
+        assert_matches(run_streaming(StreamingSMA(period), close), talib.SMA(close, period))
+        assert_matches(run_streaming(StreamingEMA(period), close), talib.EMA(close, period))
+
+def test_oscillators_match_talib():
+    bars, high, low, close = make_bars()
+    for period in (7, 14):
+        assert_matches(run_streaming(StreamingRSI(period), close), talib.RSI(close, period))
+        assert_matches(run_streaming(StreamingATR(period), bars), talib.ATR(high, low, close, period))
+        assert_matches(run_streaming(StreamingADX(period), bars), talib.ADX(high, low, close, period))
+
+def test_band_indicators_match_batch():
+    bars, high, low, close = make_bars()
+    macd = np.array(run_streaming(StreamingMACD(12, 26, 9), close))
+    for streamed, expected in zip(macd.T, talib.MACD(close, 12, 26, 9)):
+        assert_matches(streamed, expected)
+
+    bands = np.array(run_streaming(StreamingBollinger(20), close))
+    for streamed, expected in zip(bands.T, talib.BBANDS(close, 20)):
+        assert_matches(streamed, expected)
+
+    channel = np.array(run_streaming(StreamingDonchian(20), bars))
+    assert_matches(channel[:, 0], pd.Series(high).rolling(20).max().to_numpy())
+    assert_matches(channel[:, 1], pd.Series(low).rolling(20).min().to_numpy())
+
+if __name__ == "__main__":
+    test_moving_averages_match_talib()
+    test_oscillators_match_talib()
+    test_band_indicators_match_batch()
+    print("All streaming indicators match TA-Lib")
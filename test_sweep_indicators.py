@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import talib
+from core.tools.sweep_indicators import (
+    sma_sweep, ema_sweep, rsi_sweep, roc_sweep, rolling_max_sweep, rolling_min_sweep, add_sweep_columns
+)
+from core.tools.indicator_registry import compute_indicators
+
+def make_close(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+def assert_matches(swept, expected):
+    assert np.array_equal(np.isnan(swept), np.isnan(expected))
+    mask = ~np.isnan(expected)
+    assert np.allclose(swept[mask], expected[mask], rtol=1e-8)
+
+def test_moving_average_sweeps_match_talib():
+    close = make_close()
+    periods = [2, 5, 10, 21, 50, 200]
+    sma, ema, roc = sma_sweep(close, periods), ema_sweep(close, periods), roc_sweep(close, periods)
+    for j, period in enumerate(periods):
+        assert_matches(sma[:, j], talib.SMA(close, period))
+        assert_matches(ema[:, j], talib.EMA(close, period))
+        assert_matches(roc[:, j], talib.ROC(close, period))
+
+def test_rsi_sweep_matches_talib():
+    close = make_close()
+    periods = list(range(5, 31))
+    rsi = rsi_sweep(close, periods)
+    for j, period in enumerate(periods):
+        assert_matches(rsi[:, j], talib.RSI(close, period))
+
+def test_rolling_extreme_sweeps_match_pandas():
+    close = make_close()
+    periods = [1, 3, 7, 20, 55, 400, 401]
+    highs, lows = rolling_max_sweep(close, periods), rolling_min_sweep(close, periods)
+    for j, period in enumerate(periods):
+        assert_matches(highs[:, j], pd.Series(close).rolling(period).max().to_numpy())
+        assert_matches(lows[:, j], pd.Series(close).rolling(period).min().to_numpy())
+
+def test_sweep_columns_match_registry_columns():
+    close = make_close()
+    data = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                         'volume': np.full(len(close), 1e6)})
+    original = list(data.columns)
+    swept = add_sweep_columns(data, 'RSI', [7, 14, 21])
+    swept = add_sweep_columns(swept, 'DONCHIAN', [10, 20])
+    # the caller's frame is left untouched
+    assert list(data.columns) == original
+    expected = compute_indicators(data.copy(), [('RSI', {'period': p}) for p in (7, 14, 21)] +
+                                  [('DONCHIAN', {'period': p}) for p in (10, 20)], use_cache=False)
+    assert set(expected.columns) == set(swept.columns)
+    for column in set(expected.columns) - set(original):
+        assert_matches(swept[column].to_numpy(), expected[column].to_numpy())
+
+if __name__ == "__main__":
+    test_moving_average_sweeps_match_talib()
+    test_rsi_sweep_matches_talib()
+    test_rolling_extreme_sweeps_match_pandas()
+    test_sweep_columns_match_registry_columns()
+    print("All sweep kernels match the per-period results")
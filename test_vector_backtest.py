@@ -0,0 +1,81 @@
+import numpy as np
+from core.tools.vector_backtest import VectorBacktestEngine, positions_from_signals
+import test_helpers
+
+def reference_positions(entry, exit_):
+    state, out = 0, []
+    for enter, leave in zip(entry, exit_):
+        state = int(enter) if state == 0 else int(not leave)
+        out.append(state)
+    return np.array(out)
+
+def make_data(n=400, seed=11):
+    return test_helpers.make_data(n, seed, drift=0.0, start='2023-01-02', max_volume=2_000_000)
+
+def test_state_machine_matches_bar_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        entry = rng.random(300) < 0.2
+        exit_ = rng.random(300) < 0.2
+        assert np.array_equal(positions_from_signals(entry, exit_), reference_positions(entry, exit_))
+
+def test_vector_engine_result_keys_and_consistency():
+    strategy = {
+        'name': 'RSI Test',
+        'indicators': ['RSI'],
+        'params': {'RSI': {'period': 14}},
+        'rule': [
+            {'type': 'entry', 'expr': 'RSI < 40'},
+            {'type': 'exit', 'expr': 'RSI > 60'}
+        ]
+    }
+    engine = VectorBacktestEngine(initial_capital=100000.0)
+    engine.set_data(make_data())
+    engine.add_strategy(strategy)
+    result = engine.run_backtest()
+
+    for key in ('strategy_name', 'total_return', 'annual_return', 'max_drawdown',
+                'sharpe_ratio', 'win_rate', 'total_trades', 'trades', 'trade_log', 'equity', 'dates'):
+        assert key in result
+    equity = result['equity']
+    trade_log = result['trade_log']
+    assert equity.dtype == np.float64 and len(equity) == len(result['dates']) == 400
+    assert np.isclose(equity[-1] / 100000.0 - 1, result['total_return'])
+    assert result['total_trades'] == len(trade_log) == result['trades']['total']['closed']
+    assert np.all(trade_log['exit_idx'] > trade_log['entry_idx'])
+    # net PnL is the price move on the position less both commissions
+    gross = trade_log['size'] * (trade_log['exit_price'] - trade_log['entry_price'])
+    assert np.allclose(trade_log['pnl'], gross - trade_log['commission'])
+    assert 0.0 <= result['max_drawdown'] < 1.0
+
+def test_close_at_end_exits_the_open_position():
+    strategy = {
+        'name': 'Always Long',
+        'indicators': [],
+        'params': {},
+        'rule': [{'type': 'entry', 'expr': 'close > 0'}, {'type': 'exit', 'expr': 'close < 0'}]
+    }
+    data = make_data()
+    for stops in (None, {'trailing_percent': 0.5}):
+        config = dict(strategy, stops=stops) if stops else strategy
+        results = []
+        for close_at_end in (False, True):
+            engine = VectorBacktestEngine(initial_capital=100000.0, close_at_end=close_at_end)
+            engine.set_data(data)
+            engine.add_strategy(config)
+            results.append(engine.run_backtest())
+        held, closed = results
+        assert held['trades']['total']['open'] == 1 and held['total_trades'] == 0
+        assert closed['trades']['total']['open'] == 0 and closed['total_trades'] == 1
+        trade = closed['trade_log'][0]
+        # exit on the last bar's open, paying commission; the final equity is all cash
+        assert trade['exit_idx'] == len(data) - 1
+        assert trade['exit_price'] == data['open'].iloc[-1]
+        assert trade['commission'] > 0
+        assert np.isclose(closed['equity'][-1], 100000.0 + trade['pnl'])
+
+if __name__ == "__main__":
+    test_state_machine_matches_bar_loop()
+    test_vector_engine_result_keys_and_consistency()
+    test_close_at_end_exits_the_open_position()
+    print("Vectorized backtest engine tests passed")
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+import core.tools.walk_forward as walk_forward_module
+from core.tools.indicator_registry import strategy_columns
+from core.tools.walk_forward import walk_forward_windows, walk_forward, walk_forward_analysis
+import test_helpers
+from test_helpers import TEMPLATE
+
+def make_data(n=700, seed=9):
+    return test_helpers.make_data(n, seed, start='2021-01-04')
+
+def test_windows():
+    rolling = walk_forward_windows(700, train_bars=252, test_bars=63)
+    assert rolling[0] == (0, 252, 252, 315)
+    assert rolling[1] == (63, 315, 315, 378)
+    assert rolling[-1][3] == 700
+    assert all(train_end - train_start == 252 for train_start, train_end, _, _ in rolling)
+    anchored = walk_forward_windows(700, train_bars=252, test_bars=63, anchored=True)
+    assert all(window[0] == 0 for window in anchored)
+    # a step longer than the test window leaves gaps, a shorter one would overlap
+    assert walk_forward_windows(700, train_bars=252, test_bars=63, step=100)[1] == (100, 352, 352, 415)
+    with pytest.raises(ValueError):
+        walk_forward_windows(700, train_bars=252, test_bars=112, step=56)
+
+def test_walk_forward_rejects_overlapping_test_windows():
+    with pytest.raises(ValueError):
+        walk_forward(make_data(), TEMPLATE, {'adx_threshold': [15, 25]},
+                     train_bars=252, test_bars=112, step=56, max_workers=1)
+
+def test_walk_forward_stitches_out_of_sample_equity():
+    data = make_data()
+    result = walk_forward(data, TEMPLATE, {'SMA.period': [10, 30], 'adx_threshold': [15, 25]},
+                          train_bars=252, test_bars=112, max_workers=1)
+    windows = result['windows']
+    oos = result['oos_result']
+    assert len(windows) == 4
+    assert windows['error'].isna().all()
+    # the stitched curve covers every out-of-sample bar exactly once
+    assert len(oos['equity']) == len(data) - 252
+    assert np.all(np.diff(oos['dates']) > np.timedelta64(0))
+    chained = np.prod([1 + r for r in windows['oos_return']]) - 1
+    assert np.isclose(oos['total_return'], chained)
+    assert 'is_satisfactory' in result['oos_evaluation']
+
+def test_windows_end_flat_and_failed_windows_are_flagged(monkeypatch):
+    data = make_data()
+    space = {'SMA.period': [10, 30], 'adx_threshold': [15, 25]}
+    result = walk_forward(data, TEMPLATE, space, train_bars=252, test_bars=112, max_workers=1)
+    # no position is carried from one window into the next
+    assert result['oos_result']['trades']['total']['open'] == 0
+    assert not result['incomplete'] and result['oos_result']['failed_windows'] == []
+
+    optimize = walk_forward_module.optimize
+    calls = []
+
+    def failing_second_window(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("window failed")
+        return optimize(*args, **kwargs)
+
+    monkeypatch.setattr(walk_forward_module, 'optimize', failing_second_window)
+    result = walk_forward(data, TEMPLATE, space, train_bars=252, test_bars=112, max_workers=1)
+    assert result['incomplete']
+    assert result['oos_result']['failed_windows'] == [(112, 364, 364, 476)]
+    assert len(result['oos_result']['equity']) == len(data) - 252 - 112
+    assert result['oos_evaluation']['is_satisfactory'] is False
+    assert any('incomplete' in weakness for weakness in result['oos_evaluation']['conclusion']['weaknesses'])
+
+def test_walk_forward_analysis_signals_with_latest_params(monkeypatch):
+    history = test_helpers.make_history(700, 9, start='2021-01-04')
+    seen = {}
+
+    def fake_signal(data, strategy):
+        seen['strategy'], seen['columns'] = strategy, set(data.columns)
+        return "BUY"
+
+    monkeypatch.setattr(walk_forward_module, 'get_historical_data', lambda symbol, lookback_days: history)
+    monkeypatch.setattr(walk_forward_module, 'generate_live_signal', fake_signal)
+    report = walk_forward_analysis('TEST', TEMPLATE, {'SMA.period': [10, 30], 'adx_threshold': [15, 25]},
+                                   train_bars=252, test_bars=112, max_workers=1)
+    assert report['live_signal'] == "BUY"
+    assert seen['strategy']['params']['SMA']['period'] == report['latest_params']['SMA.period']
+    # the signal sees the indicator columns of the chosen parameters
+    assert set(strategy_columns(seen['strategy']).values()) <= seen['columns']
+
+if __name__ == "__main__":
+    test_windows()
+    test_walk_forward_rejects_overlapping_test_windows()
+    test_walk_forward_stitches_out_of_sample_equity()
+    print("Walk-forward tests passed")
@@ -0,0 +1,68 @@
+"""
+Single-flight module
+Coalesce concurrent calls for the same key (e.g. history requests for one symbol)
+into a single execution whose result every caller shares
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """An in-flight call shared by every caller of the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution
+
+    The first caller of a key runs the function; callers arriving while it is
+    still running wait and receive the same result (or exception). Nothing is
+    cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already in flight
+
+        :param key: Key identifying the call, e.g. ('history', 'AAPL', '1d')
+        :param fn: Function to execute
+        :return: Result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed"""
+        with self._lock:
+            return len(self._calls)